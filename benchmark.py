@@ -0,0 +1,562 @@
+"""
+Benchmark script - Measures throughput of CV Management System components
+Usage: python benchmark.py [skills] [queue] [regex] [candidate_db] [docx] [import_time] [corpus]
+                           [parse_many] [durable_queue] [sharded]
+                           [sections] [sheets_scheduler]
+                           [--count N] [--formats txt,docx,pdf] [--length L] [--skill-density D]
+                           [--noise P] [--seed S] [--output results.json]
+The corpus options apply to the corpus benchmark; with --output, benchmarks that
+produce results (currently corpus) are written to that file as JSON.
+Exits with status 1 if a check such as the import-time budget fails.
+"""
+import os
+import sys
+import time
+import random
+import contextlib
+import io
+import re
+
+# Add the cv_management_system module to path
+current_dir = os.path.dirname(__file__)
+sys.path.insert(0, os.path.join(current_dir, 'cv_management_system'))
+
+from skill_matcher import SkillMatcher, DEFAULT_SKILLS
+from whatsapp_simulator import WhatsAppSimulator, WhatsAppMessage
+from durable_queue import DurableQueue
+from data_extractor import ResumeDataExtractor
+from candidate_db import CandidateDatabase
+from file_processor import FileProcessor
+from corpus_generator import CORPUS_FORMATS, iter_resumes, write_corpus
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3, SAMPLE_TEXT_RESUME
+
+SAMPLE_RESUMES = [SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3, SAMPLE_TEXT_RESUME]
+
+# Cold import of cv_manager must stay under this (median of several runs)
+IMPORT_TIME_BUDGET_MS = 120
+
+# Optional dependencies that must only load when a code path needs them
+LAZY_MODULES = ('dotenv', 'pandas', 'spacy', 'openai', 'googleapiclient', 'PyPDF2', 'docx')
+
+
+def _time_it(func, *args, repeat: int = 3) -> float:
+    """Return the best wall-clock time of several runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _synthetic_taxonomy(size: int, seed: int = 42) -> list:
+    """Build a taxonomy of DEFAULT_SKILLS padded with random skill names"""
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    skills = list(DEFAULT_SKILLS)
+    while len(skills) < size:
+        word = ''.join(rng.choice(letters) for _ in range(rng.randint(4, 10)))
+        skills.append(word.capitalize())
+    return skills
+
+
+def bench_skills(resume_count: int = 200) -> None:
+    """Compare the per-keyword substring loop against SkillMatcher"""
+    resumes = (SAMPLE_RESUMES * (resume_count // len(SAMPLE_RESUMES) + 1))[:resume_count]
+    
+    def legacy(skills):
+        for text in resumes:
+            [skill for skill in skills if skill.lower() in text.lower()]
+    
+    def compiled(matcher):
+        for text in resumes:
+            matcher.find(text)
+    
+    print(f"Skill matching over {resume_count} resumes")
+    print(f"{'skills':>8} {'loop (res/s)':>14} {'matcher (res/s)':>16} {'build (ms)':>11} {'speedup':>8}")
+    for size in (26, 500, 2000, 5000):
+        skills = _synthetic_taxonomy(size)
+        start = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        build_ms = (time.perf_counter() - start) * 1000
+        
+        legacy_time = _time_it(legacy, skills)
+        matcher_time = _time_it(compiled, matcher)
+        print(f"{size:>8} {resume_count / legacy_time:>14.0f} {resume_count / matcher_time:>16.0f} "
+              f"{build_ms:>11.1f} {legacy_time / matcher_time:>7.1f}x")
+
+
+def bench_queue() -> None:
+    """Show that draining the simulator queue scales linearly with its size"""
+    message = WhatsAppMessage('0', 'Benchmark', SAMPLE_RESUME_1, timestamp='2024-01-01T00:00:00')
+    
+    def legacy_drain(count):
+        queue = [message] * count
+        while queue:
+            queue.pop(0)
+    
+    def simulator_drain(count):
+        simulator = WhatsAppSimulator()
+        # Keep the per-message console logging out of the measurement
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(count):
+                simulator.simulate_message_receipt(message)
+        start = time.perf_counter()
+        while simulator.get_next_message():
+            pass
+        return time.perf_counter() - start
+    
+    print("Queue drain time")
+    print(f"{'messages':>10} {'list.pop(0) (s)':>16} {'deque (s)':>10} {'deque (ns/msg)':>15}")
+    for count in (10_000, 100_000, 1_000_000):
+        legacy = f"{_time_it(legacy_drain, count, repeat=1):.3f}" if count <= 100_000 else 'skipped'
+        drain_time = simulator_drain(count)
+        print(f"{count:>10} {legacy:>16} {drain_time:>10.3f} {drain_time / count * 1e9:>15.0f}")
+
+
+def bench_regex() -> None:
+    """Show that email/phone extraction stays linear on pathological input"""
+    legacy_email = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+    legacy_phone = re.compile(r'[\+]?[0-9\-\.\s]{10,}')
+    extractor = ResumeDataExtractor()
+    
+    inputs = {
+        'letters, no @': lambda n: 'a' * n,
+        'dotted domain, no TLD': lambda n: 'a@' + 'a.' * (n // 2),
+        'grade table': lambda n: '2019 - 2021 | 8.5 9.1\n' * (n // 22),
+        'digit runs': lambda n: '123456789 ' * (n // 10),
+    }
+    
+    print("Email + phone extraction on pathological input")
+    print(f"{'input':>22} {'chars':>9} {'legacy (s)':>11} {'compiled (s)':>13} {'ns/char':>8}")
+    for name, make in inputs.items():
+        for size in (10_000, 100_000, 1_000_000):
+            text = make(size)
+            if size <= 10_000:
+                legacy = f"{_time_it(lambda: (legacy_email.search(text), legacy_phone.search(text)), repeat=1):.3f}"
+            else:
+                legacy = 'skipped'
+            compiled = _time_it(lambda: (extractor.extract_email(text), extractor.extract_phone(text)), repeat=1)
+            print(f"{name:>22} {len(text):>9} {legacy:>11} {compiled:>13.4f} {compiled / len(text) * 1e9:>8.1f}")
+
+
+def bench_candidate_db(count: int = 200_000) -> None:
+    """Time indexed candidate lookups against a linear scan of the skills strings"""
+    import tempfile
+    rng = random.Random(7)
+    skills = _synthetic_taxonomy(300)
+    candidates = [
+        {
+            'full_name': f'Candidate {i}',
+            'email': f'candidate{i}@example.com',
+            'phone': f'+91-9{i:09d}',
+            'skills': ', '.join(rng.sample(skills, 8)),
+        }
+        for i in range(count)
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = CandidateDatabase(os.path.join(tmp, 'candidates.db'))
+        start = time.perf_counter()
+        for offset in range(0, count, 10_000):
+            db.add_many(candidates[offset:offset + 10_000])
+        load_time = time.perf_counter() - start
+        
+        wanted = ['Kubernetes', 'PostgreSQL']
+        scan = _time_it(lambda: [c for c in candidates if all(s in c['skills'].split(', ') for s in wanted)])
+        lookups = {
+            'skills (2-way intersection)': lambda: db.find_by_skills(wanted),
+            'email': lambda: db.find_by_email(f'CANDIDATE{count // 2}@example.com'),
+            'phone': lambda: db.find_by_phone(f'91 9{count // 2:09d}'),
+        }
+        
+        print(f"Candidate database with {count} candidates (load {count / load_time:.0f} rows/s)")
+        print(f"{'query':>28} {'time (ms)':>10} {'rows':>6}")
+        print(f"{'linear scan of skills':>28} {scan * 1000:>10.2f}")
+        for name, query in lookups.items():
+            print(f"{name:>28} {_time_it(query) * 1000:>10.2f} {len(query()):>6}")
+        db.close()
+
+
+def _peak_memory(func, *args) -> int:
+    """Return the peak Python heap allocation of one call in bytes"""
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_docx(file_count: int = 20) -> None:
+    """Compare the python-docx object model against the streaming document.xml extractor"""
+    import tempfile
+    from docx import Document
+    
+    def python_docx(paths):
+        for path in paths:
+            '\n'.join(paragraph.text for paragraph in Document(path).paragraphs)
+    
+    def streaming(paths):
+        for path in paths:
+            FileProcessor.extract_text_from_docx(path)
+    
+    print(f"DOCX extraction over {file_count} generated files")
+    print(f"{'paragraphs':>11} {'python-docx (ms)':>17} {'streaming (ms)':>15} {'speedup':>8} "
+          f"{'peak python-docx (KB)':>22} {'peak streaming (KB)':>20}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for paragraph_count in (50, 500, 5000):
+            paths = []
+            for i in range(file_count):
+                document = Document()
+                for j in range(paragraph_count):
+                    document.add_paragraph(SAMPLE_RESUMES[(i + j) % len(SAMPLE_RESUMES)].splitlines()[j % 20])
+                table = document.add_table(rows=4, cols=2)
+                for row, skill in enumerate(DEFAULT_SKILLS[:4]):
+                    table.cell(row, 0).text = 'Skill'
+                    table.cell(row, 1).text = skill
+                path = os.path.join(tmp, f'resume_{paragraph_count}_{i}.docx')
+                document.save(path)
+                paths.append(path)
+            
+            legacy_time = _time_it(python_docx, paths)
+            streaming_time = _time_it(streaming, paths)
+            legacy_peak = _peak_memory(python_docx, paths[:1])
+            streaming_peak = _peak_memory(streaming, paths[:1])
+            print(f"{paragraph_count:>11} {legacy_time / file_count * 1000:>17.2f} "
+                  f"{streaming_time / file_count * 1000:>15.2f} {legacy_time / streaming_time:>7.1f}x "
+                  f"{legacy_peak / 1024:>22.0f} {streaming_peak / 1024:>20.0f}")
+
+
+def bench_import_time(runs: int = 5) -> bool:
+    """Check cold-import time of cv_manager against IMPORT_TIME_BUDGET_MS using -X importtime"""
+    import statistics
+    import subprocess
+    
+    check = f"import sys, cv_manager; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    package_dir = os.path.join(current_dir, 'cv_management_system')
+    timings = []
+    loaded = ''
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', check], cwd=package_dir,
+                                   capture_output=True, text=True, check=True)
+        for line in completed.stderr.splitlines():
+            # import time: self [us] | cumulative | module
+            fields = [field.strip() for field in line.split('|')]
+            if len(fields) == 3 and fields[2] == 'cv_manager':
+                timings.append(int(fields[1]) / 1000)
+        loaded = completed.stdout.strip()
+    
+    median = statistics.median(timings)
+    print(f"Cold import of cv_manager: median {median:.1f} ms over {runs} runs (budget {IMPORT_TIME_BUDGET_MS} ms)")
+    print(f"Optional dependencies loaded at import: {loaded or 'none'}")
+    if median > IMPORT_TIME_BUDGET_MS or loaded:
+        print("FAILED: import-time budget exceeded")
+        return False
+    return True
+
+
+def _run_system_info() -> dict:
+    """Python, platform and git commit recorded with machine-readable results"""
+    import platform
+    import subprocess
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=current_dir or '.', capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit,
+    }
+
+
+def _rate(count: int, seconds: float) -> float:
+    """Items per second, rounded for reporting"""
+    return round(count / seconds, 1) if seconds else None
+
+
+def bench_corpus(count: int = 1000, formats: tuple = CORPUS_FORMATS, seed: int = 42, length: float = 1.0,
+                 skill_density: float = 0.3, noise: float = 0.0, memory_sample: int = 200) -> dict:
+    """
+    Measure per-stage throughput and memory on a generated corpus
+    Stages: FileProcessor.process_file, ResumeDataExtractor.parse_resume and the
+    full CVManagementSystem pipeline (serial, demo sheet). Peak memory is the
+    tracemalloc peak over the first memory_sample items of each stage.
+    """
+    import tempfile
+    from cv_manager import CVManagementSystem
+    
+    extractor = ResumeDataExtractor()
+    sample = min(count, memory_sample)
+    results = {'parameters': {'count': count, 'formats': list(formats), 'seed': seed, 'length': length,
+                              'skill_density': skill_density, 'noise': noise, 'memory_sample': sample},
+               'system': _run_system_info(), 'stages': {}}
+    stages = results['stages']
+    
+    def parse_all(texts):
+        for text in texts:
+            extractor.parse_resume(text)
+    
+    start = time.perf_counter()
+    parse_all(iter_resumes(count, seed, length, skill_density, noise))
+    parse_time = time.perf_counter() - start
+    stages['parsing'] = {
+        'items_per_s': _rate(count, parse_time),
+        'seconds': round(parse_time, 3),
+        'peak_kb': round(_peak_memory(parse_all, list(iter_resumes(sample, seed, length, skill_density, noise))) / 1024),
+    }
+    
+    print(f"Corpus of {count} resumes (length {length}, skill density {skill_density}, noise {noise}, seed {seed})")
+    print(f"{'format':>7} {'stage':>16} {'items/s':>10} {'MB/s':>8} {'peak (KB)':>10}")
+    print(f"{'-':>7} {'parsing':>16} {stages['parsing']['items_per_s']:>10} {'':>8} {stages['parsing']['peak_kb']:>10}")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for file_format in formats:
+            start = time.perf_counter()
+            paths = list(write_corpus(os.path.join(tmp, file_format), count, file_format, seed, length,
+                                      skill_density, noise))
+            generate_time = time.perf_counter() - start
+            total_bytes = sum(os.stat(path).st_size for path in paths)
+            
+            def extract_all(file_paths):
+                for path in file_paths:
+                    FileProcessor.process_file(path)
+            
+            start = time.perf_counter()
+            extract_all(paths)
+            extract_time = time.perf_counter() - start
+            
+            def run_pipeline(file_paths):
+                system = CVManagementSystem(dedup_cache_path=None)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    # Feed the queue in batches so it never holds the whole corpus
+                    for offset in range(0, len(file_paths), 10_000):
+                        for i, path in enumerate(file_paths[offset:offset + 10_000], start=offset):
+                            system.receive_message(WhatsAppMessage(str(i), 'Benchmark', '', file_path=path))
+                        system.process_all_pending()
+                return system
+            
+            start = time.perf_counter()
+            system = run_pipeline(paths)
+            pipeline_time = time.perf_counter() - start
+            summary = system.get_processing_summary()
+            
+            stages[file_format] = {
+                'generate': {'items_per_s': _rate(count, generate_time), 'bytes': total_bytes},
+                'file_extraction': {
+                    'items_per_s': _rate(count, extract_time),
+                    'mb_per_s': round(total_bytes / 1e6 / extract_time, 2),
+                    'peak_kb': round(_peak_memory(extract_all, paths[:sample]) / 1024),
+                },
+                'pipeline': {
+                    'items_per_s': _rate(count, pipeline_time),
+                    'successful': summary['successful'],
+                    'peak_kb': round(_peak_memory(run_pipeline, paths[:sample]) / 1024),
+                    'stage_latency': summary['stage_latency'],
+                },
+            }
+            row = stages[file_format]
+            print(f"{file_format:>7} {'file_extraction':>16} {row['file_extraction']['items_per_s']:>10} "
+                  f"{row['file_extraction']['mb_per_s']:>8} {row['file_extraction']['peak_kb']:>10}")
+            print(f"{file_format:>7} {'pipeline':>16} {row['pipeline']['items_per_s']:>10} {'':>8} "
+                  f"{row['pipeline']['peak_kb']:>10}")
+    return results
+
+
+def bench_parse_many(count: int = 20_000) -> None:
+    """Compare parse_resume in a loop against the batch parse_many"""
+    extractor = ResumeDataExtractor()
+    texts = list(iter_resumes(count))
+    loop_time = _time_it(lambda: [extractor.parse_resume(text) for text in texts])
+    batch_time = _time_it(extractor.parse_many, texts)
+    print(f"Parsing {count} generated resumes")
+    print(f"{'parse_resume loop (res/s)':>26} {'parse_many (res/s)':>19} {'speedup':>8}")
+    print(f"{count / loop_time:>26.0f} {count / batch_time:>19.0f} {loop_time / batch_time:>7.1f}x")
+    
+    # Only education and experience are batched; compare them with the
+    # per-text line classification parse_resume uses for them
+    from data_extractor import BATCH_SEPARATOR, _batch_starts, _first_matches
+    stripped = [text.strip() for text in texts]
+    lowered = [text.lower() for text in stripped]
+    classify_time = _time_it(lambda: [extractor.classify_lines(text) for text in stripped])
+    batched_time = _time_it(lambda: (
+        _first_matches(extractor._edu_regex, BATCH_SEPARATOR.join(stripped), _batch_starts(stripped), 3, True),
+        _first_matches(extractor._exp_regex, BATCH_SEPARATOR.join(lowered), _batch_starts(lowered), 2, True),
+    ))
+    print(f"{'education + experience':>26} {classify_time * 1000:>12.0f} ms loop {batched_time * 1000:>8.0f} ms batch "
+          f"{classify_time / batched_time:>5.1f}x")
+
+
+def bench_durable_queue(count: int = 100_000, batch: int = 1000) -> None:
+    """Enqueue, lease and acknowledge throughput of the SQLite WAL queue"""
+    import tempfile
+    payloads = [({'sender_id': str(i), 'message_text': SAMPLE_RESUMES[i % len(SAMPLE_RESUMES)][:200]}, f'msg-{i}')
+                for i in range(count)]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = DurableQueue(os.path.join(tmp, 'queue.db'))
+        start = time.perf_counter()
+        for offset in range(0, count, batch):
+            queue.put_many(payloads[offset:offset + batch])
+        enqueue_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        while True:
+            leased = queue.lease(batch)
+            if not leased:
+                break
+            queue.ack([receipt for receipt, _ in leased], [payload['sender_id'] for _, payload in leased])
+        dequeue_time = time.perf_counter() - start
+        queue.close()
+    
+    print(f"Durable queue with {count} messages in batches of {batch}")
+    print(f"{'enqueue (msg/s)':>16} {'lease + ack (msg/s)':>20}")
+    print(f"{count / enqueue_time:>16.0f} {count / dequeue_time:>20.0f}")
+
+
+def bench_sharded(count: int = 2000, worker_counts: tuple = (1, 2, 4)) -> None:
+    """Pipeline throughput of the sharded coordinator against a single CVManagementSystem"""
+    from cv_manager import CVManagementSystem
+    from sharded_cv_manager import ShardedCVManagementSystem
+    texts = list(iter_resumes(count))
+    
+    def run(system):
+        for i, text in enumerate(texts):
+            system.receive_message(WhatsAppMessage(str(i), 'Benchmark', text))
+        start = time.perf_counter()
+        system.process_all_pending()
+        return time.perf_counter() - start
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        single_time = run(CVManagementSystem(dedup_cache_path=None))
+    print(f"Pipeline over {count} resumes ({os.cpu_count()} CPUs)")
+    print(f"{'workers':>8} {'msg/s':>10} {'speedup':>8}")
+    print(f"{'single':>8} {count / single_time:>10.0f} {1:>8.2f}")
+    for workers in worker_counts:
+        with ShardedCVManagementSystem(workers, system_options={'dedup_cache_path': None},
+                                       quiet_workers=True) as system:
+            with contextlib.redirect_stdout(io.StringIO()):
+                seconds = run(system)
+        print(f"{workers:>8} {count / seconds:>10.0f} {single_time / seconds:>8.2f}")
+
+
+def bench_sections(repeat: int = 20) -> None:
+    """parse_resume against parse_resume_sections as a resume grows past its key sections"""
+    extractor = ResumeDataExtractor()
+    # Publications appended after the experience section make the resume longer
+    # without adding information either parser keeps
+    filler = 'PUBLICATIONS\n' + '\n'.join(
+        f"- Paper {i}: scalable data pipelines with Python and Kubernetes, 20{i % 25:02d}" for i in range(100)
+    ) + '\n'
+    
+    print(f"{'length (KB)':>12} {'parse_resume (ms)':>18} {'sections (ms)':>14} {'speedup':>8}")
+    for copies in (0, 1, 10, 100):
+        text = SAMPLE_RESUME_1 + filler * copies
+        full = _time_it(extractor.parse_resume, text, repeat=repeat)
+        lazy = _time_it(extractor.parse_resume_sections, text, repeat=repeat)
+        print(f"{len(text) / 1024:>12.1f} {full * 1000:>18.3f} {lazy * 1000:>14.3f} {full / lazy:>8.1f}")
+
+
+def bench_sheets_scheduler(rows: int = 2000) -> bool:
+    """Rows written under a throttling Sheets stub: direct appends against SheetWriteScheduler"""
+    from google_sheets_handler import GoogleSheetsHandler
+    from sheets_stub import ThrottlingSheetsService
+    from write_scheduler import SheetWriteScheduler
+    from tracing import NullSink, Tracer, set_tracer
+    
+    # 20 requests per second with 10% server errors, scaled down from a per-minute quota
+    def stub_handler():
+        handler = GoogleSheetsHandler(service=ThrottlingSheetsService(quota=20, window=1.0, error_rate=0.1,
+                                                                      latency=0.005, seed=1))
+        handler.spreadsheet_id = 'benchmark'
+        return handler
+    
+    previous = set_tracer(Tracer([NullSink()]))
+    try:
+        handler = stub_handler()
+        start = time.perf_counter()
+        direct = sum(handler.append_row([str(i)]) for i in range(rows))
+        direct_time = time.perf_counter() - start
+        
+        handler = stub_handler()
+        scheduler = SheetWriteScheduler(handler, requests_per_minute=1200, base_delay=0.05, max_delay=1.0,
+                                        initial_batch=1, seed=1)
+        start = time.perf_counter()
+        futures = [scheduler.submit([str(i)]) for i in range(rows)]
+        scheduled = sum(future.result() for future in futures)
+        scheduled_time = time.perf_counter() - start
+        scheduler.close()
+        stats = scheduler.get_statistics()
+    finally:
+        set_tracer(previous)
+    
+    in_order = [row[0] for row in handler._service.rows] == [str(i) for i in range(rows)]
+    print(f"{rows} rows against a stub allowing 20 requests/s with 10% server errors")
+    print(f"{'writer':>10} {'written':>8} {'seconds':>8} {'requests':>9} {'throttled':>10}")
+    print(f"{'direct':>10} {direct:>8} {direct_time:>8.2f} {rows:>9} {'':>10}")
+    print(f"{'scheduler':>10} {scheduled:>8} {scheduled_time:>8.2f} {stats['requests']:>9} {stats['throttled']:>10}")
+    print(f"Final batch size {stats['batch_size']}, rows in order: {in_order}")
+    return scheduled == rows and in_order
+
+
+BENCHMARKS = {
+    'skills': bench_skills,
+    'queue': bench_queue,
+    'regex': bench_regex,
+    'candidate_db': bench_candidate_db,
+    'docx': bench_docx,
+    'import_time': bench_import_time,
+    'corpus': bench_corpus,
+    'parse_many': bench_parse_many,
+    'durable_queue': bench_durable_queue,
+    'sharded': bench_sharded,
+    'sections': bench_sections,
+    'sheets_scheduler': bench_sheets_scheduler,
+}
+
+
+def main():
+    """Run the selected benchmarks (all by default)"""
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description='Benchmark CV Management System components')
+    parser.add_argument('names', nargs='*', help=', '.join(BENCHMARKS))
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--formats', default=','.join(CORPUS_FORMATS))
+    parser.add_argument('--length', type=float, default=1.0)
+    parser.add_argument('--skill-density', type=float, default=0.3)
+    parser.add_argument('--noise', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write machine-readable results to this JSON file')
+    args = parser.parse_args()
+    
+    options = {
+        'corpus': {'count': args.count, 'formats': tuple(args.formats.split(',')), 'length': args.length,
+                   'skill_density': args.skill_density, 'noise': args.noise, 'seed': args.seed},
+    }
+    failed = False
+    results = {}
+    for name in args.names or list(BENCHMARKS):
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            continue
+        outcome = BENCHMARKS[name](**options.get(name, {}))
+        if outcome is False:
+            failed = True
+        elif isinstance(outcome, dict):
+            results[name] = outcome
+        print()
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
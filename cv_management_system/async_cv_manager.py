@@ -0,0 +1,265 @@
+"""
+Asyncio orchestrator for the CV Management System
+Messages flow through bounded stages: receive -> extract text -> parse -> persist
+"""
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import asyncio
+import os
+import time
+
+from whatsapp_simulator import WhatsAppMessage
+from cv_manager import CVManagementSystem, _init_worker, _parse_pool_task, _process_pool_task, _run_cpu_stages
+from config import SKILL_TAXONOMY_FILE, DEDUP_CACHE_FILE, CANDIDATE_DB_FILE, MESSAGE_QUEUE_FILE
+from tracing import Tracer, run_profiled
+
+# Number of concurrent tasks per pipeline stage
+DEFAULT_STAGE_CONCURRENCY = {
+    'extract': 4,
+    'parse': 4,
+    'persist': 8,
+}
+
+
+class AsyncCVManagementSystem(CVManagementSystem):
+    """
+    Asyncio version of CVManagementSystem with the same methods as coroutines
+    
+    CPU-bound extraction and parsing run in an executor, sheet writes run in
+    threads, and each stage has its own concurrency limit. Each message is
+    recorded and acknowledged as soon as it finishes; results are returned in
+    message order, as with the synchronous orchestrator.
+    """
+    
+    def __init__(self, use_real_google_sheets: bool = False,
+                 dedup_cache_path: Optional[str] = DEDUP_CACHE_FILE,
+                 candidate_db_path: Optional[str] = CANDIDATE_DB_FILE,
+                 stage_concurrency: Optional[Dict[str, int]] = None,
+                 queue_size: int = 100, executor: str = 'process', workers: Optional[int] = None,
+                 tracer: Optional[Tracer] = None, queue_path: Optional[str] = MESSAGE_QUEUE_FILE):
+        """
+        Initialize the async CV Management System
+        
+        Args:
+            use_real_google_sheets: If True, attempts to use real Google Sheets API
+            dedup_cache_path: SQLite file for the duplicate-submission cache
+            candidate_db_path: SQLite file of the indexed candidate database
+            stage_concurrency: Per-stage task limits overriding DEFAULT_STAGE_CONCURRENCY
+            queue_size: Maximum number of items waiting between two stages
+            executor: 'process' or 'thread' pool for extraction and parsing
+            workers: Size of that pool (defaults to the CPU count)
+            tracer: Receives per-message spans (defaults to get_tracer())
+            queue_path: SQLite file of a durable message queue (None for in-memory)
+        """
+        super().__init__(use_real_google_sheets=use_real_google_sheets, dedup_cache_path=dedup_cache_path,
+                         candidate_db_path=candidate_db_path, tracer=tracer,
+                         queue_path=queue_path)
+        if executor not in ('process', 'thread'):
+            raise ValueError(f"Unknown executor: {executor} (expected 'process' or 'thread')")
+        
+        self.stage_concurrency = {**DEFAULT_STAGE_CONCURRENCY, **(stage_concurrency or {})}
+        self.queue_size = queue_size
+        self.executor = executor
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: Optional[Executor] = None
+    
+    def _get_pool(self) -> Executor:
+        """Create the CPU executor on first use"""
+        if self._pool is None:
+            if self.executor == 'process':
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker, initargs=(SKILL_TAXONOMY_FILE,)
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return self._pool
+    
+    async def process_incoming_message(self, message: WhatsAppMessage) -> Dict:
+        """Process a single incoming WhatsApp message through the pipeline"""
+        async def single():
+            yield message
+        
+        results = await self._run_pipeline(single())
+        return results[0]
+    
+    async def process_all_pending(self, poll_interval: Optional[float] = None) -> List[Dict]:
+        """
+        Process pending messages from the WhatsApp simulator
+        
+        Args:
+            poll_interval: If set, keep waiting for new messages (see
+                           WhatsAppSimulator.stream_messages) until cancelled.
+                           Results are then only recorded (statistics, candidate
+                           store), not collected, so memory stays bounded.
+        
+        Returns:
+            List of processing results in the original message order
+        """
+        return await self._run_pipeline(self.whatsapp_sim.stream_messages(poll_interval),
+                                        collect=poll_interval is None)
+    
+    async def _run_pipeline(self, source: AsyncIterator[WhatsAppMessage], collect: bool = True) -> List[Dict]:
+        """
+        Push messages from source through the bounded stages
+        Each message is recorded and acknowledged as soon as its last stage
+        finishes, and forgotten unless collect is True.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        if self.executor == 'process':
+            parse, cpu_stages = _parse_pool_task, _process_pool_task
+        else:
+            parse = self.data_extractor.parse_resume
+            cpu_stages = partial(_run_cpu_stages, self.file_processor, self.data_extractor)
+        
+        to_extract = asyncio.Queue(self.queue_size)
+        to_parse = asyncio.Queue(self.queue_size)
+        to_persist = asyncio.Queue(self.queue_size)
+        
+        collected = []
+        # Messages still in the pipeline: index -> (result, message, trace_id, cache key, profiled)
+        active: Dict[int, Tuple[Dict, WhatsAppMessage, str, Optional[str], bool]] = {}
+        # Repeats of a message still in the pipeline, by the index of the first submission
+        duplicates: Dict[int, List[Tuple[Dict, WhatsAppMessage]]] = {}
+        in_flight = {}
+        
+        def complete(result: Dict, message: WhatsAppMessage) -> None:
+            self._record_result(result)
+            self.whatsapp_sim.ack(message)
+        
+        def finish(index: int) -> None:
+            result, message, _, key, _ = active.pop(index)
+            if key and in_flight.get(key) == index:
+                del in_flight[key]
+            complete(result, message)
+            for duplicate, duplicate_message in duplicates.pop(index, []):
+                if result['status'] == 'success':
+                    self._apply_duplicate(duplicate, result['extracted_data'])
+                else:
+                    duplicate['status'] = 'failed'
+                    duplicate['errors'].append("Duplicate of an earlier message that was not uploaded")
+                complete(duplicate, duplicate_message)
+        
+        async def run_cpu(index: int, stage: str, function, *args):
+            # Sampled messages run their CPU stages under cProfile
+            trace_id, profiled = active[index][2], active[index][4]
+            if not profiled:
+                return await loop.run_in_executor(pool, function, *args)
+            value, profile = await loop.run_in_executor(pool, run_profiled, function, *args)
+            self.tracer.add_profile(trace_id, profile, name=f"{trace_id}-{stage}")
+            return value
+        
+        async def extract(index: int, message: WhatsAppMessage) -> bool:
+            result, _, trace_id, _, _ = active[index]
+            if message.file_path and os.path.exists(message.file_path):
+                # Attachments are streamed into the parser as in the synchronous
+                # orchestrator (page cap, early stop), so they skip the parse stage
+                content, extracted, errors, timings = await run_cpu(index, 'extract', cpu_stages,
+                                                                    message.file_path, '')
+                self._record_timings(timings, trace_id, content)
+                self._apply_cpu_stages(result, content, extracted, errors)
+                if not extracted:
+                    return False
+                await to_persist.put((index, extracted))
+                return True
+            
+            content = message.message_text
+            if not content:
+                self._apply_cpu_stages(result, None, None, ["No content found to process"])
+                return False
+            await to_parse.put((index, content))
+            return True
+        
+        async def parse_content(index: int, content: str) -> bool:
+            result, _, trace_id, _, _ = active[index]
+            start = time.perf_counter()
+            extracted = await run_cpu(index, 'parse', parse, content)
+            self._record_timings({'parsing': time.perf_counter() - start}, trace_id, content)
+            self._apply_cpu_stages(result, content, extracted, [])
+            if not extracted:
+                return False
+            await to_persist.put((index, extracted))
+            return True
+        
+        async def persist(index: int, extracted: Dict) -> bool:
+            result, message, trace_id, key, _ = active[index]
+            row_data = self.data_extractor.format_for_sheet(extracted)
+            uploaded = await loop.run_in_executor(None, self._upload_once, message, row_data, trace_id)
+            self._apply_upload(result, uploaded)
+            self._remember(key, result)
+            return False
+        
+        async def run_stage(queue: asyncio.Queue, handler) -> None:
+            while True:
+                index, payload = await queue.get()
+                try:
+                    handed_on = await handler(index, payload)
+                except Exception as e:
+                    result = active[index][0]
+                    result['status'] = 'failed'
+                    result['errors'].append(str(e))
+                    handed_on = False
+                try:
+                    if not handed_on:
+                        finish(index)
+                except Exception as e:
+                    self.tracer.event('pipeline.error', f"Could not record message {index}: {e}", level='error')
+                finally:
+                    queue.task_done()
+        
+        workers = []
+        for queue, handler, stage in ((to_extract, extract, 'extract'),
+                                      (to_parse, parse_content, 'parse'),
+                                      (to_persist, persist, 'persist')):
+            workers += [asyncio.create_task(run_stage(queue, handler))
+                        for _ in range(self.stage_concurrency[stage])]
+        
+        try:
+            # Receive stage: cache and replay checks happen here so duplicates never enter the pipeline
+            index = 0
+            async for message in source:
+                result = self._new_result(message)
+                if collect:
+                    collected.append(result)
+                trace_id = self._next_trace_id()
+                key = await loop.run_in_executor(None, self._cache_key, message)
+                
+                cached = self._cached(key)
+                if cached is not None:
+                    self._apply_duplicate(result, cached)
+                    complete(result, message)
+                elif self.whatsapp_sim.is_processed(message):
+                    self._apply_replayed(result)
+                    complete(result, message)
+                elif key in in_flight:
+                    duplicates.setdefault(in_flight[key], []).append((result, message))
+                else:
+                    if key:
+                        in_flight[key] = index
+                    active[index] = (result, message, trace_id, key, self.tracer.sample_profile())
+                    await to_extract.put((index, message))
+                index += 1
+            
+            for queue in (to_extract, to_parse, to_persist):
+                await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.whatsapp_sim.flush_acks()
+        
+        return collected
+    
+    def close(self) -> None:
+        """Shut down the CPU executor and the sheet writer"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        super().close()
+    
+    async def __aenter__(self) -> 'AsyncCVManagementSystem':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
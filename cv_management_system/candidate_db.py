@@ -0,0 +1,175 @@
+"""
+Module for a local, indexed candidate database
+Parsed candidates are stored in SQLite with an inverted skill index so lookups
+by skill, email, phone or date do not scan every record
+"""
+from typing import Dict, Iterable, List, Optional
+from datetime import datetime
+import re
+import sqlite3
+import threading
+
+from candidate_store import CANDIDATE_FIELDS
+
+_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS candidates ('
+    ' id INTEGER PRIMARY KEY,'
+    ' full_name TEXT, email TEXT, phone TEXT, education TEXT, skills TEXT, experience TEXT,'
+    ' email_key TEXT, phone_key TEXT, created_at TEXT NOT NULL)',
+    # Inverted index: skill -> candidate ids
+    'CREATE TABLE IF NOT EXISTS candidate_skills ('
+    ' skill TEXT NOT NULL, candidate_id INTEGER NOT NULL,'
+    ' PRIMARY KEY (skill, candidate_id)) WITHOUT ROWID',
+    'CREATE INDEX IF NOT EXISTS candidates_email ON candidates (email_key)',
+    'CREATE INDEX IF NOT EXISTS candidates_phone ON candidates (phone_key)',
+    'CREATE INDEX IF NOT EXISTS candidates_created_at ON candidates (created_at)',
+]
+
+NOT_SPECIFIED = 'Not specified'
+
+
+def _email_key(email: Optional[str]) -> Optional[str]:
+    """Normalize an email for lookups"""
+    if not email or email == NOT_SPECIFIED:
+        return None
+    return email.strip().lower()
+
+
+def _phone_key(phone: Optional[str]) -> Optional[str]:
+    """Normalize a phone number to its digits for lookups"""
+    if not phone or phone == NOT_SPECIFIED:
+        return None
+    return re.sub(r'\D', '', phone) or None
+
+
+def _split_skills(skills: Optional[str]) -> List[str]:
+    """Split the comma-joined skills field into normalized index keys"""
+    if not skills or skills == NOT_SPECIFIED:
+        return []
+    return sorted({skill.strip().lower() for skill in skills.split(',') if skill.strip()})
+
+
+class CandidateDatabase:
+    """SQLite-backed candidate store with skill, email, phone and date indexes"""
+    
+    def __init__(self, db_path: str = ':memory:'):
+        """
+        Initialize the database
+        
+        Args:
+            db_path: SQLite database file (':memory:' for a temporary database)
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if db_path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+    
+    def add(self, candidate: Dict[str, str], created_at: Optional[datetime] = None) -> int:
+        """Store one parsed candidate and return its id (see add_many)"""
+        return self.add_many([candidate], created_at)[0]
+    
+    def add_many(self, candidates: Iterable[Dict[str, str]], created_at: Optional[datetime] = None) -> List[int]:
+        """
+        Store parsed candidates in a single transaction and return their ids
+        A candidate with the email (or, without one, the phone number) of a
+        stored candidate replaces it, keeping its id and created_at.
+        """
+        timestamp = (created_at or datetime.now()).isoformat(timespec='seconds')
+        ids = []
+        with self._lock, self._conn:
+            for candidate in candidates:
+                values = [candidate.get(field, NOT_SPECIFIED) for field in CANDIDATE_FIELDS]
+                email_key, phone_key = _email_key(candidate.get('email')), _phone_key(candidate.get('phone'))
+                candidate_id = self._existing_id(email_key, phone_key)
+                if candidate_id is None:
+                    cursor = self._conn.execute(
+                        'INSERT INTO candidates (full_name, email, phone, education, skills, experience,'
+                        ' email_key, phone_key, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        values + [email_key, phone_key, timestamp]
+                    )
+                    candidate_id = cursor.lastrowid
+                else:
+                    self._conn.execute(
+                        'UPDATE candidates SET full_name = ?, email = ?, phone = ?, education = ?, skills = ?,'
+                        ' experience = ?, email_key = ?, phone_key = ? WHERE id = ?',
+                        values + [email_key, phone_key, candidate_id]
+                    )
+                    self._conn.execute('DELETE FROM candidate_skills WHERE candidate_id = ?', (candidate_id,))
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO candidate_skills (skill, candidate_id) VALUES (?, ?)',
+                    [(skill, candidate_id) for skill in _split_skills(candidate.get('skills'))]
+                )
+                ids.append(candidate_id)
+        return ids
+    
+    def _existing_id(self, email_key: Optional[str], phone_key: Optional[str]) -> Optional[int]:
+        """Id of the stored candidate with this email, or phone if there is no email"""
+        if email_key:
+            row = self._conn.execute('SELECT id FROM candidates WHERE email_key = ? LIMIT 1', (email_key,)).fetchone()
+        elif phone_key:
+            row = self._conn.execute('SELECT id FROM candidates WHERE phone_key = ? AND email_key IS NULL LIMIT 1',
+                                     (phone_key,)).fetchone()
+        else:
+            row = None
+        return row[0] if row else None
+    
+    def find_by_skills(self, skills: Iterable[str], limit: Optional[int] = None, match: str = 'all') -> List[Dict]:
+        """
+        Return candidates that have every one (match='all') or at least one
+        (match='any') of the given skills
+        """
+        if match not in ('all', 'any'):
+            raise ValueError(f"Unknown match: {match} (expected 'all' or 'any')")
+        keys = sorted({skill.strip().lower() for skill in skills if skill.strip()})
+        if not keys:
+            return []
+        
+        # Each branch is a range scan on the (skill, candidate_id) primary key
+        operator = ' INTERSECT ' if match == 'all' else ' UNION '
+        matches = operator.join(['SELECT candidate_id FROM candidate_skills WHERE skill = ?'] * len(keys))
+        query = f'SELECT * FROM candidates WHERE id IN ({matches}) ORDER BY id'
+        return self._query(query, keys, limit)
+    
+    def find_by_email(self, email: str) -> List[Dict]:
+        """Return candidates with the given email (case-insensitive)"""
+        return self._query('SELECT * FROM candidates WHERE email_key = ? ORDER BY id', [_email_key(email)])
+    
+    def find_by_phone(self, phone: str) -> List[Dict]:
+        """Return candidates with the given phone number, ignoring formatting"""
+        return self._query('SELECT * FROM candidates WHERE phone_key = ? ORDER BY id', [_phone_key(phone)])
+    
+    def find_by_date_range(self, start: datetime, end: datetime, limit: Optional[int] = None) -> List[Dict]:
+        """Return candidates added between start and end (inclusive)"""
+        return self._query(
+            'SELECT * FROM candidates WHERE created_at BETWEEN ? AND ? ORDER BY created_at, id',
+            [start.isoformat(timespec='seconds'), end.isoformat(timespec='seconds')],
+            limit
+        )
+    
+    def count(self) -> int:
+        """Number of stored candidates"""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM candidates').fetchone()[0]
+    
+    def _query(self, query: str, params: List, limit: Optional[int] = None) -> List[Dict]:
+        """Run a candidate query and return rows as dictionaries"""
+        if limit is not None:
+            query += ' LIMIT ?'
+            params = list(params) + [limit]
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {'id': row['id'], **{field: row[field] for field in CANDIDATE_FIELDS}, 'created_at': row['created_at']}
+            for row in rows
+        ]
+    
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
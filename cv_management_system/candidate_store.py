@@ -0,0 +1,143 @@
+"""
+Module for compact, bounded in-memory storage of candidates and processing results
+"""
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+from collections import deque
+from itertools import islice
+import hashlib
+import os
+
+CANDIDATE_FIELDS = ('full_name', 'email', 'phone', 'education', 'skills', 'experience')
+
+
+def _iter_since(items: Deque, total_added: int, seq: int) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (sequence number, item) for retained items added after seq
+    Sequence numbers start at 1 and keep counting past evicted items.
+    """
+    first_seq = total_added - len(items) + 1
+    skip = max(0, seq - first_seq + 1)
+    for offset, item in enumerate(islice(items, skip, None)):
+        yield first_seq + skip + offset, item
+
+
+class CandidateRecord:
+    """Extracted candidate data stored in slots instead of a per-record dict"""
+    __slots__ = CANDIDATE_FIELDS
+    
+    def __init__(self, data: Dict[str, str]):
+        for field in CANDIDATE_FIELDS:
+            setattr(self, field, data.get(field, 'Not specified'))
+    
+    def __getitem__(self, key: str) -> str:
+        if key not in CANDIDATE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style access so records can be used where dicts were"""
+        return getattr(self, key) if key in CANDIDATE_FIELDS else default
+    
+    def keys(self) -> List[str]:
+        return list(CANDIDATE_FIELDS)
+    
+    def to_dict(self) -> Dict[str, str]:
+        """Convert to a plain dictionary (e.g. for JSON export)"""
+        return {field: getattr(self, field) for field in CANDIDATE_FIELDS}
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CandidateRecord):
+            other = other.to_dict()
+        return self.to_dict() == other
+    
+    def __repr__(self) -> str:
+        return f"CandidateRecord({self.to_dict()!r})"
+
+
+class CandidateStore:
+    """Bounded store of CandidateRecord objects; the oldest are dropped past max_records"""
+    
+    def __init__(self, max_records: Optional[int] = None):
+        """
+        Initialize the store
+        
+        Args:
+            max_records: Maximum number of retained records (None for unbounded)
+        """
+        self._records: Deque[CandidateRecord] = deque(maxlen=max_records)
+        self.total_added = 0
+    
+    def add(self, data: Dict[str, str]) -> CandidateRecord:
+        """Store extracted data and return its record"""
+        record = CandidateRecord(data)
+        self._records.append(record)
+        self.total_added += 1
+        return record
+    
+    def iter_since(self, seq: int = 0) -> Iterator[Tuple[int, CandidateRecord]]:
+        """Yield (sequence number, record) for records added after seq"""
+        return _iter_since(self._records, self.total_added, seq)
+    
+    def __iter__(self) -> Iterator[CandidateRecord]:
+        return iter(self._records)
+    
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class ResumeTextStore:
+    """Write full resume text to disk so it does not stay in memory"""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def save(self, text: str) -> str:
+        """Store text under its content hash and return the file path"""
+        data = text.encode('utf-8')
+        path = os.path.join(self.directory, hashlib.sha256(data).hexdigest() + '.txt')
+        if not os.path.exists(path):
+            with open(path, 'wb') as file:
+                file.write(data)
+        return path
+
+
+class ProcessingLog:
+    """
+    Bounded log of processing results
+    Entries drop the full message text; it is written to a ResumeTextStore
+    when one is configured and referenced by 'content_file'.
+    """
+    
+    def __init__(self, max_entries: Optional[int] = None, text_store: Optional[ResumeTextStore] = None):
+        """
+        Initialize the log
+        
+        Args:
+            max_entries: Maximum number of retained entries (None for unbounded)
+            text_store: Optional on-disk store for the full message text
+        """
+        self._entries: Deque[Dict] = deque(maxlen=max_entries)
+        self.text_store = text_store
+        self.total_added = 0
+    
+    def add(self, result: Dict, record: Optional[CandidateRecord] = None) -> Dict:
+        """Store a compact copy of a processing result"""
+        entry = {key: value for key, value in result.items() if key != 'message_content'}
+        if record is not None:
+            entry['extracted_data'] = record
+        if self.text_store and result.get('message_content'):
+            entry['content_file'] = self.text_store.save(result['message_content'])
+        self._entries.append(entry)
+        self.total_added += 1
+        return entry
+    
+    def iter_since(self, seq: int = 0) -> Iterator[Tuple[int, Dict]]:
+        """Yield (sequence number, entry) for entries added after seq"""
+        return _iter_since(self._entries, self.total_added, seq)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._entries)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -2,14 +2,40 @@
 Configuration module for CV Management System
 """
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+
+def _find_env_file() -> str:
+    """
+    Return the nearest .env file, or '' if there is none
+    Like python-dotenv, directories are searched upwards from this module and
+    then from the working directory.
+    """
+    for directory in (os.path.dirname(os.path.abspath(__file__)), os.getcwd()):
+        while True:
+            candidate = os.path.join(directory, '.env')
+            if os.path.isfile(candidate):
+                return candidate
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+    return ''
+
+
+# python-dotenv is only imported when there is a .env file to load
+_env_file = _find_env_file()
+if _env_file:
+    from dotenv import load_dotenv
+    load_dotenv(_env_file)
 
 # Google Sheets Configuration
 GOOGLE_SHEETS_API_KEY = os.getenv('GOOGLE_SHEETS_API_KEY')
 SPREADSHEET_ID = os.getenv('SPREADSHEET_ID')
 SHEET_NAME = 'Candidates'
+# Write request quota per minute for the rate-limited write scheduler (0 writes directly)
+SHEETS_REQUESTS_PER_MINUTE = float(os.getenv('SHEETS_REQUESTS_PER_MINUTE', '60'))
+# Seconds to wait for a scheduled sheet write before counting it as failed
+SHEETS_WRITE_TIMEOUT = float(os.getenv('SHEETS_WRITE_TIMEOUT', '300'))
 
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
@@ -17,6 +43,29 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 # Application Configuration
 DEMO_MODE = True  # Set to True for demo without actual WhatsApp/Google APIs
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+# Read at most this many pages of a PDF attachment (empty reads them all)
+MAX_PDF_PAGES = int(os.getenv('MAX_PDF_PAGES', '0')) or None
+SKILL_TAXONOMY_FILE = os.getenv('SKILL_TAXONOMY_FILE')  # Optional skills/synonyms file
+
+# Parse resumes section by section and stop once every field is found
+SECTION_AWARE_PARSING = os.getenv('SECTION_AWARE_PARSING', '').lower() in ('1', 'true', 'yes')
+
+# Duplicate submission cache (':memory:' keeps it per process, empty disables it)
+DEDUP_CACHE_FILE = os.getenv('DEDUP_CACHE_FILE', ':memory:') or None
+DEDUP_CACHE_MAX_BYTES = 50 * 1024 * 1024  # 50MB
+
+# Retention of in-memory results and candidates (0 keeps everything)
+MAX_RETAINED_RECORDS = int(os.getenv('MAX_RETAINED_RECORDS', '10000')) or None
+RESUME_TEXT_DIR = os.getenv('RESUME_TEXT_DIR')  # Full resume text is dropped if unset
+
+# Indexed local candidate database (disabled if unset)
+CANDIDATE_DB_FILE = os.getenv('CANDIDATE_DB_FILE')
+
+# Durable message queue with crash recovery (in-memory queue if unset)
+MESSAGE_QUEUE_FILE = os.getenv('MESSAGE_QUEUE_FILE')
+
+# Shared secret of sharded workers on other hosts (local workers get a random key)
+SHARD_AUTHKEY = os.getenv('SHARD_AUTHKEY')
 
 # Sample sheet headers
 SHEET_HEADERS = [
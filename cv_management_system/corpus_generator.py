@@ -0,0 +1,250 @@
+"""
+Module for generating synthetic resume corpora for benchmarks
+Resumes are assembled from the sections of the resumes in sample_data, with
+controllable length, skill density and noise, and can be written as TXT,
+DOCX or PDF files. The same seed always produces the same corpus.
+"""
+from typing import Iterator, List, Optional, Sequence
+from xml.sax.saxutils import escape
+import os
+import random
+import zipfile
+
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3, SAMPLE_TEXT_RESUME
+from skill_matcher import DEFAULT_SKILLS
+
+SAMPLE_RESUMES = [SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3, SAMPLE_TEXT_RESUME]
+
+CORPUS_FORMATS = ('txt', 'docx', 'pdf')
+
+FIRST_NAMES = ['John', 'Sarah', 'Priya', 'Rajesh', 'Aisha', 'Wei', 'Carlos', 'Elena', 'Kofi', 'Mei', 'Arjun', 'Lucia']
+LAST_NAMES = ['Smith', 'Johnson', 'Sharma', 'Kumar', 'Khan', 'Chen', 'Garcia', 'Petrova', 'Mensah', 'Tanaka', 'Iyer']
+DEGREES = [
+    'B.Tech in Computer Science', 'Master of Science in Data Science', 'Bachelor of Engineering (B.E)',
+    'MBA in Information Systems', 'Bachelor of Science in Statistics', 'PhD in Machine Learning',
+]
+UNIVERSITIES = [
+    'Indian Institute of Technology (IIT) Delhi', 'University of California, Berkeley', 'Mumbai University',
+    'Stanford University', 'University of Toronto', 'National University of Singapore',
+]
+JOB_TITLES = ['Software Engineer', 'Data Scientist', 'Web Developer', 'DevOps Engineer', 'Data Analyst']
+COMPANIES = ['TechCorp Solutions', 'WebDev Inc.', 'Digital Agency Pro', 'StartupXYZ', 'DataWorks', 'CloudNine']
+
+
+def _experience_bullets(texts: Sequence[str]) -> List[str]:
+    """Collect the '-' bullets that appear under experience headings"""
+    bullets = []
+    for text in texts:
+        in_experience = False
+        for line in text.splitlines():
+            line = line.strip()
+            if line and (line.isupper() or line.endswith(':')) and len(line) < 40:
+                in_experience = 'EXPERIENCE' in line.upper()
+            elif in_experience and line.startswith('-'):
+                bullets.append(line)
+    return bullets
+
+
+# Experience bullets and prose lines borrowed from the sample resumes
+_BULLETS = _experience_bullets(SAMPLE_RESUMES)
+_PROSE = [
+    line.strip() for text in SAMPLE_RESUMES for line in text.splitlines()
+    if len(line.split()) >= 8 and not line.strip().startswith('-')
+]
+
+# Characters used for noise lines and corrupted characters
+_NOISE_CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789 |*#~•·—'
+
+# Files per subdirectory so million-file corpora stay listable
+FILES_PER_DIRECTORY = 1000
+
+
+def generate_resume(rng: random.Random, length: float = 1.0, skill_density: float = 0.3,
+                    noise: float = 0.0) -> str:
+    """
+    Generate one synthetic resume
+    
+    Args:
+        rng: Random source (seeded for reproducible corpora)
+        length: Scale of the experience and summary sections (1.0 is roughly a sample resume)
+        skill_density: Fraction of DEFAULT_SKILLS listed in the skills section
+        noise: Probability per line of a junk line and of corrupted characters
+    """
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f"{first} {last}".upper(),
+        f"{first.lower()}.{last.lower()}{rng.randint(1, 999)}@email.com | +91-9{rng.randint(0, 999999999):09d}",
+        '',
+        'PROFESSIONAL SUMMARY',
+    ]
+    lines += rng.sample(_PROSE, min(len(_PROSE), max(1, round(2 * length))))
+    
+    lines += ['', 'EDUCATION', f"{rng.choice(DEGREES)} - {rng.choice(UNIVERSITIES)}, {rng.randint(2005, 2024)}"]
+    
+    skill_count = max(1, min(len(DEFAULT_SKILLS), round(skill_density * len(DEFAULT_SKILLS))))
+    skills = rng.sample(DEFAULT_SKILLS, skill_count)
+    lines += ['', 'SKILLS']
+    lines += [', '.join(skills[i:i + 6]) for i in range(0, len(skills), 6)]
+    
+    lines += ['', 'EXPERIENCE']
+    year = 2024
+    for _ in range(max(1, round(3 * length))):
+        start = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(JOB_TITLES)} - {rng.choice(COMPANIES)} ({start} - {year})")
+        lines += rng.sample(_BULLETS, min(len(_BULLETS), rng.randint(2, 4)))
+        year = start
+    
+    if noise > 0:
+        lines = _add_noise(rng, lines, noise)
+    return '\n'.join(lines) + '\n'
+
+
+def _add_noise(rng: random.Random, lines: List[str], noise: float) -> List[str]:
+    """Insert junk lines and corrupt characters, as OCR'd or copy-pasted resumes have"""
+    noisy = []
+    for line in lines:
+        if rng.random() < noise:
+            noisy.append(''.join(rng.choice(_NOISE_CHARS) for _ in range(rng.randint(5, 60))))
+        if line and rng.random() < noise:
+            position = rng.randrange(len(line))
+            line = line[:position] + rng.choice(_NOISE_CHARS) + line[position + 1:]
+        noisy.append(line)
+    return noisy
+
+
+def iter_resumes(count: int, seed: int = 42, length: float = 1.0, skill_density: float = 0.3,
+                 noise: float = 0.0) -> Iterator[str]:
+    """Yield count synthetic resumes (see generate_resume for the arguments)"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate_resume(rng, length, skill_density, noise)
+
+
+def write_txt(file_path: str, text: str) -> None:
+    """Write a resume as UTF-8 text"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def write_docx(file_path: str, text: str) -> None:
+    """Write a minimal DOCX with one paragraph per line"""
+    paragraphs = ''.join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in text.splitlines()
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _DOCX_CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _DOCX_RELS)
+        archive.writestr('word/document.xml', document)
+
+
+def write_pdf(file_path: str, text: str, lines_per_page: int = 60) -> None:
+    """Write a minimal text PDF (Helvetica, one text line per resume line)"""
+    lines = text.splitlines() or ['']
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and a content stream per page
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        f"<< /Type /Pages /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] /Count {len(pages)} >>".encode(),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    for page_id, page_lines in zip(page_ids, pages):
+        commands = ['BT /F1 10 Tf 12 TL 50 760 Td']
+        for line in page_lines:
+            escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            commands.append(f'({escaped}) Tj T*')
+        commands.append('ET')
+        stream = '\n'.join(commands).encode('cp1252', errors='replace')
+        objects.append(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>'.encode()
+        )
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+    
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    
+    with open(file_path, 'wb') as f:
+        f.write(output)
+
+
+WRITERS = {
+    'txt': write_txt,
+    'docx': write_docx,
+    'pdf': write_pdf,
+}
+
+
+def write_corpus(directory: str, count: int, file_format: str = 'txt', seed: int = 42, length: float = 1.0,
+                 skill_density: float = 0.3, noise: float = 0.0) -> Iterator[str]:
+    """
+    Write count resumes to directory and yield their paths as they are written
+    Files are spread over subdirectories of FILES_PER_DIRECTORY files each.
+    """
+    if file_format not in WRITERS:
+        raise ValueError(f"Unknown format: {file_format} (expected one of {', '.join(CORPUS_FORMATS)})")
+    
+    writer = WRITERS[file_format]
+    for index, text in enumerate(iter_resumes(count, seed, length, skill_density, noise)):
+        subdirectory = os.path.join(directory, f'{index // FILES_PER_DIRECTORY:05d}')
+        if index % FILES_PER_DIRECTORY == 0:
+            os.makedirs(subdirectory, exist_ok=True)
+        file_path = os.path.join(subdirectory, f'resume_{index:07d}.{file_format}')
+        writer(file_path, text)
+        yield file_path
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command line entry point: write a corpus to disk"""
+    import argparse
+    parser = argparse.ArgumentParser(description='Generate a synthetic resume corpus')
+    parser.add_argument('directory')
+    parser.add_argument('--count', type=int, default=10_000)
+    parser.add_argument('--formats', default='txt', help='Comma-separated subset of txt,docx,pdf')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--length', type=float, default=1.0)
+    parser.add_argument('--skill-density', type=float, default=0.3)
+    parser.add_argument('--noise', type=float, default=0.0)
+    args = parser.parse_args(argv)
+    
+    for file_format in args.formats.split(','):
+        target = os.path.join(args.directory, file_format)
+        written = sum(1 for _ in write_corpus(target, args.count, file_format, args.seed, args.length,
+                                              args.skill_density, args.noise))
+        print(f"Wrote {written} {file_format.upper()} resumes to {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,37 +2,197 @@
 Main orchestrator for the CV Management System
 Coordinates all components: WhatsApp simulator, file processing, data extraction, and Google Sheets
 """
-from typing import Optional, Dict, List
+from typing import Any, Callable, Optional, Dict, Iterator, List, Tuple
 from datetime import datetime
+from functools import partial
+from itertools import count
 import os
 import json
+import time
 
 from whatsapp_simulator import WhatsAppSimulator, WhatsAppMessage
 from file_processor import FileProcessor
 from data_extractor import ResumeDataExtractor
 from google_sheets_handler import GoogleSheetsHandler
-from config import SHEET_HEADERS
+from dedup_cache import DedupCache
+from metrics import ProcessingStats
+from exporter import write_ndjson, load_checkpoint, save_checkpoint
+from candidate_store import CandidateRecord, CandidateStore, ProcessingLog, ResumeTextStore
+from candidate_db import CandidateDatabase
+from tracing import Tracer, get_tracer, run_profiled
+from config import (
+    SHEET_HEADERS, SKILL_TAXONOMY_FILE, DEDUP_CACHE_FILE, DEDUP_CACHE_MAX_BYTES,
+    MAX_RETAINED_RECORDS, RESUME_TEXT_DIR, CANDIDATE_DB_FILE, MESSAGE_QUEUE_FILE, SECTION_AWARE_PARSING,
+    SHEETS_REQUESTS_PER_MINUTE, SHEETS_WRITE_TIMEOUT, MAX_FILE_SIZE, MAX_PDF_PAGES
+)
+
+# Span names reported for the timed pipeline stages
+SPAN_NAMES = {
+    'file_extraction': 'extract',
+    'parsing': 'parse',
+    'sheet_upload': 'upload',
+}
+
+# Messages leased per worker at a time by the parallel path
+PARALLEL_WINDOW_PER_WORKER = 8
+
+# Per-process extractors used by process pool workers
+_worker_file_processor = None
+_worker_data_extractor = None
+
+
+def _init_worker(skill_taxonomy_file: Optional[str]) -> None:
+    """Build the extractors once per worker process"""
+    global _worker_file_processor, _worker_data_extractor
+    _worker_file_processor = FileProcessor()
+    _worker_data_extractor = ResumeDataExtractor(skill_taxonomy_file=skill_taxonomy_file,
+                                                 section_aware=SECTION_AWARE_PARSING)
+
+
+def _process_pool_task(file_path: Optional[str], message_text: str) -> Tuple[Optional[str], Optional[Dict], List[str], Dict[str, float]]:
+    """Run the CPU-bound stages inside a process pool worker"""
+    return _run_cpu_stages(_worker_file_processor, _worker_data_extractor, file_path, message_text)
+
+
+def _run_sampled(profile: bool, task: Callable, *args: Any) -> Tuple[Any, Optional[Dict]]:
+    """Run a pool task, under cProfile if profile is set; returns (result, raw profile or None)"""
+    if profile:
+        return run_profiled(task, *args)
+    return task(*args), None
+
+
+def _parse_pool_task(content: str) -> Dict[str, str]:
+    """Parse resume text inside a process pool worker"""
+    return _worker_data_extractor.parse_resume(content)
+
+
+def _run_cpu_stages(file_processor: FileProcessor, data_extractor: ResumeDataExtractor,
+                    file_path: Optional[str], message_text: str) -> Tuple[Optional[str], Optional[Dict], List[str], Dict[str, float]]:
+    """
+    Extract text from a message and parse it
+    Attachments are parsed as their pages are extracted, so in section-aware
+    mode the pages after the last field are never extracted; content then
+    holds only the pages that were read.
+    
+    Returns:
+        (content, extracted_data, errors, stage durations in seconds)
+    """
+    errors = []
+    timings = {}
+    content = None
+    extracted = None
+    
+    try:
+        if file_path and os.path.exists(file_path):
+            content, extracted, errors, timings = _run_file_stages(file_processor, data_extractor, file_path)
+        elif message_text:
+            content = message_text
+            start = time.perf_counter()
+            extracted = data_extractor.parse_resume(content)
+            timings['parsing'] = time.perf_counter() - start
+        
+        if not content:
+            errors.append("No content found to process")
+    except Exception as e:
+        errors.append(str(e))
+    
+    return content, extracted, errors, timings
+
+
+def _run_file_stages(file_processor: FileProcessor, data_extractor: ResumeDataExtractor,
+                     file_path: str) -> Tuple[Optional[str], Optional[Dict], List[str], Dict[str, float]]:
+    """Stream an attachment's text into the parser (see _run_cpu_stages)"""
+    start = time.perf_counter()
+    success, chunks = file_processor.process_file_stream(file_path, max_pages=MAX_PDF_PAGES)
+    extraction = time.perf_counter() - start
+    if not success:
+        return None, None, [f"File processing failed: {chunks}"], {'file_extraction': extraction}
+    
+    read = []
+    
+    def timed_chunks() -> Iterator[str]:
+        nonlocal extraction
+        iterator = iter(chunks)
+        while True:
+            chunk_start = time.perf_counter()
+            chunk = next(iterator, None)
+            extraction += time.perf_counter() - chunk_start
+            if chunk is None:
+                return
+            read.append(chunk)
+            yield chunk
+    
+    opened = extraction
+    start = time.perf_counter()
+    try:
+        extracted = data_extractor.parse_resume_stream(timed_chunks())
+    except Exception as e:
+        return None, None, [f"File processing failed: Could not extract text from file ({e})"], \
+            {'file_extraction': extraction}
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    # Time spent waiting for chunks counts as extraction, the rest as parsing
+    timings = {'file_extraction': extraction, 'parsing': time.perf_counter() - start - (extraction - opened)}
+    
+    content = '\n'.join(read)
+    if not content:
+        return None, None, ["File processing failed: Could not extract text from file"], \
+            {'file_extraction': extraction}
+    return content, extracted, [], timings
 
 
 class CVManagementSystem:
     """Main orchestrator for CV Management System"""
     
-    def __init__(self, use_real_google_sheets: bool = False):
+    def __init__(self, use_real_google_sheets: bool = False,
+                 dedup_cache_path: Optional[str] = DEDUP_CACHE_FILE,
+                 candidate_db_path: Optional[str] = CANDIDATE_DB_FILE, tracer: Optional[Tracer] = None,
+                 queue_path: Optional[str] = MESSAGE_QUEUE_FILE):
         """
         Initialize the CV Management System
         
         Args:
             use_real_google_sheets: If True, attempts to use real Google Sheets API
+            dedup_cache_path: SQLite file for the duplicate-submission cache
+                              (':memory:' for this process only, None to disable)
+            candidate_db_path: SQLite file of the indexed candidate database
+                               used for skill/email/phone/date queries (None to disable)
+            tracer: Receives per-message spans (receive, extract, parse, upload,
+                    message) and runs sampled profiles (defaults to get_tracer())
+            queue_path: SQLite file of a durable message queue; messages not
+                        acknowledged before a crash are replayed without
+                        writing their sheet row twice (None for in-memory)
         """
-        self.whatsapp_sim = WhatsAppSimulator()
+        self.whatsapp_sim = WhatsAppSimulator(queue_path=queue_path)
         self.file_processor = FileProcessor()
-        self.data_extractor = ResumeDataExtractor()
+        self.data_extractor = ResumeDataExtractor(skill_taxonomy_file=SKILL_TAXONOMY_FILE,
+                                                  section_aware=SECTION_AWARE_PARSING)
         self.sheets_handler = GoogleSheetsHandler(
             credentials_json='credentials.json' if use_real_google_sheets else None
         )
+        # Real sheets are written through a scheduler that keeps to the quota and
+        # retries throttled writes; the demo sheet is written directly
+        self.sheet_writer = None
+        if not self.sheets_handler.demo_mode and SHEETS_REQUESTS_PER_MINUTE > 0:
+            from write_scheduler import SheetWriteScheduler
+            self.sheet_writer = SheetWriteScheduler(self.sheets_handler, SHEETS_REQUESTS_PER_MINUTE)
         
-        self.processing_log = []
-        self.extracted_candidates = []
+        self.dedup_cache = (
+            DedupCache(dedup_cache_path, max_bytes=DEDUP_CACHE_MAX_BYTES) if dedup_cache_path else None
+        )
+        
+        # Results and candidates are kept compact and bounded; full resume text
+        # is written to RESUME_TEXT_DIR if configured, otherwise dropped
+        self.processing_log = ProcessingLog(
+            max_entries=MAX_RETAINED_RECORDS,
+            text_store=ResumeTextStore(RESUME_TEXT_DIR) if RESUME_TEXT_DIR else None
+        )
+        self.extracted_candidates = CandidateStore(max_records=MAX_RETAINED_RECORDS)
+        self.stats = ProcessingStats()
+        self.candidate_db = CandidateDatabase(candidate_db_path) if candidate_db_path else None
+        self.tracer = tracer or get_tracer()
+        self._trace_ids = count(1)
     
     def process_incoming_message(self, message: WhatsAppMessage) -> Dict:
         """
@@ -40,11 +200,81 @@ class CVManagementSystem:
         
         Args:
             message: WhatsAppMessage object
-            
+        
         Returns:
             Dictionary with processing result
         """
-        result = {
+        return self._process_traced(message)
+    
+    def _process_traced(self, message: WhatsAppMessage, uploads: Optional[List[Tuple]] = None) -> Dict:
+        """Process a message under its own trace (see _process_message for uploads)"""
+        trace_id = self._next_trace_id()
+        with self.tracer.profile(trace_id), self.tracer.span('message', trace_id) as span:
+            result = self._process_message(message, trace_id, uploads)
+            span['status'] = result['status']
+        return result
+    
+    def _process_message(self, message: WhatsAppMessage, trace_id: str,
+                         uploads: Optional[List[Tuple]] = None) -> Dict:
+        """
+        Run one message through the pipeline stages
+        With an uploads list the sheet row is submitted to sheet_writer without
+        waiting: the message is appended to uploads and its result is left
+        'processing' until _finish_uploads records it. Repeats of a deferred
+        message are appended as well and answered from its result.
+        """
+        result = self._new_result(message)
+        
+        # Repeat submissions are answered from the cache without re-processing
+        cache_key = self._cache_key(message)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            self._apply_duplicate(result, cached)
+            self._record_result(result)
+            return result
+        if self.whatsapp_sim.is_processed(message):
+            self._apply_replayed(result)
+            self._record_result(result)
+            return result
+        # A repeat of a message whose upload is still deferred waits for it
+        first = next((entry[1] for entry in uploads or () if cache_key and entry[2] == cache_key), None)
+        if first is not None:
+            uploads.append((message, result, cache_key, trace_id, time.perf_counter(), None, first))
+            return result
+        
+        try:
+            # Steps 1-2: Extract text content and resume data
+            content, extracted, errors, timings = _run_cpu_stages(
+                self.file_processor, self.data_extractor, message.file_path, message.message_text
+            )
+            self._record_timings(timings, trace_id, content)
+            self._apply_cpu_stages(result, content, extracted, errors)
+            
+            # Step 3: Upload to Google Sheets
+            if extracted:
+                row_data = self.data_extractor.format_for_sheet(extracted)
+                if uploads is not None and not self.whatsapp_sim.is_processed(message):
+                    future = self.sheet_writer.submit(row_data)
+                    uploads.append((message, result, cache_key, trace_id, time.perf_counter(), future, None))
+                    return result
+                self._apply_upload(result, self._upload_once(message, row_data, trace_id))
+        
+        except Exception as e:
+            result['status'] = 'failed'
+            result['errors'].append(str(e))
+        
+        self._remember(cache_key, result)
+        self._record_result(result)
+        return result
+    
+    def _next_trace_id(self) -> str:
+        """Identifier that ties together the spans of one message"""
+        return f"msg-{next(self._trace_ids)}"
+    
+    @staticmethod
+    def _new_result(message: WhatsAppMessage) -> Dict:
+        """Create the result record for a message"""
+        return {
             'status': 'processing',
             'sender': message.sender_name,
             'timestamp': datetime.now().isoformat(),
@@ -53,56 +283,270 @@ class CVManagementSystem:
             'sheet_upload': False,
             'errors': []
         }
-        
+    
+    def _cache_key(self, message: WhatsAppMessage) -> Optional[str]:
+        """Content hash of the message attachment (or text), None if caching is off"""
+        if self.dedup_cache is None:
+            return None
         try:
-            # Step 1: Extract text content
             if message.file_path and os.path.exists(message.file_path):
-                success, content = self.file_processor.process_file(message.file_path)
-                if success:
-                    result['message_content'] = content
-                else:
-                    result['errors'].append(f"File processing failed: {content}")
-            else:
-                result['message_content'] = message.message_text
-            
-            # Step 2: Extract resume data
-            if result['message_content']:
-                extracted = self.data_extractor.parse_resume(result['message_content'])
-                result['extracted_data'] = extracted
-                self.extracted_candidates.append(extracted)
-                
-                # Step 3: Upload to Google Sheets
-                row_data = self.data_extractor.format_for_sheet(extracted)
-                if self.sheets_handler.append_row(row_data):
-                    result['sheet_upload'] = True
-                    result['status'] = 'success'
-                else:
-                    result['errors'].append("Failed to upload to Google Sheets")
-                    result['status'] = 'partial_success'
-            else:
-                result['errors'].append("No content found to process")
-                result['status'] = 'failed'
-        
+                # Oversized files are rejected by process_file; never read them in full here
+                if os.stat(message.file_path).st_size > MAX_FILE_SIZE:
+                    return None
+                return self.dedup_cache.key_for(file_path=message.file_path)
+            return self.dedup_cache.key_for(message_text=message.message_text)
+        except OSError:
+            return None
+    
+    def _cached(self, cache_key: Optional[str]) -> Optional[Dict]:
+        """Look up a cache key; cache errors count as a miss"""
+        if not cache_key:
+            return None
+        try:
+            return self.dedup_cache.get(cache_key)
         except Exception as e:
+            self.tracer.event('dedup.error', f"Dedup cache lookup failed: {e}", level='warning')
+            return None
+    
+    def _remember(self, cache_key: Optional[str], result: Dict) -> None:
+        """Cache extracted data once it has been uploaded successfully"""
+        if cache_key and result['status'] == 'success':
+            try:
+                self.dedup_cache.put(cache_key, result['extracted_data'])
+            except Exception as e:
+                self.tracer.event('dedup.error', f"Dedup cache update failed: {e}", level='warning')
+    
+    @staticmethod
+    def _apply_duplicate(result: Dict, extracted: Dict) -> None:
+        """Fill a result record for a repeat submission"""
+        result['extracted_data'] = extracted
+        result['status'] = 'duplicate'
+    
+    @classmethod
+    def _apply_repeat(cls, result: Dict, first: Dict) -> None:
+        """Fill a result record for a repeat of a message processed in the same batch"""
+        if first['status'] == 'success':
+            cls._apply_duplicate(result, first['extracted_data'])
+        else:
+            result['status'] = 'failed'
+            result['errors'].append("Duplicate of an earlier message that was not uploaded")
+    
+    @staticmethod
+    def _apply_replayed(result: Dict) -> None:
+        """Fill a result record for a message replayed after its row was written"""
+        result['status'] = 'duplicate'
+        result['sheet_upload'] = True
+    
+    @staticmethod
+    def _apply_cpu_stages(result: Dict, content: Optional[str], extracted: Optional[Dict],
+                          errors: List[str]) -> None:
+        """Fill a result record from the text extraction and parsing stages"""
+        result['message_content'] = content
+        result['extracted_data'] = extracted
+        result['errors'].extend(errors)
+        if not extracted:
             result['status'] = 'failed'
-            result['errors'].append(str(e))
-        
-        self.processing_log.append(result)
-        return result
+    
+    @staticmethod
+    def _apply_upload(result: Dict, uploaded: bool) -> None:
+        """Fill a result record from the sheet upload stage"""
+        if uploaded:
+            result['sheet_upload'] = True
+            result['status'] = 'success'
+        else:
+            result['errors'].append("Failed to upload to Google Sheets")
+            result['status'] = 'partial_success'
+    
+    def _record_result(self, result: Dict) -> None:
+        """Add a finished result to the processing bookkeeping"""
+        self.stats.record_status(result['status'])
+        record = None
+        if result['extracted_data'] and result['status'] != 'duplicate':
+            record = self.extracted_candidates.add(result['extracted_data'])
+            if self.candidate_db is not None:
+                self.candidate_db.add(result['extracted_data'])
+        self.processing_log.add(result, record)
+    
+    def _record_timings(self, timings: Dict[str, float], trace_id: Optional[str] = None,
+                        content: Optional[str] = None) -> None:
+        """Add stage durations to the latency histograms and report them as spans"""
+        for stage, seconds in timings.items():
+            self.stats.record_latency(stage, seconds)
+            self.tracer.record_span(SPAN_NAMES[stage], trace_id, seconds, size=len(content or ''))
+    
+    def _timed_append_row(self, row_data: List[str], trace_id: Optional[str] = None) -> bool:
+        """Append a row to the sheet and record how long it took"""
+        start = time.perf_counter()
+        uploaded = False
+        try:
+            if self.sheet_writer is not None:
+                uploaded = self.sheet_writer.append_row(row_data, timeout=SHEETS_WRITE_TIMEOUT)
+            else:
+                uploaded = self.sheets_handler.append_row(row_data)
+            return uploaded
+        finally:
+            seconds = time.perf_counter() - start
+            self.stats.record_latency('sheet_upload', seconds)
+            self.tracer.record_span('upload', trace_id, seconds, status='success' if uploaded else 'failed')
+    
+    def _upload_once(self, message: WhatsAppMessage, row_data: List[str], trace_id: Optional[str] = None) -> bool:
+        """Append the row unless this message was already uploaded before a crash and replayed"""
+        if self.whatsapp_sim.is_processed(message):
+            return True
+        uploaded = self._timed_append_row(row_data, trace_id)
+        if uploaded:
+            self.whatsapp_sim.mark_processed(message)
+        return uploaded
     
     def receive_message(self, message: WhatsAppMessage) -> None:
         """Receive a message in the WhatsApp simulator"""
-        self.whatsapp_sim.simulate_message_receipt(message)
+        with self.tracer.span('receive', self._next_trace_id(), size=len(message.message_text or '')) as span:
+            span['status'] = 'queued' if self.whatsapp_sim.simulate_message_receipt(message) else 'rejected'
     
-    def process_all_pending(self) -> List[Dict]:
-        """Process all pending messages in the queue"""
+    def process_all_pending(self, workers: int = 1, executor: str = 'process') -> List[Dict]:
+        """
+        Process all pending messages in the queue
+        
+        Args:
+            workers: Number of parallel workers; 1 processes messages serially
+            executor: 'process' runs text extraction and parsing in a process pool,
+                      'thread' runs them in a thread pool. Sheet writes always
+                      use a thread pool.
+        
+        Returns:
+            List of processing results in the original message order
+        """
+        if workers <= 1:
+            # Sheet rows are submitted to the write scheduler without waiting, so
+            # they are batched into shared requests; the messages are recorded
+            # and acked once their rows are written
+            uploads = [] if self.sheet_writer is not None else None
+            results = []
+            try:
+                while True:
+                    message = self.whatsapp_sim.get_next_message()
+                    if not message:
+                        break
+                    deferred = len(uploads or ())
+                    results.append(self._process_traced(message, uploads))
+                    if len(uploads or ()) == deferred:
+                        self.whatsapp_sim.ack(message)
+                    elif len(uploads) >= self.whatsapp_sim.prefetch:
+                        self._finish_uploads(uploads)
+            finally:
+                if uploads:
+                    self._finish_uploads(uploads)
+                self.whatsapp_sim.flush_acks()
+            return results
+        
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        if executor == 'process':
+            cpu_pool = ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(SKILL_TAXONOMY_FILE,)
+            )
+            cpu_task = _process_pool_task
+        elif executor == 'thread':
+            cpu_pool = ThreadPoolExecutor(max_workers=workers)
+            cpu_task = partial(_run_cpu_stages, self.file_processor, self.data_extractor)
+        else:
+            raise ValueError(f"Unknown executor: {executor} (expected 'process' or 'thread')")
+        
         results = []
-        while True:
-            message = self.whatsapp_sim.get_next_message()
-            if not message:
-                break
-            result = self.process_incoming_message(message)
-            results.append(result)
+        with cpu_pool, ThreadPoolExecutor(max_workers=workers) as io_pool:
+            # Messages are leased a window at a time so none waits long enough
+            # for its lease to expire
+            while True:
+                messages = self.whatsapp_sim.get_next_messages(workers * PARALLEL_WINDOW_PER_WORKER)
+                if not messages:
+                    break
+                results += self._process_window(messages, cpu_pool, cpu_task, io_pool, workers, executor)
+                self.whatsapp_sim.flush_acks()
+        return results
+    
+    def _finish_uploads(self, uploads: List[Tuple]) -> None:
+        """Wait for the rows submitted by _process_message, then record and ack their messages"""
+        from write_scheduler import SheetWriteScheduler
+        deadline = time.monotonic() + SHEETS_WRITE_TIMEOUT
+        for message, result, cache_key, trace_id, start, future, first in uploads:
+            if future is None:
+                # Repeats come after the upload they wait for, which is finished by now
+                self._apply_repeat(result, first)
+                self._record_result(result)
+                self.whatsapp_sim.ack(message)
+                continue
+            try:
+                uploaded = SheetWriteScheduler.wait(future, max(0.0, deadline - time.monotonic()))
+            except Exception as e:
+                uploaded = False
+                result['errors'].append(str(e))
+            seconds = time.perf_counter() - start
+            self.stats.record_latency('sheet_upload', seconds)
+            self.tracer.record_span('upload', trace_id, seconds, status='success' if uploaded else 'failed')
+            if uploaded:
+                self.whatsapp_sim.mark_processed(message)
+            self._apply_upload(result, uploaded)
+            self._remember(cache_key, result)
+            self._record_result(result)
+            self.whatsapp_sim.ack(message)
+        uploads.clear()
+    
+    def _process_window(self, messages: List[WhatsAppMessage], cpu_pool: Any, cpu_task: Callable,
+                        io_pool: Any, workers: int, executor: str) -> List[Dict]:
+        """Process one window of messages in the pools of process_all_pending"""
+        results = [self._new_result(message) for message in messages]
+        trace_ids = [self._next_trace_id() for _ in messages]
+        keys = [self._cache_key(message) for message in messages]
+        
+        # Cache hits and replays of messages finished before a restart end
+        # immediately; repeats within this window wait for the first copy
+        # instead of being extracted again
+        pending = []
+        duplicate_of = {}
+        first_seen = {}
+        for i, key in enumerate(keys):
+            cached = self._cached(key)
+            if cached is not None:
+                self._apply_duplicate(results[i], cached)
+            elif self.whatsapp_sim.is_processed(messages[i]):
+                self._apply_replayed(results[i])
+            elif key in first_seen:
+                duplicate_of[i] = first_seen[key]
+            else:
+                if key:
+                    first_seen[key] = i
+                pending.append(i)
+        
+        uploads = {}
+        # map() yields in submission order, so uploads start as soon as each
+        # message is parsed while results stay aligned with messages
+        stages = cpu_pool.map(
+            _run_sampled,
+            [self.tracer.sample_profile() for _ in pending],
+            [cpu_task] * len(pending),
+            [messages[i].file_path for i in pending],
+            [messages[i].message_text for i in pending],
+            chunksize=max(1, len(pending) // (workers * 4)) if executor == 'process' else 1
+        )
+        for i, ((content, extracted, errors, timings), profile) in zip(pending, stages):
+            self.tracer.add_profile(trace_ids[i], profile)
+            self._record_timings(timings, trace_ids[i], content)
+            self._apply_cpu_stages(results[i], content, extracted, errors)
+            if extracted:
+                row_data = self.data_extractor.format_for_sheet(extracted)
+                uploads[i] = io_pool.submit(self._upload_once, messages[i], row_data, trace_ids[i])
+        
+        for i, result in enumerate(results):
+            if i in uploads:
+                try:
+                    self._apply_upload(result, uploads[i].result())
+                except Exception as e:
+                    result['status'] = 'failed'
+                    result['errors'].append(str(e))
+                self._remember(keys[i], result)
+            elif i in duplicate_of:
+                self._apply_repeat(result, results[duplicate_of[i]])
+            self._record_result(result)
+            self.whatsapp_sim.ack(messages[i])
         return results
     
     def initialize_sheet(self, spreadsheet_id: str) -> bool:
@@ -110,37 +554,99 @@ class CVManagementSystem:
         return self.sheets_handler.initialize_sheet(spreadsheet_id, SHEET_HEADERS)
     
     def get_all_candidates(self) -> List[Dict]:
-        """Get all extracted candidates"""
-        return self.extracted_candidates
+        """Get the retained extracted candidates as dictionaries"""
+        return [record.to_dict() for record in self.extracted_candidates]
+    
+    def iter_candidates(self) -> Iterator[CandidateRecord]:
+        """Iterate over retained extracted candidates without copying them"""
+        return iter(self.extracted_candidates)
     
     def get_processing_summary(self) -> Dict:
         """Get summary of processing activities"""
         return {
-            'total_processed': len(self.processing_log),
-            'successful': sum(1 for log in self.processing_log if log['status'] == 'success'),
-            'partial_success': sum(1 for log in self.processing_log if log['status'] == 'partial_success'),
-            'failed': sum(1 for log in self.processing_log if log['status'] == 'failed'),
-            'candidates_extracted': len(self.extracted_candidates),
-            'whatsapp_stats': self.whatsapp_sim.get_statistics()
+            'total_processed': self.stats.total,
+            'successful': self.stats.status_counts['success'],
+            'partial_success': self.stats.status_counts['partial_success'],
+            'failed': self.stats.status_counts['failed'],
+            'duplicates': self.stats.status_counts['duplicate'],
+            'candidates_extracted': self.extracted_candidates.total_added,
+            'stage_latency': self.stats.latency_summary(),
+            'whatsapp_stats': self.whatsapp_sim.get_statistics(),
+            'dedup_cache': self.dedup_cache.get_statistics() if self.dedup_cache else None
         }
     
-    def export_results(self, output_file: str) -> bool:
-        """Export all results to JSON file"""
+    def export_results(self, output_file: str, format: str = 'json', compress: Optional[bool] = None,
+                       fast_json: bool = False, checkpoint_file: Optional[str] = None) -> bool:
+        """
+        Export results to a file
+        
+        Args:
+            output_file: Destination path (a '.gz' suffix enables gzip for NDJSON)
+            format: 'json' writes one indented document; 'ndjson' streams one
+                    record per line: a summary line, then candidates and log entries
+            compress: Force gzip compression on or off for NDJSON
+            fast_json: Use orjson for NDJSON if it is installed
+            checkpoint_file: For NDJSON, export only records added since the
+                             positions stored in this file, then update it
+        Other formats raise ValueError; write errors return False.
+        """
+        if format not in ('json', 'ndjson'):
+            raise ValueError(f"Unknown export format: {format} (expected 'json' or 'ndjson')")
         try:
+            if format == 'ndjson':
+                self._export_ndjson(output_file, compress, fast_json, checkpoint_file)
+                return True
+            
             data = {
                 'summary': self.get_processing_summary(),
-                'candidates': self.extracted_candidates,
-                'processing_log': self.processing_log
+                'candidates': [candidate.to_dict() for candidate in self.extracted_candidates],
+                'processing_log': list(self.processing_log)
             }
             
             with open(output_file, 'w') as f:
-                json.dump(data, f, indent=2)
+                json.dump(data, f, indent=2, default=CandidateRecord.to_dict)
             
             return True
         except Exception as e:
-            print(f"Error exporting results: {e}")
+            self.tracer.event('export.error', f"Error exporting results: {e}", level='error')
             return False
     
+    def _export_ndjson(self, output_file: str, compress: Optional[bool], fast_json: bool,
+                       checkpoint_file: Optional[str]) -> None:
+        """Stream summary, candidates and processing log entries as NDJSON"""
+        since = load_checkpoint(checkpoint_file) if checkpoint_file else {}
+        positions = {
+            'candidates': self.extracted_candidates.total_added,
+            'processing_log': self.processing_log.total_added
+        }
+        
+        def records():
+            yield {'type': 'summary', 'data': self.get_processing_summary()}
+            for seq, candidate in self.extracted_candidates.iter_since(since.get('candidates', 0)):
+                if seq > positions['candidates']:
+                    break
+                yield {'type': 'candidate', 'seq': seq, 'data': candidate}
+            for seq, entry in self.processing_log.iter_since(since.get('processing_log', 0)):
+                if seq > positions['processing_log']:
+                    break
+                yield {'type': 'processing_log', 'seq': seq, 'data': entry}
+        
+        write_ndjson(records(), output_file, compress=compress, fast=fast_json)
+        if checkpoint_file:
+            save_checkpoint(checkpoint_file, positions)
+    
+    def close(self) -> None:
+        """Write or give up the queued sheet rows and flush pending acks"""
+        if self.sheet_writer is not None:
+            self.sheet_writer.close()
+        self.whatsapp_sim.flush_acks()
+    
+    def __enter__(self) -> 'CVManagementSystem':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
     def print_summary(self) -> None:
         """Print a summary of the system status"""
         summary = self.get_processing_summary()
@@ -152,8 +658,13 @@ class CVManagementSystem:
         print(f"  ✓ Successful: {summary['successful']}")
         print(f"  ⚠ Partial Success: {summary['partial_success']}")
         print(f"  ✗ Failed: {summary['failed']}")
+        print(f"  ↺ Duplicates: {summary['duplicates']}")
         print(f"\nCandidates Extracted: {summary['candidates_extracted']}")
         print(f"\nWhatsApp Queue Status:")
         print(f"  Pending: {summary['whatsapp_stats']['pending_messages']}")
         print(f"  Processed: {summary['whatsapp_stats']['processed_messages']}")
+        print(f"\nStage Latency (p50 / p95 / p99 ms):")
+        for stage, latency in summary['stage_latency'].items():
+            if latency['count']:
+                print(f"  {stage}: {latency['p50_ms']} / {latency['p95_ms']} / {latency['p99_ms']}")
         print("="*60 + "\n")
@@ -1,89 +1,242 @@
 """
 Module for extracting resume data using NLP and AI
 """
+import bisect
 import re
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple
+from dataclasses import dataclass
 import json
 
+from skill_matcher import SkillMatcher
+
+EDUCATION_KEYWORDS = ['B.E', 'B.Tech', 'B.S', 'B.A', 'M.Tech', 'M.S', 'MBA', 'M.A', 'PhD', 'Bachelor', 'Master']
+EXPERIENCE_KEYWORDS = ['experience', 'worked', 'years', 'software engineer', 'developer', 'manager', 'analyst']
+LINE_CATEGORIES = ('header', 'contact', 'education', 'experience')
+RESULT_FIELDS = ('full_name', 'email', 'phone', 'education', 'skills', 'experience')
+
+# Joins resumes for batch scans; no pattern can match across the NUL line
+BATCH_SEPARATOR = '\n\x00\n'
+
+# Patterns are compiled once and written with bounded repetition so matching
+# stays linear in text length. The lookbehinds only allow a match to start at
+# the beginning of a run, so a long run is scanned once rather than once per
+# character.
+EMAIL_PATTERN = re.compile(
+    r'(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]{1,64}'
+    r'@(?:[a-zA-Z0-9-]{1,63}\.){1,8}[a-zA-Z]{2,24}(?![a-zA-Z])'
+)
+# Optional '+', then 10-15 digits with at most one '-', '.' or ' ' between them
+PHONE_PATTERN = re.compile(r'(?<![\d+])\+?\d(?:[\-. ]?\d){9,14}(?!\d)')
+NAME_PATTERN = re.compile(r'([A-Z][a-z]+ [A-Z][a-z]+|[A-Z][a-z]+)')
+LEADING_WHITESPACE = re.compile(r'\s*')
+
+# Words that identify a section heading; 'other' headings only end the previous section
+SECTION_HEADINGS = (
+    ('education', ('education', 'academic', 'qualification')),
+    ('experience', ('experience', 'employment', 'work history')),
+    ('skills', ('skill', 'technologies', 'competencies')),
+    ('other', ('summary', 'objective', 'profile', 'project', 'certification', 'award', 'achievement',
+               'publication', 'interest', 'hobbies', 'reference', 'training', 'course', 'volunteer')),
+)
+# Lines kept per field by the section-aware parser
+SECTION_QUOTAS = {'education': 3, 'experience': 2}
+BULLET_CHARS = ('-', '*', '•', '–')
+
+
+def _iter_lines(text: str, start: int = 0) -> Iterator[str]:
+    """Yield the lines of text from start on without splitting the whole string"""
+    while True:
+        end = text.find('\n', start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _iter_chunk_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield the lines of chunks joined with newlines, without leading whitespace"""
+    started = False
+    for chunk in chunks:
+        if not started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+        yield from _iter_lines(chunk)
+
+
+def _section_of(line: str) -> Optional[str]:
+    """Return the section a heading line opens, or None if the line is not a heading"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 40 or not (stripped.isupper() or stripped.endswith(':')):
+        return None
+    lowered = stripped.lower()
+    for section, words in SECTION_HEADINGS:
+        if any(word in lowered for word in words):
+            return section
+    return None
+
+
+def _batch_starts(texts: List[str]) -> List[int]:
+    """Offsets of each text in BATCH_SEPARATOR.join(texts)"""
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + len(BATCH_SEPARATOR)
+    return starts
+
+
+def _first_matches(pattern: Pattern, blob: str, starts: List[int], limit: int,
+                   per_line: bool) -> Dict[int, List[Tuple[int, str]]]:
+    """
+    Find up to `limit` matches per text in a joined batch
+    With per_line=True only the first match of each line counts.
+    
+    Returns:
+        {text index: [(line number within the text, matched string), ...]}
+    """
+    found: Dict[int, List[Tuple[int, str]]] = {}
+    current, line_number, counted_to = -1, 0, 0
+    pos = 0
+    while True:
+        match = pattern.search(blob, pos)
+        if match is None:
+            break
+        start = match.start()
+        i = bisect.bisect_right(starts, start) - 1
+        if i != current:
+            current, line_number, counted_to = i, 0, starts[i]
+        line_number += blob.count('\n', counted_to, start)
+        counted_to = start
+        
+        matches = found.setdefault(i, [])
+        matches.append((line_number, match.group(0)))
+        if len(matches) >= limit:
+            # This text is done: continue with the next one
+            if i + 1 >= len(starts):
+                break
+            pos = starts[i + 1]
+        elif per_line:
+            line_end = blob.find('\n', start)
+            if line_end < 0:
+                break
+            pos = line_end + 1
+        else:
+            pos = max(match.end(), start + 1)
+    return found
+
+
+@dataclass
+class LineIndex:
+    """Resume lines split once, with line numbers tagged per section category"""
+    lines: List[str]
+    tags: Dict[str, List[int]]
+    
+    def context(self, category: str, limit: int) -> List[str]:
+        """Return up to `limit` tagged lines, each joined with the line after it"""
+        results = []
+        for i in self.tags[category][:limit]:
+            context = self.lines[i]
+            if i + 1 < len(self.lines):
+                context += ' ' + self.lines[i + 1]
+            results.append(context.strip())
+        return results
+
+
 class ResumeDataExtractor:
     """Extract structured data from resume text using regex patterns and NLP"""
     
-    def __init__(self):
-        """Initialize the extractor with regex patterns"""
-        self.email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        # Simplified phone pattern to avoid regex issues
-        self.phone_pattern = r'[\+]?[0-9\-\.\s]{10,}'
-        self.name_pattern = r'([A-Z][a-z]+ [A-Z][a-z]+|[A-Z][a-z]+)'
+    def __init__(self, skill_taxonomy_file: Optional[str] = None, section_aware: bool = False):
+        """
+        Initialize the extractor with regex patterns
         
-    def extract_email(self, text: str) -> Optional[str]:
+        Args:
+            skill_taxonomy_file: Optional path to a skill taxonomy (see SkillMatcher.from_file)
+            section_aware: Make parse_resume use parse_resume_sections
+        """
+        self.section_aware = section_aware
+        if skill_taxonomy_file:
+            self.skill_matcher = SkillMatcher.from_file(skill_taxonomy_file)
+        else:
+            self.skill_matcher = SkillMatcher()
+        
+        self.email_pattern = EMAIL_PATTERN
+        self.phone_pattern = PHONE_PATTERN
+        self.name_pattern = NAME_PATTERN
+        self._edu_regex = re.compile('|'.join(re.escape(k) for k in EDUCATION_KEYWORDS))
+        self._exp_regex = re.compile('|'.join(re.escape(k) for k in EXPERIENCE_KEYWORDS))
+    
+    def classify_lines(self, text: str) -> LineIndex:
+        """
+        Split text into lines once and tag each line with every matching section
+        Categories: header (name candidates), contact, education, experience
+        """
+        lines = text.split('\n')
+        tags = {category: [] for category in LINE_CATEGORIES}
+        edu_search = self._edu_regex.search
+        exp_search = self._exp_regex.search
+        
+        for i, line in enumerate(lines):
+            if i < 10 and self._is_header_line(line):  # Names are only looked for in the first 10 lines
+                tags['header'].append(i)
+            if '@' in line:
+                tags['contact'].append(i)
+            if edu_search(line):
+                tags['education'].append(i)
+            if exp_search(line.lower()):
+                tags['experience'].append(i)
+        
+        return LineIndex(lines=lines, tags=tags)
+    
+    @staticmethod
+    def _is_header_line(line: str) -> bool:
+        """Check whether a line starts with two capitalized words"""
+        words = line.split()
+        return len(words) >= 2 and words[0][0].isupper() and words[1][0].isupper()
+    
+    def extract_email(self, text: str, index: Optional[LineIndex] = None) -> Optional[str]:
         """Extract email address from text"""
-        match = re.search(self.email_pattern, text)
-        return match.group(0) if match else None
+        if index is None:
+            match = self.email_pattern.search(text)
+            return match.group(0) if match else None
+        
+        # An email always contains '@', so only contact lines need searching
+        for i in index.tags['contact']:
+            match = self.email_pattern.search(index.lines[i])
+            if match:
+                return match.group(0)
+        return None
     
     def extract_phone(self, text: str) -> Optional[str]:
         """Extract phone number from text"""
-        match = re.search(self.phone_pattern, text)
+        match = self.phone_pattern.search(text)
         return match.group(0) if match else None
     
-    def extract_name(self, text: str) -> Optional[str]:
+    def extract_name(self, text: str, index: Optional[LineIndex] = None) -> Optional[str]:
         """Extract person's name from text"""
-        lines = text.split('\n')
-        for line in lines[:10]:  # Check first 10 lines
-            # Look for capitalized names at the beginning
-            words = line.strip().split()
-            if len(words) >= 2:
-                if all(word[0].isupper() for word in words[:2] if word):
-                    return ' '.join(words[:2])
-        return None
+        index = index or self.classify_lines(text)
+        # Header lines start with two capitalized words
+        header = index.tags['header']
+        return ' '.join(index.lines[header[0]].split()[:2]) if header else None
     
-    def extract_education(self, text: str) -> str:
+    def extract_education(self, text: str, index: Optional[LineIndex] = None) -> str:
         """Extract education details from text"""
-        education = []
-        edu_keywords = ['B.E', 'B.Tech', 'B.S', 'B.A', 'M.Tech', 'M.S', 'MBA', 'M.A', 'PhD', 'Bachelor', 'Master']
-        
-        lines = text.split('\n')
-        for i, line in enumerate(lines):
-            if any(keyword in line for keyword in edu_keywords):
-                # Get this line and next line for context
-                context = line
-                if i + 1 < len(lines):
-                    context += ' ' + lines[i + 1]
-                education.append(context.strip())
-        
-        return '; '.join(education[:3]) if education else 'Not specified'
+        index = index or self.classify_lines(text)
+        education = index.context('education', limit=3)
+        return '; '.join(education) if education else 'Not specified'
     
     def extract_skills(self, text: str) -> str:
         """Extract technical skills from text"""
-        skills = []
-        skill_keywords = [
-            'Python', 'Java', 'JavaScript', 'C++', 'C#', 'SQL', 'HTML', 'CSS',
-            'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'AWS', 'Azure',
-            'Machine Learning', 'Data Analysis', 'Git', 'Docker', 'Kubernetes',
-            'REST API', 'GraphQL', 'MongoDB', 'PostgreSQL', 'MySQL'
-        ]
-        
-        for skill in skill_keywords:
-            # Simple string search instead of regex to avoid special character issues
-            if skill.lower() in text.lower():
-                skills.append(skill)
-        
+        skills = self.skill_matcher.find(text)
         return ', '.join(skills) if skills else 'Not specified'
     
-    def extract_experience(self, text: str) -> str:
+    def extract_experience(self, text: str, index: Optional[LineIndex] = None) -> str:
         """Extract work experience from text"""
-        experience = []
-        exp_keywords = ['experience', 'worked', 'years', 'software engineer', 'developer', 'manager', 'analyst']
-        
-        lines = text.split('\n')
-        for i, line in enumerate(lines):
-            if any(keyword in line.lower() for keyword in exp_keywords):
-                # Get this line and next line for context
-                context = line
-                if i + 1 < len(lines):
-                    context += ' ' + lines[i + 1]
-                experience.append(context.strip())
-        
-        return '; '.join(experience[:2]) if experience else 'Not specified'
+        index = index or self.classify_lines(text)
+        experience = index.context('experience', limit=2)
+        return '; '.join(experience) if experience else 'Not specified'
     
     def parse_resume(self, text: str) -> Dict[str, str]:
         """
@@ -92,20 +245,257 @@ class ResumeDataExtractor:
         """
         if not text or not isinstance(text, str):
             return self._create_empty_result()
+        if self.section_aware:
+            return self.parse_resume_sections(text)
         
         text = text.strip()
+        # One scan over the lines feeds every line-based extractor
+        index = self.classify_lines(text)
         
         result = {
-            'full_name': self.extract_name(text) or 'Not specified',
-            'email': self.extract_email(text) or 'Not specified',
+            'full_name': self.extract_name(text, index) or 'Not specified',
+            'email': self.extract_email(text, index) or 'Not specified',
             'phone': self.extract_phone(text) or 'Not specified',
-            'education': self.extract_education(text),
+            'education': self.extract_education(text, index),
             'skills': self.extract_skills(text),
-            'experience': self.extract_experience(text),
+            'experience': self.extract_experience(text, index),
         }
         
         return result
     
+    def parse_resume_sections(self, text: str) -> Dict[str, str]:
+        """
+        Parse resume text lazily, reading lines only until every field is found
+        
+        Section headings (EDUCATION, EXPERIENCE, SKILLS, ...) split the text.
+        Education is taken from keyword lines of the education section,
+        experience from the entry lines (not bullets) of the experience
+        section, and skills from the skills section only. Each field stops at
+        its quota (SECTION_QUOTAS) or at the end of its section, and scanning
+        stops once name, email, phone and all three sections are done, so the
+        time depends on where the information is rather than on the length of
+        the resume. A section without a heading falls back to the keyword
+        matching of parse_resume over the whole text.
+        """
+        if not text or not isinstance(text, str):
+            return self._create_empty_result()
+        return self._parse_section_lines(_iter_lines(text, LEADING_WHITESPACE.match(text).end()), text)
+    
+    def _parse_section_lines(self, lines: Iterable[str], text: Optional[str] = None) -> Dict[str, str]:
+        """
+        Section-aware parsing of lines pulled one at a time (see parse_resume_sections)
+        text is the whole resume for the skills fallback; without it the lines
+        read are kept and joined instead.
+        """
+        read = [] if text is None else None
+        edu_search = self._edu_regex.search
+        exp_search = self._exp_regex.search
+        name = email = phone = None
+        section = None
+        seen = set()
+        entries = {field: [] for field in SECTION_QUOTAS}
+        fallback = {field: [] for field in SECTION_QUOTAS}
+        skill_lines = []
+        # Lists whose last line still needs the following line as context
+        waiting = []
+        previous = None
+        
+        for i, line in enumerate(lines):
+            for target in waiting:
+                target.append((previous + ' ' + line).strip())
+            waiting = []
+            
+            if ((name is not None or i >= 10) and email is not None and phone is not None
+                    and all(len(entries[field]) >= quota or (field in seen and section != field)
+                            for field, quota in SECTION_QUOTAS.items())
+                    and 'skills' in seen and section != 'skills'):
+                break
+            previous = line
+            if read is not None:
+                read.append(line)
+            
+            if name is None and i < 10 and self._is_header_line(line):
+                name = ' '.join(line.split()[:2])
+            if email is None and '@' in line:
+                match = self.email_pattern.search(line)
+                email = match.group(0) if match else None
+            if phone is None:
+                match = self.phone_pattern.search(line)
+                phone = match.group(0) if match else None
+            
+            heading = _section_of(line)
+            if heading:
+                section = heading
+                seen.add(heading)
+                continue
+            
+            if section == 'skills':
+                skill_lines.append(line)
+            elif section == 'education':
+                if len(entries['education']) < SECTION_QUOTAS['education'] and edu_search(line):
+                    waiting.append(entries['education'])
+            elif section == 'experience':
+                stripped = line.strip()
+                if len(entries['experience']) < SECTION_QUOTAS['experience'] and stripped \
+                        and not stripped.startswith(BULLET_CHARS):
+                    waiting.append(entries['experience'])
+            
+            # Keyword matches in case the document has no such heading
+            if 'education' not in seen and len(fallback['education']) < SECTION_QUOTAS['education'] \
+                    and edu_search(line):
+                waiting.append(fallback['education'])
+            if 'experience' not in seen and len(fallback['experience']) < SECTION_QUOTAS['experience'] \
+                    and exp_search(line.lower()):
+                waiting.append(fallback['experience'])
+        
+        for target in waiting:
+            target.append(previous.strip())
+        
+        if previous is None:
+            return self._create_empty_result()
+        
+        found = {field: entries[field] if field in seen else fallback[field] for field in SECTION_QUOTAS}
+        if 'skills' in seen:
+            skills = self.skill_matcher.find('\n'.join(skill_lines))
+        else:
+            skills = self.skill_matcher.find(text if read is None else '\n'.join(read))
+        return {
+            'full_name': name or 'Not specified',
+            'email': email or 'Not specified',
+            'phone': phone or 'Not specified',
+            'education': '; '.join(found['education']) if found['education'] else 'Not specified',
+            'skills': ', '.join(skills) if skills else 'Not specified',
+            'experience': '; '.join(found['experience']) if found['experience'] else 'Not specified',
+        }
+    
+    def parse_many(self, texts: Iterable[str], as_dataframe: bool = False) -> Any:
+        """
+        Parse a batch of resumes with the same results as parse_resume
+        (without section_aware)
+        
+        Education and experience, the stages that classify every line in
+        parse_resume, each run one regex pass over all texts joined with
+        BATCH_SEPARATOR, and matches are mapped back to their resume by offset.
+        Email, phone, name and skills stop early or scan each text once in C
+        already, so they are looked up per text (batching them measured slower,
+        see benchmark.py parse_many).
+        
+        Args:
+            texts: Resume texts
+            as_dataframe: Return a pandas DataFrame instead of a dict of lists
+        
+        Returns:
+            Columnar result: {field: [value per resume]} for RESULT_FIELDS
+        """
+        texts = [text.strip() if text and isinstance(text, str) else '' for text in texts]
+        education = _first_matches(self._edu_regex, BATCH_SEPARATOR.join(texts), _batch_starts(texts), 3,
+                                   per_line=True)
+        lowered = [text.lower() for text in texts]
+        experience = _first_matches(self._exp_regex, BATCH_SEPARATOR.join(lowered), _batch_starts(lowered), 2,
+                                    per_line=True)
+        
+        columns = {field: ['Not specified'] * len(texts) for field in RESULT_FIELDS}
+        email_search, phone_search, find_skills = self.email_pattern.search, self.phone_pattern.search, \
+            self.skill_matcher.find
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            match = email_search(text)
+            if match:
+                columns['email'][i] = match.group(0)
+            match = phone_search(text)
+            if match:
+                columns['phone'][i] = match.group(0)
+            skills = find_skills(text)
+            if skills:
+                columns['skills'][i] = ', '.join(skills)
+            for line in text.split('\n', 10)[:10]:
+                if self._is_header_line(line):
+                    columns['full_name'][i] = ' '.join(line.split()[:2])
+                    break
+        
+        for field, tagged in (('education', education), ('experience', experience)):
+            for i, matches in tagged.items():
+                # Line numbers are the same in the original and lowercased text
+                lines = texts[i].split('\n')
+                contexts = []
+                for line_number, _ in matches:
+                    context = lines[line_number]
+                    if line_number + 1 < len(lines):
+                        context += ' ' + lines[line_number + 1]
+                    contexts.append(context.strip())
+                columns[field][i] = '; '.join(contexts)
+        
+        if as_dataframe:
+            import pandas
+            return pandas.DataFrame(columns, columns=list(RESULT_FIELDS))
+        return columns
+    
+    def parse_resume_stream(self, chunks: Iterable[str]) -> Dict[str, str]:
+        """
+        Parse resume text that arrives in chunks, e.g. PDF pages from
+        FileProcessor.iter_pdf_pages, without joining it into one string
+        Chunks are treated as if they were joined with newlines. In
+        section-aware mode no further chunks are read once every field is
+        found.
+        """
+        if self.section_aware:
+            return self._parse_section_lines(_iter_chunk_lines(chunks))
+        
+        found = {'email': None, 'phone': None}
+        skills = set()
+        
+        def stream_lines():
+            started = False
+            for chunk in chunks:
+                if not started:
+                    chunk = chunk.lstrip()
+                    if not chunk:
+                        continue
+                    started = True
+                if found['email'] is None:
+                    found['email'] = self.extract_email(chunk)
+                if found['phone'] is None:
+                    found['phone'] = self.extract_phone(chunk)
+                skills.update(self.skill_matcher.find(chunk))
+                yield from chunk.split('\n')
+        
+        name = None
+        education = []
+        experience = []
+        # Lists whose last tagged line still needs the following line as context
+        waiting = []
+        previous = None
+        
+        for i, line in enumerate(stream_lines()):
+            for target in waiting:
+                target.append((previous + ' ' + line).strip())
+            waiting = []
+            
+            if name is None and i < 10 and self._is_header_line(line):
+                name = ' '.join(line.split()[:2])
+            if len(education) < 3 and self._edu_regex.search(line):
+                waiting.append(education)
+            if len(experience) < 2 and self._exp_regex.search(line.lower()):
+                waiting.append(experience)
+            previous = line
+        
+        for target in waiting:
+            target.append(previous.strip())
+        
+        if previous is None:
+            return self._create_empty_result()
+        
+        ordered_skills = self.skill_matcher.sort(skills)
+        return {
+            'full_name': name or 'Not specified',
+            'email': found['email'] or 'Not specified',
+            'phone': found['phone'] or 'Not specified',
+            'education': '; '.join(education) if education else 'Not specified',
+            'skills': ', '.join(ordered_skills) if ordered_skills else 'Not specified',
+            'experience': '; '.join(experience) if experience else 'Not specified',
+        }
+    
     def _create_empty_result(self) -> Dict[str, str]:
         """Create an empty result dictionary"""
         return {
@@ -0,0 +1,113 @@
+"""
+Module for caching extracted resume data by content hash
+Repeat submissions of the same CV are answered from the cache instead of being re-processed
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+class DedupCache:
+    """Content-addressed cache of extracted data backed by SQLite with size-based LRU eviction"""
+    
+    def __init__(self, db_path: str = ':memory:', max_bytes: int = 50 * 1024 * 1024):
+        """
+        Initialize the cache
+        
+        Args:
+            db_path: SQLite database file (':memory:' keeps the cache for this process only)
+            max_bytes: Maximum total size of cached entries before least recently
+                       used entries are evicted
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' key TEXT PRIMARY KEY,'
+            ' data TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' last_used REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)')
+        self._conn.commit()
+        self._size = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+    
+    @staticmethod
+    def key_for(file_path: Optional[str] = None, message_text: Optional[str] = None) -> str:
+        """Hash the attachment bytes if a file is given, otherwise the message text"""
+        digest = hashlib.sha256()
+        if file_path:
+            digest.update(b'file:')
+            with open(file_path, 'rb') as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                    digest.update(chunk)
+        else:
+            digest.update(b'text:')
+            digest.update((message_text or '').encode('utf-8'))
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return cached data for key, or None on a miss"""
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            self._conn.execute('UPDATE entries SET last_used = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+            return json.loads(row[0])
+    
+    def put(self, key: str, data: Dict) -> None:
+        """Store data for key, evicting least recently used entries if over max_bytes"""
+        payload = json.dumps(data)
+        size = len(payload)
+        with self._lock:
+            old = self._conn.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+            if old:
+                self._size -= old[0]
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (key, data, size, last_used) VALUES (?, ?, ?, ?)',
+                (key, payload, size, time.time())
+            )
+            self._size += size
+            self._evict()
+            self._conn.commit()
+    
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        while self._size > self.max_bytes:
+            row = self._conn.execute(
+                'SELECT key, size FROM entries ORDER BY last_used LIMIT 1'
+            ).fetchone()
+            if row is None:
+                break
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (row[0],))
+            self._size -= row[1]
+            self.evictions += 1
+    
+    def get_statistics(self) -> Dict:
+        """Get hit/miss counters and cache size"""
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_bytes': self._size
+        }
+    
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
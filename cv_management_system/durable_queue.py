@@ -0,0 +1,155 @@
+"""
+Module for a durable, crash-safe message queue backed by SQLite in WAL mode
+Messages are leased rather than removed: a leased message becomes visible
+again once its visibility timeout expires unless it is acknowledged, so work
+in flight when a process dies is replayed on restart. Idempotency keys of
+finished messages are kept so a replayed message is not applied twice.
+"""
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS messages ('
+    ' id INTEGER PRIMARY KEY,'
+    ' key TEXT UNIQUE,'
+    ' payload TEXT NOT NULL,'
+    ' visible_at REAL NOT NULL,'
+    ' attempts INTEGER NOT NULL DEFAULT 0)',
+    'CREATE INDEX IF NOT EXISTS messages_visible_at ON messages (visible_at)',
+    'CREATE TABLE IF NOT EXISTS processed ('
+    ' key TEXT PRIMARY KEY,'
+    ' processed_at REAL NOT NULL) WITHOUT ROWID',
+]
+
+
+class DurableQueue:
+    """FIFO queue with leases, batched acknowledgement and idempotency keys"""
+    
+    def __init__(self, db_path: str, visibility_timeout: float = 60.0):
+        """
+        Initialize the queue
+        
+        Args:
+            db_path: SQLite database file (':memory:' is not durable but works for tests)
+            visibility_timeout: Seconds a leased message stays hidden before it is
+                                handed out again
+        """
+        self.db_path = db_path
+        self.visibility_timeout = visibility_timeout
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        if db_path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+    
+    def put(self, payload: Dict, key: Optional[str] = None) -> bool:
+        """
+        Enqueue one message
+        Returns False if a message with the same key is already queued or was processed.
+        """
+        return self.put_many([(payload, key)]) == 1
+    
+    def put_many(self, items: Iterable[Tuple[Dict, Optional[str]]]) -> int:
+        """Enqueue (payload, key) pairs in one transaction and return how many were added"""
+        now = time.time()
+        rows = [(key, json.dumps(payload), now, key) for payload, key in items]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO messages (key, payload, visible_at) '
+                'SELECT ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM processed WHERE key = ?)',
+                rows
+            )
+            return self._conn.total_changes - before
+    
+    def lease(self, limit: int = 1, visibility_timeout: Optional[float] = None) -> List[Tuple[int, Dict]]:
+        """
+        Hide up to limit visible messages for the visibility timeout and return
+        them as (receipt id, payload) in enqueue order
+        """
+        now = time.time()
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                'UPDATE messages SET visible_at = ?, attempts = attempts + 1 WHERE id IN '
+                '(SELECT id FROM messages WHERE visible_at <= ? ORDER BY id LIMIT ?) '
+                'RETURNING id, payload',
+                (now + timeout, now, limit)
+            ).fetchall()
+        rows.sort()
+        return [(receipt, json.loads(payload)) for receipt, payload in rows]
+    
+    def ack(self, receipts: Iterable[int], keys: Iterable[str] = ()) -> None:
+        """Delete finished messages and record their idempotency keys, in one transaction"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany('DELETE FROM messages WHERE id = ?', [(receipt,) for receipt in receipts])
+            self._conn.executemany('INSERT OR IGNORE INTO processed (key, processed_at) VALUES (?, ?)',
+                                   [(key, now) for key in keys if key])
+    
+    def extend(self, receipts: Iterable[int], visibility_timeout: Optional[float] = None) -> None:
+        """Restart the visibility timeout of leased messages that are still being worked on"""
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        visible_at = time.time() + timeout
+        with self._lock, self._conn:
+            self._conn.executemany('UPDATE messages SET visible_at = ? WHERE id = ?',
+                                   [(visible_at, receipt) for receipt in receipts])
+    
+    def release(self, receipts: Iterable[int]) -> None:
+        """Make leased messages visible again immediately"""
+        with self._lock, self._conn:
+            self._conn.executemany('UPDATE messages SET visible_at = 0 WHERE id = ?',
+                                   [(receipt,) for receipt in receipts])
+    
+    def mark_processed(self, key: str) -> None:
+        """Record that the side effect for key has happened (e.g. the sheet row was written)"""
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR IGNORE INTO processed (key, processed_at) VALUES (?, ?)',
+                               (key, time.time()))
+    
+    def is_processed(self, key: str) -> bool:
+        """Check whether key was marked processed"""
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM processed WHERE key = ?', (key,)).fetchone() is not None
+    
+    def prune_processed(self, older_than: float) -> int:
+        """Forget idempotency keys processed more than older_than seconds ago"""
+        with self._lock, self._conn:
+            return self._conn.execute('DELETE FROM processed WHERE processed_at < ?',
+                                      (time.time() - older_than,)).rowcount
+    
+    def peek(self, limit: Optional[int] = None) -> List[Dict]:
+        """Return visible messages without leasing them"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT payload FROM messages WHERE visible_at <= ? ORDER BY id LIMIT ?',
+                (time.time(), -1 if limit is None else limit)
+            ).fetchall()
+        return [json.loads(payload) for payload, in rows]
+    
+    def purge(self) -> None:
+        """Delete every queued message"""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM messages')
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """Visible, in-flight and processed counts"""
+        now = time.time()
+        with self._lock:
+            pending, in_flight = self._conn.execute(
+                'SELECT COALESCE(SUM(visible_at <= ?), 0), COALESCE(SUM(visible_at > ?), 0) FROM messages',
+                (now, now)
+            ).fetchone()
+            processed = self._conn.execute('SELECT COUNT(*) FROM processed').fetchone()[0]
+        return {'pending': pending, 'in_flight': in_flight, 'processed': processed}
+    
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
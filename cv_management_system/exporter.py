@@ -0,0 +1,72 @@
+"""
+Module for streaming records to NDJSON files
+Records are serialized and written one at a time so exports never hold the full dataset in memory
+"""
+from typing import Any, Callable, Dict, IO, Iterable, Optional
+import json
+import os
+
+
+def get_serializer(fast: bool = False) -> Callable[[Any], str]:
+    """
+    Return a function that serializes one record to a compact JSON string
+    With fast=True orjson is used when it is installed, falling back to json.
+    """
+    if fast:
+        try:
+            import orjson
+            return lambda record: orjson.dumps(record, default=_to_serializable).decode('utf-8')
+        except ImportError:
+            pass
+    return lambda record: json.dumps(record, separators=(',', ':'), default=_to_serializable)
+
+
+def _to_serializable(obj: Any) -> Any:
+    """Convert objects such as CandidateRecord that offer to_dict()"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def open_output(output_file: str, compress: Optional[bool] = None) -> IO[str]:
+    """Open a text file for writing, gzip-compressed if requested or if the name ends in .gz"""
+    if compress is None:
+        compress = output_file.endswith('.gz')
+    if compress:
+        import gzip
+        return gzip.open(output_file, 'wt', encoding='utf-8')
+    return open(output_file, 'w', encoding='utf-8')
+
+
+def write_ndjson(records: Iterable[Dict], output_file: str, compress: Optional[bool] = None,
+                 fast: bool = False) -> int:
+    """
+    Stream records to an NDJSON file, one JSON object per line
+    
+    Returns:
+        Number of records written
+    """
+    dumps = get_serializer(fast)
+    count = 0
+    with open_output(output_file, compress) as f:
+        for record in records:
+            f.write(dumps(record))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def load_checkpoint(checkpoint_file: str) -> Dict[str, int]:
+    """Read the last exported sequence numbers (empty if there is no checkpoint yet)"""
+    if not os.path.exists(checkpoint_file):
+        return {}
+    with open(checkpoint_file, 'r') as f:
+        return json.load(f)
+
+
+def save_checkpoint(checkpoint_file: str, positions: Dict[str, int]) -> None:
+    """Atomically store the last exported sequence numbers"""
+    temp_file = checkpoint_file + '.tmp'
+    with open(temp_file, 'w') as f:
+        json.dump(positions, f)
+    os.replace(temp_file, checkpoint_file)
@@ -1,73 +1,276 @@
 """
 Module for processing various file formats (PDF, DOCX, TXT)
 """
+import codecs
 import os
-from typing import Optional, Tuple
-from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+from config import MAX_FILE_SIZE
+from tracing import get_tracer
+
+# Documents with fewer pages than this are not worth a process pool
+PARALLEL_PDF_MIN_PAGES = 16
+
+# Text files are decoded in chunks of this many bytes
+TEXT_CHUNK_SIZE = 1024 * 1024
+
+# Leading bytes used to recognise file types regardless of extension
+PDF_MAGIC = b'%PDF-'
+ZIP_MAGIC = b'PK\x03\x04'
+OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'  # Legacy .doc and other Office formats
+
+# WordprocessingML tags read by the DOCX extractor
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P, _W_TC, _W_T, _W_TAB, _W_BR, _W_CR = (_W + tag for tag in ('p', 'tc', 't', 'tab', 'br', 'cr'))
+_W_NO_BREAK_HYPHEN = _W + 'noBreakHyphen'
+_W_TYPE = _W + 'type'
+
+
+def _extract_pdf_pages(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract a range of pages (module-level so process pool workers can run it)"""
+    import PyPDF2
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [pdf_reader.pages[i].extract_text() or '' for i in range(start, stop)]
+
 
 class FileProcessor:
     """Process different file formats to extract text"""
     
     @staticmethod
-    def extract_text_from_pdf(file_path: str) -> Optional[str]:
-        """Extract text from PDF file"""
+    def iter_pdf_pages(file_path: str, max_pages: Optional[int] = None, workers: int = 1) -> Iterator[str]:
+        """
+        Yield the text of each PDF page lazily, in page order
+        
+        Args:
+            file_path: Path to the PDF
+            max_pages: Stop after this many pages (contact details and skills
+                       are almost always on the first pages)
+            workers: Extract pages in a process pool of this size when the
+                     document has at least PARALLEL_PDF_MIN_PAGES pages
+        """
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            page_count = len(pdf_reader.pages)
+            if max_pages is not None:
+                page_count = min(page_count, max_pages)
+            
+            if workers <= 1 or page_count < PARALLEL_PDF_MIN_PAGES:
+                for i in range(page_count):
+                    yield pdf_reader.pages[i].extract_text() or ''
+                return
+        
+        from concurrent.futures import ProcessPoolExecutor
+        chunk = -(-page_count // (workers * 2))
+        starts = list(range(0, page_count, chunk))
+        stops = [min(start + chunk, page_count) for start in starts]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for pages in pool.map(_extract_pdf_pages, [file_path] * len(starts), starts, stops):
+                yield from pages
+    
+    @staticmethod
+    def extract_text_from_pdf(file_path: str, max_pages: Optional[int] = None, workers: int = 1) -> Optional[str]:
+        """Extract text from PDF file (see iter_pdf_pages for the arguments)"""
         try:
-            import PyPDF2
-            text = []
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text.append(page.extract_text())
-            return '\n'.join(text)
+            return '\n'.join(FileProcessor.iter_pdf_pages(file_path, max_pages, workers))
         except Exception as e:
-            print(f"Error extracting PDF: {e}")
+            get_tracer().event('file_processor.error', f"Error extracting PDF: {e}", level='error', file_path=file_path)
             return None
     
+    @staticmethod
+    def iter_docx_blocks(file_path: str) -> Iterator[str]:
+        """
+        Yield the text of each paragraph and table cell of a DOCX in document order
+        word/document.xml is parsed incrementally straight from the archive, so
+        no document object model is built. A table cell is yielded once, with
+        its paragraphs joined by newlines.
+        """
+        import zipfile
+        import xml.etree.ElementTree as ElementTree
+        with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as xml_file:
+            paragraphs: List[List[str]] = []
+            cells: List[List[str]] = []
+            parents = []
+            for event, elem in ElementTree.iterparse(xml_file, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    parents.append(elem)
+                    if tag == _W_P:
+                        paragraphs.append([])
+                    elif tag == _W_TC:
+                        cells.append([])
+                    continue
+                
+                parents.pop()
+                if len(parents) == 2:
+                    # Finished a top-level block: drop it from <w:body> to keep memory flat
+                    parents[1].remove(elem)
+                
+                if tag == _W_T:
+                    if paragraphs and elem.text:
+                        paragraphs[-1].append(elem.text)
+                elif tag == _W_TAB:
+                    if paragraphs:
+                        paragraphs[-1].append('\t')
+                elif tag == _W_BR or tag == _W_CR:
+                    # Page and column breaks do not produce text
+                    if paragraphs and elem.get(_W_TYPE, 'textWrapping') == 'textWrapping':
+                        paragraphs[-1].append('\n')
+                elif tag == _W_NO_BREAK_HYPHEN:
+                    if paragraphs:
+                        paragraphs[-1].append('-')
+                elif tag == _W_P:
+                    text = ''.join(paragraphs.pop())
+                    if cells:
+                        cells[-1].append(text)
+                    else:
+                        yield text
+                elif tag == _W_TC:
+                    text = '\n'.join(cells.pop())
+                    if cells:
+                        cells[-1].append(text)
+                    else:
+                        yield text
+    
     @staticmethod
     def extract_text_from_docx(file_path: str) -> Optional[str]:
-        """Extract text from DOCX file"""
+        """Extract text from DOCX file, including table cells (see iter_docx_blocks)"""
         try:
-            from docx import Document
-            doc = Document(file_path)
-            text = []
-            for paragraph in doc.paragraphs:
-                text.append(paragraph.text)
-            return '\n'.join(text)
+            return '\n'.join(FileProcessor.iter_docx_blocks(file_path))
         except Exception as e:
-            print(f"Error extracting DOCX: {e}")
+            get_tracer().event('file_processor.error', f"Error extracting DOCX: {e}", level='error', file_path=file_path)
             return None
     
     @staticmethod
-    def extract_text_from_txt(file_path: str) -> Optional[str]:
-        """Extract text from TXT file"""
+    def extract_text_from_txt(file_path: str, max_bytes: Optional[int] = None) -> Optional[str]:
+        """
+        Extract text from TXT file
+        The file is decoded in chunks; with max_bytes only that many bytes are
+        read and a multi-byte character cut at the limit is dropped.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            parts = []
+            remaining = max_bytes if max_bytes is not None else -1
+            with open(file_path, 'rb') as file:
+                while remaining != 0:
+                    size = TEXT_CHUNK_SIZE if remaining < 0 else min(TEXT_CHUNK_SIZE, remaining)
+                    chunk = file.read(size)
+                    if not chunk:
+                        break
+                    parts.append(decoder.decode(chunk))
+                    if remaining > 0:
+                        remaining -= len(chunk)
+                truncated = remaining == 0 and file.read(1) != b''
+            parts.append(decoder.decode(b'', final=not truncated))
+            
+            text = ''.join(parts)
+            # Match text-mode reads, which translate Windows/Mac line endings
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return text
         except Exception as e:
-            print(f"Error extracting TXT: {e}")
+            get_tracer().event('file_processor.error', f"Error extracting TXT: {e}", level='error', file_path=file_path)
             return None
     
     @staticmethod
-    def process_file(file_path: str) -> Tuple[bool, Optional[str]]:
+    def detect_file_type(file_path: str) -> Optional[str]:
         """
-        Process a file and extract text based on its extension
-        Returns (success: bool, text: Optional[str])
+        Detect the file type from its leading bytes instead of its extension
+        Returns 'pdf', 'docx', 'txt' (leading bytes that decode as UTF-8) or
+        None if unsupported
         """
+        with open(file_path, 'rb') as file:
+            head = file.read(4096)
+        
+        if head.startswith(PDF_MAGIC):
+            return 'pdf'
+        if head.startswith(ZIP_MAGIC):
+            import zipfile
+            try:
+                with zipfile.ZipFile(file_path) as archive:
+                    archive.getinfo('word/document.xml')
+                return 'docx'
+            except (KeyError, zipfile.BadZipFile):
+                return None
+        if head.startswith(OLE_MAGIC) or b'\x00' in head:
+            return None
+        # Text is read as UTF-8, so anything else is treated as binary; a
+        # character cut off at the end of head is not an error
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        except UnicodeDecodeError:
+            return None
+        return 'txt'
+    
+    @staticmethod
+    def _check_file(file_path: str, truncate_oversized: bool) -> Tuple[Optional[str], Optional[str]]:
+        """Return (file type, None) for a file that can be processed, else (None, error)"""
         if not os.path.exists(file_path):
-            return False, f"File not found: {file_path}"
+            return None, f"File not found: {file_path}"
+        
+        # Check the size before opening the file at all
+        file_size = os.stat(file_path).st_size
+        oversized = file_size > MAX_FILE_SIZE
+        too_large = f"File too large: {file_size} bytes (limit {MAX_FILE_SIZE})"
+        if oversized and not truncate_oversized:
+            return None, too_large
         
-        file_ext = Path(file_path).suffix.lower()
+        file_type = FileProcessor.detect_file_type(file_path)
         
-        if file_ext == '.pdf':
+        if file_type is None:
+            return None, f"Unsupported file type: {os.path.splitext(file_path)[1].lower()}"
+        elif oversized and file_type != 'txt':
+            return None, too_large
+        return file_type, None
+    
+    @staticmethod
+    def process_file(file_path: str, truncate_oversized: bool = False) -> Tuple[bool, Optional[str]]:
+        """
+        Process a file and extract text based on its content type
+        Files larger than config.MAX_FILE_SIZE are rejected, or for plain text
+        truncated to the limit when truncate_oversized is True.
+        Returns (success: bool, text: Optional[str])
+        """
+        file_type, error = FileProcessor._check_file(file_path, truncate_oversized)
+        if error:
+            return False, error
+        elif file_type == 'pdf':
             text = FileProcessor.extract_text_from_pdf(file_path)
-        elif file_ext in ['.docx', '.doc']:
+        elif file_type == 'docx':
             text = FileProcessor.extract_text_from_docx(file_path)
-        elif file_ext == '.txt':
-            text = FileProcessor.extract_text_from_txt(file_path)
         else:
-            return False, f"Unsupported file type: {file_ext}"
+            text = FileProcessor.extract_text_from_txt(file_path, max_bytes=MAX_FILE_SIZE)
         
         if text:
             return True, text
         else:
             return False, "Could not extract text from file"
+    
+    @staticmethod
+    def process_file_stream(file_path: str, truncate_oversized: bool = False,
+                            max_pages: Optional[int] = None) -> Tuple[bool, Union[Iterator[str], str]]:
+        """
+        Like process_file, but return the text lazily as chunks (PDF pages,
+        DOCX blocks, or the whole text of a TXT file) that join with newlines
+        to the text process_file returns
+        
+        Pages are only extracted as the chunks are consumed, so a consumer
+        that stops early (ResumeDataExtractor.parse_resume_stream in
+        section-aware mode) skips the rest of the document. Extraction errors
+        are raised while iterating.
+        Returns (success: bool, chunks or error message)
+        """
+        file_type, error = FileProcessor._check_file(file_path, truncate_oversized)
+        if error:
+            return False, error
+        elif file_type == 'pdf':
+            return True, FileProcessor.iter_pdf_pages(file_path, max_pages=max_pages)
+        elif file_type == 'docx':
+            return True, FileProcessor.iter_docx_blocks(file_path)
+        
+        text = FileProcessor.extract_text_from_txt(file_path, max_bytes=MAX_FILE_SIZE)
+        if not text:
+            return False, "Could not extract text from file"
+        return True, iter([text])
@@ -1,24 +1,64 @@
 """
 Module for handling Google Sheets API integration
 """
-from typing import List, Optional, Dict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import json
 import os
+import threading
+import time
+
+from exporter import write_ndjson
+from tracing import get_tracer
 
 class GoogleSheetsHandler:
     """Handle Google Sheets API operations"""
     
-    def __init__(self, credentials_json: Optional[str] = None):
+    def __init__(self, credentials_json: Optional[str] = None, service: Optional[Any] = None,
+                 read_cache_ttl: float = 30.0, service_builder: Optional[Callable[[Any], Any]] = None,
+                 http_factory: Optional[Callable[[], Any]] = None):
         """
         Initialize Google Sheets handler
         In demo mode, this simulates the API without actual authentication
+        
+        Args:
+            credentials_json: Path to a service account credentials file
+            service: Pre-built Sheets service object (or an in-process stub with
+                     the same spreadsheets().values() interface) to use instead
+                     of building one from credentials
+            read_cache_ttl: Seconds a page read from the sheet is served from the
+                            local cache (0 disables it); writes through this
+                            handler clear the cache
+            service_builder: Builds the service from an HTTP transport on first
+                             use (defaults to googleapiclient's build)
+            http_factory: Creates a thread's HTTP transport (defaults to an
+                          AuthorizedHttp over httplib2 with the credentials)
         """
         self.demo_mode = True
         self.spreadsheet_id = None
         self.sheet_name = 'Candidates'
         self.demo_data = []
+        self.column_count = 8
+        self.credentials = None
+        
+        # Read-through page cache (A1 range -> (expiry, values)) and the last
+        # sheet row returned by any read, used for incremental syncs
+        self.read_cache_ttl = read_cache_ttl
+        self._read_cache: Dict[str, Tuple[float, List[List[str]]]] = {}
+        self.last_row_read = 0
+        self._service = service
+        self._service_builder = service_builder
+        self._http_factory = http_factory
+        
+        # One service object is shared by all threads; each thread gets its own
+        # persistent HTTP connection because httplib2 transports are not thread-safe
+        self._service_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self.client_stats = {'service_builds': 0, 'http_connections': 0, 'requests': 0}
         
-        if credentials_json and os.path.exists(credentials_json):
+        if service is not None or service_builder is not None:
+            self.demo_mode = False
+        elif credentials_json and os.path.exists(credentials_json):
             try:
                 from google.auth.transport.requests import Request
                 from google.oauth2.service_account import Credentials
@@ -29,64 +69,143 @@ class GoogleSheetsHandler:
                 )
                 self.demo_mode = False
             except Exception as e:
-                print(f"Warning: Could not initialize real Google Sheets API: {e}")
-                print("Using demo mode instead")
+                tracer = get_tracer()
+                tracer.event('sheets.error', f"Warning: Could not initialize real Google Sheets API: {e}",
+                             level='warning')
+                tracer.event('sheets.demo_mode', "Using demo mode instead", level='warning')
     
     def initialize_sheet(self, spreadsheet_id: str, headers: List[str]) -> bool:
         """Initialize a new sheet with headers"""
         self.spreadsheet_id = spreadsheet_id
+        self.column_count = len(headers)
+        self._read_cache.clear()
         
         if self.demo_mode:
-            print(f"[DEMO MODE] Would initialize sheet: {spreadsheet_id}")
+            get_tracer().event('sheets.initialize', f"[DEMO MODE] Would initialize sheet: {spreadsheet_id}")
             self.demo_data = [headers]
             return True
         
         try:
-            from googleapiclient.discovery import build
-            service = build('sheets', 'v4', credentials=self.credentials)
+            service = self._get_service()
             
             body = {
                 'values': [headers]
             }
             
-            result = service.spreadsheets().values().update(
+            result = self._execute(service.spreadsheets().values().update(
                 spreadsheetId=spreadsheet_id,
                 range=f"{self.sheet_name}!A1",
                 valueInputOption="RAW",
                 body=body
-            ).execute()
+            ))
             
             return True
         except Exception as e:
-            print(f"Error initializing sheet: {e}")
+            get_tracer().event('sheets.error', f"Error initializing sheet: {e}", level='error')
             return False
     
+    def _get_service(self):
+        """Return the Sheets service object, building it once on first use"""
+        if self._service is None:
+            with self._service_lock:
+                if self._service is None:
+                    if self._service_builder is not None:
+                        self._service = self._service_builder(self._get_http())
+                    else:
+                        from googleapiclient.discovery import build
+                        self._service = build('sheets', 'v4', http=self._get_http())
+                    with self._stats_lock:
+                        self.client_stats['service_builds'] += 1
+        return self._service
+    
+    def _get_http(self):
+        """Return the calling thread's authorized HTTP transport, creating it once"""
+        if self.credentials is None and self._http_factory is None:
+            return None
+        
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            if self._http_factory is not None:
+                http = self._http_factory()
+            else:
+                import httplib2
+                from google_auth_httplib2 import AuthorizedHttp
+                http = AuthorizedHttp(self.credentials, http=httplib2.Http())
+            self._local.http = http
+            with self._stats_lock:
+                self.client_stats['http_connections'] += 1
+        return http
+    
+    def _execute(self, request) -> Dict:
+        """Execute an API request over the calling thread's connection"""
+        http = self._get_http()
+        with self._stats_lock:
+            self.client_stats['requests'] += 1
+        if http is None:
+            return request.execute()
+        return request.execute(http=http)
+    
+    def get_client_stats(self) -> Dict[str, int]:
+        """Get counters for service builds, HTTP connections and API requests"""
+        with self._stats_lock:
+            return dict(self.client_stats)
+    
     def append_row(self, row_data: List[str]) -> bool:
         """Append a row of data to the sheet"""
         if self.demo_mode:
             self.demo_data.append(row_data)
-            print(f"[DEMO MODE] Appended row: {row_data}")
+            tracer = get_tracer()
+            # Formatting the row is wasted work if no sink receives events
+            if tracer.traces_events:
+                tracer.event('sheets.append', f"[DEMO MODE] Appended row: {row_data}", rows=1)
             return True
         
+        return self.append_rows([row_data])
+    
+    def append_rows(self, rows: List[List[str]]) -> bool:
+        """Append several rows to the sheet with a single API request"""
+        return self._append_values(rows) is not None
+    
+    def _append_values(self, rows: List[List[str]]) -> Optional[str]:
+        """
+        Append rows in one request
+        Returns the A1 range the rows were written to, or None on failure
+        """
         try:
-            from googleapiclient.discovery import build
-            service = build('sheets', 'v4', credentials=self.credentials)
-            
-            body = {
-                'values': [row_data]
-            }
-            
-            result = service.spreadsheets().values().append(
-                spreadsheetId=self.spreadsheet_id,
-                range=f"{self.sheet_name}!A:H",
-                valueInputOption="RAW",
-                body=body
-            ).execute()
-            
-            return True
+            return self.request_append(rows)
         except Exception as e:
-            print(f"Error appending row: {e}")
-            return False
+            get_tracer().event('sheets.error', f"Error appending rows: {e}", level='error', rows=len(rows))
+            return None
+    
+    def request_append(self, rows: List[List[str]]) -> str:
+        """
+        Append rows in one request and return the A1 range they were written to
+        API errors are raised (e.g. HttpError with its status), for callers that retry.
+        """
+        if not rows:
+            return ''
+        
+        if self.demo_mode:
+            start = len(self.demo_data) + 1
+            self.demo_data.extend(rows)
+            get_tracer().event('sheets.append', f"[DEMO MODE] Appended {len(rows)} rows", rows=len(rows))
+            return f"{self.sheet_name}!A{start}:H{start + len(rows) - 1}"
+        
+        service = self._get_service()
+        
+        body = {
+            'values': rows
+        }
+        
+        result = self._execute(service.spreadsheets().values().append(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{self.sheet_name}!A:H",
+            valueInputOption="RAW",
+            body=body
+        ))
+        
+        self._read_cache.clear()
+        return result.get('updates', {}).get('updatedRange', '')
     
     def get_all_data(self) -> Optional[List[List[str]]]:
         """Retrieve all data from the sheet"""
@@ -94,39 +213,109 @@ class GoogleSheetsHandler:
             return self.demo_data
         
         try:
-            from googleapiclient.discovery import build
-            service = build('sheets', 'v4', credentials=self.credentials)
-            
-            result = service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=self.sheet_name
-            ).execute()
-            
-            return result.get('values', [])
+            return list(self.iter_rows())
         except Exception as e:
-            print(f"Error retrieving data: {e}")
+            get_tracer().event('sheets.error', f"Error retrieving data: {e}", level='error')
             return None
     
-    def export_to_json(self, output_file: str) -> bool:
-        """Export sheet data to JSON file"""
+    def iter_rows(self, start_row: int = 1, page_size: int = 1000,
+                  columns: Optional[List[int]] = None) -> Iterator[List[str]]:
+        """
+        Yield sheet rows page by page, reading one fixed-size A1 row range per request
+        Reading stops at the first page without any values, so a run of at
+        least page_size empty rows ends the iteration.
+        
+        Args:
+            start_row: 1-based sheet row to start from
+            page_size: Number of rows requested per page
+            columns: Zero-based column indexes to return, in that order (all if None)
+        """
+        first_col = min(columns) if columns else 0
+        last_col = max(columns) if columns else self.column_count - 1
+        
+        row = start_row
+        while True:
+            end = row + page_size - 1
+            values = self._read_rows(row, end, first_col, last_col)
+            for values_row in values:
+                if columns:
+                    yield [
+                        values_row[col - first_col] if col - first_col < len(values_row) else ''
+                        for col in columns
+                    ]
+                else:
+                    yield values_row
+            
+            # The API leaves out trailing empty rows, so a short page does not
+            # mean the end of the sheet; only an empty one does
+            if not values:
+                return
+            self.last_row_read = max(self.last_row_read, row + len(values) - 1)
+            row = end + 1
+    
+    def iter_new_rows(self, page_size: int = 1000, columns: Optional[List[int]] = None) -> Iterator[List[str]]:
+        """Yield only rows below the last row already read, for incremental syncs"""
+        return self.iter_rows(self.last_row_read + 1, page_size, columns)
+    
+    def _read_rows(self, start: int, end: int, first_col: int, last_col: int) -> List[List[str]]:
+        """Read one rectangular range, served from the read cache while fresh"""
+        if self.demo_mode:
+            return [row[first_col:last_col + 1] for row in self.demo_data[start - 1:end]]
+        
+        a1_range = f"{self.sheet_name}!{_column_letter(first_col)}{start}:{_column_letter(last_col)}{end}"
+        now = time.monotonic()
+        cached = self._read_cache.get(a1_range)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        service = self._get_service()
+        result = self._execute(service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=a1_range
+        ))
+        values = result.get('values', [])
+        
+        if self.read_cache_ttl > 0:
+            if len(self._read_cache) >= 1024:
+                self._read_cache = {key: entry for key, entry in self._read_cache.items() if entry[0] > now}
+            self._read_cache[a1_range] = (now + self.read_cache_ttl, values)
+        return values
+    
+    def export_to_json(self, output_file: str, format: str = 'json', compress: Optional[bool] = None,
+                       fast_json: bool = False) -> bool:
+        """
+        Export sheet data to JSON file
+        Rows are read page by page; with format='ndjson' they are also written
+        one object per line (see exporter.write_ndjson)
+        """
         try:
-            data = self.get_all_data()
-            if not data or len(data) < 1:
+            rows = self.iter_rows()
+            headers = next(rows, None)
+            if not headers:
                 return False
             
-            headers = data[0]
-            records = []
+            def records():
+                for row in rows:
+                    yield {header: row[i] if i < len(row) else '' for i, header in enumerate(headers)}
             
-            for row in data[1:]:
-                record = {}
-                for i, header in enumerate(headers):
-                    record[header] = row[i] if i < len(row) else ''
-                records.append(record)
+            if format == 'ndjson':
+                write_ndjson(records(), output_file, compress=compress, fast=fast_json)
+                return True
             
             with open(output_file, 'w') as f:
-                json.dump(records, f, indent=2)
+                json.dump(list(records()), f, indent=2)
             
             return True
         except Exception as e:
-            print(f"Error exporting to JSON: {e}")
+            get_tracer().event('sheets.error', f"Error exporting to JSON: {e}", level='error')
             return False
+
+
+def _column_letter(index: int) -> str:
+    """Convert a zero-based column index to its A1 letters (0 -> A, 26 -> AA)"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
@@ -0,0 +1,125 @@
+"""
+Module for incremental processing statistics and per-stage latency histograms
+"""
+from typing import Dict, Optional
+import bisect
+import math
+import threading
+
+# Pipeline stages that are timed
+STAGES = ('file_extraction', 'parsing', 'sheet_upload')
+
+# Processing outcomes counted in the summary
+STATUSES = ('success', 'partial_success', 'failed', 'duplicate')
+
+
+class LatencyHistogram:
+    """
+    Fixed-size histogram of durations with logarithmic buckets
+    Recording and percentile queries are O(number of buckets), independent of
+    how many values were recorded.
+    """
+    
+    def __init__(self, min_seconds: float = 1e-5, max_seconds: float = 100.0, growth: float = 1.2):
+        """
+        Initialize the histogram
+        
+        Args:
+            min_seconds: Upper bound of the first bucket
+            max_seconds: Values above this land in the last bucket
+            growth: Ratio between consecutive bucket bounds (relative error of percentiles)
+        """
+        bucket_count = int(math.ceil(math.log(max_seconds / min_seconds, growth))) + 1
+        self.bounds = [min_seconds * growth ** i for i in range(bucket_count)]
+        self.counts = [0] * (bucket_count + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, seconds: float) -> None:
+        """Add one duration"""
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add the durations recorded by a histogram with the same buckets"""
+        if other.bounds != self.bounds:
+            raise ValueError("Cannot merge histograms with different buckets")
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+    
+    def percentile(self, percent: float) -> Optional[float]:
+        """Return the upper bound of the bucket holding the given percentile"""
+        if not self.count:
+            return None
+        
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for i, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+    
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Count, mean, p50, p95, p99 and max in milliseconds"""
+        def ms(value):
+            return round(value * 1000, 3) if value is not None else None
+        
+        return {
+            'count': self.count,
+            'mean_ms': ms(self.total / self.count) if self.count else None,
+            'p50_ms': ms(self.percentile(50)),
+            'p95_ms': ms(self.percentile(95)),
+            'p99_ms': ms(self.percentile(99)),
+            'max_ms': ms(self.max) if self.count else None,
+        }
+
+
+class ProcessingStats:
+    """Running outcome counters and stage latencies, safe to update from several threads"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = 0
+        self.status_counts = {status: 0 for status in STATUSES}
+        self.latency = {stage: LatencyHistogram() for stage in STAGES}
+    
+    def record_status(self, status: str) -> None:
+        """Count one finished message"""
+        with self._lock:
+            self.total += 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+    
+    def record_latency(self, stage: str, seconds: float) -> None:
+        """Record how long one stage took for one message"""
+        with self._lock:
+            self.latency[stage].record(seconds)
+    
+    def merge(self, other: 'ProcessingStats') -> None:
+        """Add the counters and latencies of another instance (e.g. from a shard worker)"""
+        with self._lock:
+            self.total += other.total
+            for status, count in other.status_counts.items():
+                self.status_counts[status] = self.status_counts.get(status, 0) + count
+            for stage, histogram in other.latency.items():
+                self.latency.setdefault(stage, LatencyHistogram()).merge(histogram)
+    
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+    
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def latency_summary(self) -> Dict[str, Dict]:
+        """Latency percentiles per stage"""
+        with self._lock:
+            return {stage: histogram.summary() for stage, histogram in self.latency.items()}
@@ -0,0 +1,391 @@
+"""
+Sharded coordinator/worker mode for the CV Management System
+The coordinator splits messages across worker processes or hosts by a stable
+hash of sender_id, so repeat submissions from a sender always reach the same
+worker and its dedup cache. Workers run CVManagementSystem.process_incoming_message
+and send results back over a local pipe or a multiprocessing.connection socket
+(a Unix socket path or a TCP address, no other services needed); their
+statistics are merged into one processing summary.
+"""
+from typing import Dict, List, Optional, Tuple, Union
+from dataclasses import asdict
+import os
+import threading
+import time
+import zlib
+
+from whatsapp_simulator import WhatsAppSimulator, WhatsAppMessage
+from cv_manager import CVManagementSystem
+from metrics import ProcessingStats
+from tracing import NullSink, Tracer, get_tracer, set_tracer
+from config import MESSAGE_QUEUE_FILE, SHARD_AUTHKEY
+
+# A Unix socket path or a (host, port) pair
+Address = Union[str, Tuple[str, int]]
+
+
+def shard_for(sender_id: Optional[str], shards: int) -> int:
+    """Shard index of a sender; unlike hash() it is the same in every process"""
+    return zlib.crc32((sender_id or '').encode('utf-8')) % shards
+
+
+def _serve(conn, system_options: Optional[Dict], quiet: bool, profile_sample_rate: float = 0.0,
+           profile_dir: Optional[str] = None) -> None:
+    """Process the batches sent over conn until the coordinator stops or disconnects"""
+    set_tracer(Tracer([NullSink()] if quiet else None, profile_sample_rate, profile_dir))
+    system = CVManagementSystem(**(system_options or {}))
+    with conn, system:
+        while True:
+            try:
+                command, payload = conn.recv()
+            except EOFError:
+                break
+            if command == 'process':
+                conn.send([system.process_incoming_message(WhatsAppMessage(**fields)) for fields in payload])
+            elif command == 'summary':
+                conn.send((system.get_processing_summary(), system.stats))
+            else:
+                break
+
+
+def run_worker(address: Address, authkey: Optional[bytes] = None, system_options: Optional[Dict] = None,
+               quiet: bool = False, profile_sample_rate: float = 0.0, profile_dir: Optional[str] = None) -> None:
+    """
+    Connect to a coordinator and work on its shard until it closes
+    
+    Args:
+        address: Address the coordinator listens on
+        authkey: Shared secret (defaults to SHARD_AUTHKEY)
+        system_options: Keyword arguments for this worker's CVManagementSystem
+        quiet: Discard the worker's console events
+        profile_sample_rate: Fraction of messages run under cProfile (see Tracer)
+        profile_dir: Directory the worker's sampled profiles are dumped to
+    """
+    from multiprocessing.connection import Client
+    authkey = authkey or (SHARD_AUTHKEY or '').encode()
+    if not authkey:
+        raise ValueError("An authkey (or SHARD_AUTHKEY) is required to connect to a coordinator")
+    _serve(Client(address, authkey=authkey), system_options, quiet, profile_sample_rate, profile_dir)
+
+
+def _merge_counts(stats: List[Optional[Dict]]) -> Optional[Dict]:
+    """Sum the numeric counters of several statistics dictionaries"""
+    merged = {}
+    for entry in stats:
+        for key, value in (entry or {}).items():
+            if isinstance(value, (int, float)):
+                merged[key] = merged.get(key, 0) + value
+    return merged or None
+
+
+class ShardedCVManagementSystem:
+    """
+    Coordinator that shards messages across CVManagementSystem workers
+    
+    Messages are received and queued here as in CVManagementSystem; processing
+    sends each worker batches of its shard, one batch in flight per worker, and
+    returns results in the original message order. Senders keep their worker
+    while it is connected; only the senders of a lost worker's shard move to
+    the remaining workers.
+    """
+    
+    def __init__(self, workers: int = 2, address: Optional[Address] = None, authkey: Optional[bytes] = None,
+                 batch_size: int = 50, system_options: Optional[Dict] = None, quiet_workers: bool = False,
+                 queue_path: Optional[str] = MESSAGE_QUEUE_FILE, tracer: Optional[Tracer] = None,
+                 accept_timeout: Optional[float] = 60.0):
+        """
+        Initialize the coordinator and its workers
+        
+        Args:
+            workers: Number of shards
+            address: If None, workers are started as local processes connected by
+                     pipes. Otherwise the coordinator listens on this address and
+                     waits for `workers` workers started with run_worker (for
+                     example `python sharded_cv_manager.py HOST:PORT` on other hosts)
+            authkey: Shared secret remote workers authenticate with (defaults to SHARD_AUTHKEY)
+            batch_size: Messages sent to a worker per round trip
+            system_options: Keyword arguments for the CVManagementSystem of each local worker
+            quiet_workers: Discard the console events of local workers
+            queue_path: SQLite file of a durable message queue for the coordinator
+            tracer: Receives coordinator events (defaults to get_tracer()); local
+                    workers profile messages at its profile_sample_rate
+            accept_timeout: Seconds to wait for all remote workers to connect
+                            before raising TimeoutError (None waits forever)
+        """
+        if workers < 1:
+            raise ValueError("At least one worker is required")
+        
+        self.batch_size = batch_size
+        self.whatsapp_sim = WhatsAppSimulator(queue_path=queue_path)
+        self.tracer = tracer or get_tracer()
+        # Results that no worker produced (the worker was lost)
+        self.stats = ProcessingStats()
+        self._processes = []
+        self._listener = None
+        
+        if address is None:
+            from multiprocessing import Pipe, Process
+            self._connections = []
+            for worker in range(workers):
+                conn, worker_conn = Pipe()
+                # Workers profile at the coordinator's rate, each into its own directory
+                profile_dir = self.tracer.profile_dir and os.path.join(self.tracer.profile_dir, f'worker-{worker}')
+                process = Process(target=_serve, args=(worker_conn, system_options, quiet_workers,
+                                                       self.tracer.profile_sample_rate, profile_dir), daemon=True)
+                process.start()
+                worker_conn.close()
+                self._connections.append(conn)
+                self._processes.append(process)
+        else:
+            from multiprocessing.connection import Listener
+            authkey = authkey or (SHARD_AUTHKEY or '').encode()
+            if not authkey:
+                raise ValueError("An authkey (or SHARD_AUTHKEY) is required for remote workers")
+            self._listener = Listener(address, authkey=authkey)
+            self.tracer.event('shard.listening', f"[Coordinator] Waiting for {workers} workers on {address}")
+            self._connections = []
+            try:
+                self._accept_workers(workers, accept_timeout)
+            except BaseException:
+                self.close()
+                raise
+    
+    def _accept_workers(self, workers: int, timeout: Optional[float]) -> None:
+        """Accept connections from remote workers until there are `workers` of them"""
+        from multiprocessing import AuthenticationError
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while len(self._connections) < workers:
+            # Listener.accept has no timeout, so it runs in a daemon thread that
+            # is abandoned (and unblocked by close()) if no worker connects in time
+            accepted = []
+            
+            def accept():
+                try:
+                    accepted.append(self._listener.accept())
+                except (AuthenticationError, OSError) as e:
+                    accepted.append(e)
+            
+            thread = threading.Thread(target=accept, daemon=True)
+            thread.start()
+            thread.join(None if deadline is None else max(deadline - time.monotonic(), 0.0))
+            if not accepted:
+                raise TimeoutError(f"Only {len(self._connections)} of {workers} workers connected "
+                                   f"within {timeout} seconds")
+            if isinstance(accepted[0], AuthenticationError):
+                self.tracer.event('shard.auth_failed', f"[Coordinator] Rejected a worker: {accepted[0]}",
+                                  level='warning')
+            elif isinstance(accepted[0], Exception):
+                raise accepted[0]
+            else:
+                self._connections.append(accepted[0])
+    
+    @property
+    def live_workers(self) -> List[int]:
+        """Indexes of the workers still connected"""
+        return [worker for worker, conn in enumerate(self._connections) if conn is not None]
+    
+    def _lose_worker(self, worker: int, error: Exception) -> None:
+        """Drop a worker whose connection failed; later messages are sharded over the rest"""
+        self.tracer.event('shard.worker_lost', f"[Coordinator] Lost worker {worker}: {error!r}",
+                          level='error', worker=worker)
+        conn, self._connections[worker] = self._connections[worker], None
+        try:
+            conn.close()
+        except OSError:
+            pass
+        if self._processes:
+            # Other workers inherited this pipe, so a local worker would not see it close
+            self._processes[worker].terminate()
+    
+    def _worker_for(self, sender_id: Optional[str], live: List[int]) -> int:
+        """
+        Worker of a sender: its shard among all workers, or if that worker is
+        lost, a shard among the live ones
+        """
+        worker = shard_for(sender_id, len(self._connections))
+        if self._connections[worker] is None:
+            worker = live[shard_for(sender_id, len(live))]
+        return worker
+    
+    def _failed_result(self, message: WhatsAppMessage, worker: int) -> Dict:
+        """Result for a message whose worker was lost before it answered"""
+        result = CVManagementSystem._new_result(message)
+        result['status'] = 'failed'
+        result['errors'].append(f"Worker {worker} was lost")
+        self.stats.record_status('failed')
+        return result
+    
+    def _dispatch(self, messages: List[WhatsAppMessage]) -> Tuple[List[Optional[Dict]], Dict[int, int]]:
+        """
+        Send every message to its shard's worker and collect the results in order
+        
+        Returns:
+            (results, {index: worker} of the messages whose worker was lost
+            before it answered; their results are None)
+        """
+        from multiprocessing.connection import wait
+        
+        live = self.live_workers
+        if not live:
+            raise RuntimeError("No workers are connected")
+        
+        shards = {worker: [] for worker in live}
+        for index, message in enumerate(messages):
+            shards[self._worker_for(message.sender_id, live)].append(index)
+        positions = dict.fromkeys(live, 0)
+        results: List[Optional[Dict]] = [None] * len(messages)
+        lost = {}
+        in_flight = {}
+        
+        def fail_rest(worker: int, batch: List[int]) -> None:
+            for index in batch + shards[worker][positions[worker]:]:
+                lost[index] = worker
+            positions[worker] = len(shards[worker])
+        
+        def send_next(worker: int) -> None:
+            start = positions[worker]
+            batch = shards[worker][start:start + self.batch_size]
+            if not batch:
+                return
+            positions[worker] += len(batch)
+            conn = self._connections[worker]
+            try:
+                conn.send(('process', [asdict(messages[index]) for index in batch]))
+            except OSError as e:
+                self._lose_worker(worker, e)
+                fail_rest(worker, batch)
+                return
+            in_flight[conn] = (worker, batch)
+        
+        for worker in live:
+            send_next(worker)
+        
+        while in_flight:
+            for conn in wait(list(in_flight)):
+                worker, batch = in_flight.pop(conn)
+                try:
+                    replies = conn.recv()
+                except (EOFError, OSError) as e:
+                    self._lose_worker(worker, e)
+                    fail_rest(worker, batch)
+                    continue
+                for index, result in zip(batch, replies):
+                    results[index] = result
+                send_next(worker)
+        return results, lost
+    
+    def process_incoming_message(self, message: WhatsAppMessage) -> Dict:
+        """Process one message on the worker of its sender's shard"""
+        results, lost = self._dispatch([message])
+        return results[0] if not lost else self._failed_result(message, lost[0])
+    
+    def receive_message(self, message: WhatsAppMessage) -> None:
+        """Receive a message in the coordinator's WhatsApp simulator"""
+        self.whatsapp_sim.simulate_message_receipt(message)
+    
+    def process_all_pending(self) -> List[Dict]:
+        """
+        Process all pending messages across the workers
+        Messages are taken one batch per live worker at a time. Only answered
+        messages are acknowledged; those of a lost worker are released and
+        processed again on the remaining workers (or left queued for a later
+        run if none remain, in which case RuntimeError is raised).
+        
+        Returns:
+            List of processing results in message order, except that released
+            messages come after the batch they were taken with
+        """
+        results = []
+        while True:
+            live = self.live_workers
+            if not live:
+                raise RuntimeError("No workers are connected")
+            messages = self.whatsapp_sim.get_next_messages(self.batch_size * len(live))
+            if not messages:
+                return results
+            
+            window, lost = self._dispatch(messages)
+            for message, result in zip(messages, window):
+                if result is not None:
+                    self.whatsapp_sim.ack(message)
+                    results.append(result)
+            self.whatsapp_sim.flush_acks()
+            if lost:
+                self.tracer.event('shard.released', f"[Coordinator] Released {len(lost)} messages for replay",
+                                  level='warning', count=len(lost))
+                self.whatsapp_sim.release([messages[index] for index in sorted(lost)])
+    
+    def get_processing_summary(self) -> Dict:
+        """Summary of all workers, in the same form as CVManagementSystem.get_processing_summary"""
+        stats = ProcessingStats()
+        stats.merge(self.stats)
+        summaries = []
+        for worker in self.live_workers:
+            conn = self._connections[worker]
+            try:
+                conn.send(('summary', None))
+                summary, worker_stats = conn.recv()
+            except (EOFError, OSError) as e:
+                self._lose_worker(worker, e)
+                continue
+            stats.merge(worker_stats)
+            summaries.append({'worker': worker, **summary})
+        
+        return {
+            'total_processed': stats.total,
+            'successful': stats.status_counts['success'],
+            'partial_success': stats.status_counts['partial_success'],
+            'failed': stats.status_counts['failed'],
+            'duplicates': stats.status_counts['duplicate'],
+            'candidates_extracted': sum(summary['candidates_extracted'] for summary in summaries),
+            'stage_latency': stats.latency_summary(),
+            'whatsapp_stats': self.whatsapp_sim.get_statistics(),
+            'dedup_cache': _merge_counts([summary['dedup_cache'] for summary in summaries]),
+            'workers': summaries
+        }
+    
+    print_summary = CVManagementSystem.print_summary
+    
+    def close(self) -> None:
+        """Stop the workers and close their connections"""
+        for worker in self.live_workers:
+            conn = self._connections[worker]
+            try:
+                conn.send(('stop', None))
+                conn.close()
+            except OSError:
+                pass
+            self._connections[worker] = None
+        for process in self._processes:
+            process.join(timeout=10)
+        self._processes = []
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+    
+    def __enter__(self) -> 'ShardedCVManagementSystem':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def main() -> None:
+    """Command line entry point: run a worker for a coordinator on another host"""
+    import argparse
+    parser = argparse.ArgumentParser(description='Run a CV Management System shard worker')
+    parser.add_argument('address', help='HOST:PORT or Unix socket path of the coordinator')
+    parser.add_argument('--quiet', action='store_true', help='Do not print processing events')
+    parser.add_argument('--profile-sample-rate', type=float, default=0.0,
+                        help='Fraction of messages run under cProfile')
+    parser.add_argument('--profile-dir', help='Directory sampled profiles are dumped to')
+    args = parser.parse_args()
+    
+    host, _, port = args.address.rpartition(':')
+    address = (host, int(port)) if host and port.isdigit() else args.address
+    run_worker(address, quiet=args.quiet, profile_sample_rate=args.profile_sample_rate,
+               profile_dir=args.profile_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Module with an in-process stand-in for the Google Sheets API
+ThrottlingSheetsService has the spreadsheets().values() interface used by
+GoogleSheetsHandler, enforces a per-window request quota with 429 responses
+and injects 5xx errors and latency, so rate limiting, retries and backoff can
+be exercised without credentials or network access.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import random
+import re
+import threading
+import time
+
+_ROW_RANGE = re.compile(r'!?[A-Z]*(\d+)(?::[A-Z]*(\d+))?$')
+
+
+class StubResponse(dict):
+    """Response headers with a status attribute, like httplib2.Response"""
+    
+    def __init__(self, status: int, headers: Optional[Dict[str, str]] = None):
+        super().__init__(headers or {})
+        self['status'] = str(status)
+        self.status = status
+
+
+class StubHttpError(Exception):
+    """Error shaped like googleapiclient.errors.HttpError (status_code and resp)"""
+    
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"<HttpError {status}>")
+        self.status_code = status
+        self.resp = StubResponse(status, {'retry-after': str(retry_after)} if retry_after is not None else None)
+
+
+class _StubRequest:
+    """Deferred call returned by the stub's append/get/update"""
+    
+    def __init__(self, call: Callable[[], Dict]):
+        self._call = call
+    
+    def execute(self, http=None) -> Dict:
+        return self._call()
+
+
+class ThrottlingSheetsService:
+    """Sheets service stub with a request quota, injected server errors and latency"""
+    
+    def __init__(self, quota: Optional[int] = 60, window: float = 60.0, error_rate: float = 0.0,
+                 latency: float = 0.0, latency_per_row: float = 0.0, retry_after: Optional[float] = None,
+                 seed: int = 0, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the stub
+        
+        Args:
+            quota: Requests allowed per window; further requests get 429 (None for no quota)
+            window: Length of a quota window in seconds (Sheets quotas are per minute)
+            error_rate: Probability of a 500 or 503 response to a request within the quota
+            latency: Seconds each request takes
+            latency_per_row: Additional seconds per appended row
+            retry_after: Value of the Retry-After header sent with 429 responses
+            seed: Seed for the injected errors
+            clock: Time source of the quota windows
+            sleep: Used to simulate latency
+        """
+        self.quota = quota
+        self.window = window
+        self.error_rate = error_rate
+        self.latency = latency
+        self.latency_per_row = latency_per_row
+        self.retry_after = retry_after
+        self.clock = clock
+        self.sleep = sleep
+        self.rows: List[List[str]] = []
+        self.stats = {'requests': 0, 'throttled': 0, 'server_errors': 0, 'rows_written': 0}
+        
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = clock()
+        self._window_requests = 0
+    
+    def spreadsheets(self) -> 'ThrottlingSheetsService':
+        return self
+    
+    def values(self) -> 'ThrottlingSheetsService':
+        return self
+    
+    def append(self, spreadsheetId: str, range: str, valueInputOption: str, body: Dict,
+               **kwargs) -> _StubRequest:
+        return _StubRequest(lambda: self._append(body.get('values', [])))
+    
+    def update(self, spreadsheetId: str, range: str, valueInputOption: str, body: Dict,
+               **kwargs) -> _StubRequest:
+        return _StubRequest(lambda: self._update(range, body.get('values', [])))
+    
+    def get(self, spreadsheetId: str, range: str, **kwargs) -> _StubRequest:
+        return _StubRequest(lambda: self._get(range))
+    
+    def _admit(self, row_count: int = 0) -> None:
+        """Count a request against the quota and raise the injected error, if any"""
+        with self._lock:
+            self.stats['requests'] += 1
+            now = self.clock()
+            if now - self._window_start >= self.window:
+                self._window_start = now
+                self._window_requests = 0
+            self._window_requests += 1
+            if self.quota is not None and self._window_requests > self.quota:
+                self.stats['throttled'] += 1
+                raise StubHttpError(429, self.retry_after)
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.stats['server_errors'] += 1
+                raise StubHttpError(self._rng.choice((500, 503)))
+        
+        delay = self.latency + self.latency_per_row * row_count
+        if delay > 0:
+            self.sleep(delay)
+    
+    def _append(self, values: List[List[str]]) -> Dict:
+        self._admit(len(values))
+        with self._lock:
+            start = len(self.rows) + 1
+            self.rows.extend(values)
+            self.stats['rows_written'] += len(values)
+        return {'updates': {'updatedRange': f"A{start}:H{start + len(values) - 1}", 'updatedRows': len(values)}}
+    
+    def _update(self, a1_range: str, values: List[List[str]]) -> Dict:
+        self._admit(len(values))
+        first, _ = self._row_span(a1_range)
+        with self._lock:
+            while len(self.rows) < first - 1 + len(values):
+                self.rows.append([])
+            self.rows[first - 1:first - 1 + len(values)] = values
+        return {'updatedRows': len(values)}
+    
+    def _get(self, a1_range: str) -> Dict:
+        self._admit()
+        first, last = self._row_span(a1_range)
+        with self._lock:
+            values = self.rows[first - 1:last]
+        # Like the API, leave out trailing empty rows
+        count = len(values)
+        while count and not any(values[count - 1]):
+            count -= 1
+        values = values[:count]
+        return {'values': values} if values else {}
+    
+    def _row_span(self, a1_range: str) -> Tuple[int, int]:
+        """First and last 1-based row of an A1 range (columns are ignored)"""
+        match = _ROW_RANGE.search(a1_range.split('!')[-1])
+        if not match:
+            return 1, len(self.rows)
+        first = int(match.group(1))
+        return first, int(match.group(2)) if match.group(2) else first
@@ -0,0 +1,123 @@
+"""
+Module for matching skills from a taxonomy against resume text in a single pass
+"""
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Union
+
+# Default taxonomy used when no taxonomy file is configured
+DEFAULT_SKILLS = [
+    'Python', 'Java', 'JavaScript', 'C++', 'C#', 'SQL', 'HTML', 'CSS',
+    'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'AWS', 'Azure',
+    'Machine Learning', 'Data Analysis', 'Git', 'Docker', 'Kubernetes',
+    'REST API', 'GraphQL', 'MongoDB', 'PostgreSQL', 'MySQL'
+]
+
+# A match must not be glued to a preceding letter/digit ("MySQL" is not "SQL")
+# or a following letter ("JavaScript" is not "Java"); trailing digits are
+# allowed so version suffixes like "HTML5" or "Python3" still count
+_BEFORE_CHARS = r'a-z0-9'
+_AFTER_CHARS = r'a-z'
+
+
+class SkillMatcher:
+    """
+    Match skills and their synonyms against text with one compiled regex
+    
+    The regex is built once from a trie of all lowercased terms, so a lookup
+    lowercases the text once and scans it once regardless of taxonomy size.
+    """
+    
+    def __init__(self, taxonomy: Optional[Union[Dict[str, List[str]], Iterable[str]]] = None):
+        """
+        Initialize the matcher
+        
+        Args:
+            taxonomy: Mapping of canonical skill -> synonyms, or a plain list of
+                skills. Defaults to DEFAULT_SKILLS.
+        """
+        if taxonomy is None:
+            taxonomy = DEFAULT_SKILLS
+        if not isinstance(taxonomy, dict):
+            taxonomy = {skill: [] for skill in taxonomy}
+        
+        # Canonical skills keep the taxonomy order so output stays stable
+        self.skills: List[str] = list(taxonomy.keys())
+        self._rank = {skill: i for i, skill in enumerate(self.skills)}
+        self._term_to_skill: Dict[str, str] = {}
+        for skill, synonyms in taxonomy.items():
+            for term in [skill] + list(synonyms or []):
+                term = term.strip().lower()
+                if term:
+                    self._term_to_skill.setdefault(term, skill)
+        
+        self.pattern: Optional[Pattern] = self._compile(self._term_to_skill.keys())
+    
+    @classmethod
+    def from_file(cls, file_path: str) -> 'SkillMatcher':
+        """
+        Load a taxonomy from a file
+        
+        Supported formats:
+            .json - {"Skill": ["synonym", ...]} or ["Skill", ...]
+            other - one skill per line, optional synonyms after ':' separated
+                    by commas; blank lines and lines starting with '#' are skipped
+        """
+        with open(file_path, 'r', encoding='utf-8') as file:
+            if file_path.lower().endswith('.json'):
+                return cls(json.load(file))
+            
+            taxonomy: Dict[str, List[str]] = {}
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                skill, _, synonyms = line.partition(':')
+                taxonomy[skill.strip()] = [s.strip() for s in synonyms.split(',') if s.strip()]
+            return cls(taxonomy)
+    
+    @staticmethod
+    def _compile(terms: Iterable[str]) -> Optional[Pattern]:
+        """Compile all terms into one boundary-aware, prefix-factored regex"""
+        trie: Dict = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = True
+        
+        if not trie:
+            return None
+        
+        body = SkillMatcher._trie_to_regex(trie)
+        return re.compile(rf'(?<![{_BEFORE_CHARS}])(?:{body})(?![{_AFTER_CHARS}])')
+    
+    @staticmethod
+    def _trie_to_regex(node: Dict) -> str:
+        """Convert a trie node into an alternation that prefers longer terms"""
+        is_end = '' in node
+        branches = [
+            re.escape(char) + SkillMatcher._trie_to_regex(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ''
+        
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if is_end else group
+    
+    def find(self, text: str) -> List[str]:
+        """Return canonical skills found in text, in taxonomy order"""
+        if not text or self.pattern is None:
+            return []
+        
+        # Deduplicate matched terms in C before mapping them to skills
+        lookup = self._term_to_skill
+        return self.sort({lookup[term] for term in set(self.pattern.findall(text.lower())) if term in lookup})
+    
+    def sort(self, skills: Iterable[str]) -> List[str]:
+        """Order canonical skills as they appear in the taxonomy"""
+        return sorted(skills, key=self._rank.__getitem__)
@@ -0,0 +1,317 @@
+"""
+Module for structured tracing of the processing pipeline
+Components report per-message spans (receive, extract, parse, upload) and
+events (progress and errors) to a Tracer, which forwards them to pluggable
+sinks. The default tracer only prints event messages to the console, as the
+components did before; use set_tracer() to send spans to a JSON log or a
+Prometheus metrics exporter, or NullSink to silence the console.
+"""
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+
+@dataclass
+class Span:
+    """A timed pipeline stage for one message"""
+    name: str
+    trace_id: Optional[str]
+    duration: float
+    start: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Event:
+    """A progress or error report from a component"""
+    name: str
+    message: str
+    level: str
+    timestamp: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+class NullSink:
+    """Sink that discards everything"""
+    receives_spans = False
+    receives_events = False
+    
+    def emit_span(self, span: Span) -> None:
+        pass
+    
+    def emit_event(self, event: Event) -> None:
+        pass
+
+
+class ConsoleSink(NullSink):
+    """Print event messages to stdout (the components' original output)"""
+    receives_events = True
+    
+    def emit_event(self, event: Event) -> None:
+        print(event.message)
+
+
+class JsonLogSink(NullSink):
+    """Write spans and events as one JSON object per line"""
+    receives_spans = True
+    receives_events = True
+    
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        Args:
+            stream: Text stream to write to (defaults to stderr)
+        """
+        self.stream = stream or sys.stderr
+        self._lock = threading.Lock()
+    
+    def emit_span(self, span: Span) -> None:
+        self._write({'type': 'span', 'name': span.name, 'trace_id': span.trace_id, 'start': span.start,
+                     'duration_ms': round(span.duration * 1000, 3), **span.attributes})
+    
+    def emit_event(self, event: Event) -> None:
+        self._write({'type': 'event', 'name': event.name, 'level': event.level, 'timestamp': event.timestamp,
+                     'message': event.message, **event.attributes})
+    
+    def _write(self, record: Dict) -> None:
+        line = json.dumps(record, default=str) + '\n'
+        with self._lock:
+            self.stream.write(line)
+
+
+class PrometheusSink(NullSink):
+    """Aggregate spans and events into metrics rendered in the Prometheus text format"""
+    receives_spans = True
+    receives_events = True
+    
+    BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    
+    def __init__(self, prefix: str = 'cv'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._durations: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._sizes: Dict[str, int] = {}
+        self._statuses: Dict[Tuple[str, str], int] = {}
+        self._events: Dict[Tuple[str, str], int] = {}
+    
+    def emit_span(self, span: Span) -> None:
+        with self._lock:
+            counts = self._durations.setdefault(span.name, [0] * (len(self.BUCKETS) + 1))
+            for i, bound in enumerate(self.BUCKETS):
+                if span.duration <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[span.name] = self._sums.get(span.name, 0.0) + span.duration
+            if 'size' in span.attributes:
+                self._sizes[span.name] = self._sizes.get(span.name, 0) + span.attributes['size']
+            if 'status' in span.attributes:
+                key = (span.name, str(span.attributes['status']))
+                self._statuses[key] = self._statuses.get(key, 0) + 1
+    
+    def emit_event(self, event: Event) -> None:
+        with self._lock:
+            key = (event.name, event.level)
+            self._events[key] = self._events.get(key, 0) + 1
+    
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format"""
+        p = self.prefix
+        lines = [f'# HELP {p}_span_duration_seconds Duration of pipeline stages',
+                 f'# TYPE {p}_span_duration_seconds histogram']
+        with self._lock:
+            for name, counts in sorted(self._durations.items()):
+                cumulative = 0
+                for bound, count in zip(self.BUCKETS + (float('inf'),), counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{p}_span_duration_seconds_bucket{{span="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{p}_span_duration_seconds_sum{{span="{name}"}} {self._sums[name]:.6f}')
+                lines.append(f'{p}_span_duration_seconds_count{{span="{name}"}} {cumulative}')
+            
+            lines += [f'# HELP {p}_span_size_total Characters or bytes handled per stage',
+                      f'# TYPE {p}_span_size_total counter']
+            lines += [f'{p}_span_size_total{{span="{name}"}} {size}' for name, size in sorted(self._sizes.items())]
+            
+            lines += [f'# HELP {p}_span_status_total Finished spans by status',
+                      f'# TYPE {p}_span_status_total counter']
+            lines += [f'{p}_span_status_total{{span="{name}",status="{status}"}} {count}'
+                      for (name, status), count in sorted(self._statuses.items())]
+            
+            lines += [f'# HELP {p}_events_total Component events by level',
+                      f'# TYPE {p}_events_total counter']
+            lines += [f'{p}_events_total{{event="{name}",level="{level}"}} {count}'
+                      for (name, level), count in sorted(self._events.items())]
+        return '\n'.join(lines) + '\n'
+    
+    def write(self, output_file: str) -> None:
+        """Atomically write the metrics, e.g. for a node_exporter textfile collector"""
+        temp_file = output_file + '.tmp'
+        with open(temp_file, 'w') as f:
+            f.write(self.render())
+        os.replace(temp_file, output_file)
+
+
+class Tracer:
+    """Forward spans and events to sinks, with optional sampled cProfile runs"""
+    
+    def __init__(self, sinks: Optional[List[NullSink]] = None, profile_sample_rate: float = 0.0,
+                 profile_dir: Optional[str] = None, max_profiles: int = 100):
+        """
+        Initialize the tracer
+        
+        Args:
+            sinks: Destinations for spans and events (defaults to a ConsoleSink)
+            profile_sample_rate: Fraction of profile() blocks run under cProfile (0 disables)
+            profile_dir: Directory where each sampled profile is dumped as <trace_id>.prof
+            max_profiles: Number of recent sampled profiles kept in memory
+        """
+        self.sinks = list(sinks) if sinks is not None else [ConsoleSink()]
+        self._span_sinks = [sink for sink in self.sinks if sink.receives_spans]
+        self._event_sinks = [sink for sink in self.sinks if sink.receives_events]
+        self.profile_sample_rate = profile_sample_rate
+        self.profile_dir = profile_dir
+        self.profiles = deque(maxlen=max_profiles)
+        self._profile_lock = threading.Lock()
+    
+    @property
+    def traces_spans(self) -> bool:
+        """True if any sink receives spans (callers can skip building attributes otherwise)"""
+        return bool(self._span_sinks)
+    
+    @property
+    def traces_events(self) -> bool:
+        """True if any sink receives events (callers can skip formatting messages otherwise)"""
+        return bool(self._event_sinks)
+    
+    def record_span(self, name: str, trace_id: Optional[str], duration: float, **attributes: Any) -> None:
+        """Report a stage that has already been timed (e.g. in a worker process)"""
+        if not self._span_sinks:
+            return
+        span = Span(name, trace_id, duration, time.time() - duration, attributes)
+        for sink in self._span_sinks:
+            sink.emit_span(span)
+    
+    @contextmanager
+    def span(self, name: str, trace_id: Optional[str] = None, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """Time a block; the yielded dict can be filled with attributes such as size or status"""
+        start = time.perf_counter()
+        try:
+            yield attributes
+        finally:
+            self.record_span(name, trace_id, time.perf_counter() - start, **attributes)
+    
+    def event(self, name: str, message: str, level: str = 'info', **attributes: Any) -> None:
+        """Report progress or an error"""
+        if not self._event_sinks:
+            return
+        event = Event(name, message, level, time.time(), attributes)
+        for sink in self._event_sinks:
+            sink.emit_event(event)
+    
+    def sample_profile(self) -> bool:
+        """Decide whether to profile one message, at profile_sample_rate"""
+        return self.profile_sample_rate > 0 and random.random() < self.profile_sample_rate
+    
+    @contextmanager
+    def profile(self, trace_id: Optional[str] = None) -> Iterator[None]:
+        """
+        Run a block under cProfile for a sampled fraction of calls
+        Only one block is profiled at a time; overlapping calls run unprofiled.
+        """
+        if not self.sample_profile() or not self._profile_lock.acquire(blocking=False):
+            yield
+            return
+        
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            if not _enable(profiler):
+                yield
+                return
+            try:
+                yield
+            finally:
+                profiler.disable()
+            self.add_profile(trace_id, profiler)
+        finally:
+            self._profile_lock.release()
+    
+    def add_profile(self, trace_id: Optional[str], profile: Any, name: Optional[str] = None) -> None:
+        """
+        Keep a profile and dump it to profile_dir as <name or trace_id>.prof
+        profile is a cProfile.Profile or the raw statistics returned by
+        run_profiled (e.g. from a worker process); None is ignored.
+        """
+        if profile is None:
+            return
+        import pstats
+        stats = pstats.Stats(profile if hasattr(profile, 'create_stats') else _RawProfile(profile))
+        self.profiles.append((trace_id, stats))
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = os.path.join(self.profile_dir, f'{name or trace_id or int(time.time() * 1000)}.prof')
+            stats.dump_stats(path)
+            self.event('profile', f"Profile written to {path}", trace_id=trace_id, path=path)
+
+
+class _RawProfile:
+    """Raw cProfile statistics in the form pstats.Stats loads from a Profile"""
+    
+    def __init__(self, stats: Dict):
+        self.stats = stats
+    
+    def create_stats(self) -> None:
+        pass
+
+
+def _enable(profiler: Any) -> bool:
+    """Start a cProfile.Profile, or return False if another profiler is active"""
+    try:
+        profiler.enable()
+        return True
+    except ValueError:
+        # Python 3.12+ allows only one active profiler per process
+        return False
+
+
+def run_profiled(function: Any, *args: Any) -> Tuple[Any, Optional[Dict]]:
+    """
+    Call function under cProfile and return (its result, the raw statistics)
+    The statistics are picklable, so work profiled in a pool worker can be
+    handed to Tracer.add_profile in the parent. They are None if another
+    profiler was already active.
+    """
+    import cProfile
+    profiler = cProfile.Profile()
+    if not _enable(profiler):
+        return function(*args), None
+    try:
+        result = function(*args)
+    finally:
+        profiler.disable()
+    profiler.create_stats()
+    return result, profiler.stats
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer used by the pipeline components"""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """Replace the process-wide tracer and return the previous one"""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
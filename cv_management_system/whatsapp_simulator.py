@@ -2,9 +2,18 @@
 Module for simulating WhatsApp message reception
 In production, this would use WhatsApp Business API or Twilio
 """
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from collections import deque
+from dataclasses import asdict, dataclass
 from datetime import datetime
+import hashlib
+import time
+
+from durable_queue import DurableQueue
+from tracing import get_tracer
+
+# What simulate_message_receipt does when the queue is full
+OVERFLOW_POLICIES = ('reject', 'drop_oldest')
 
 @dataclass
 class WhatsAppMessage:
@@ -15,10 +24,21 @@ class WhatsAppMessage:
     file_path: Optional[str] = None
     file_type: Optional[str] = None
     timestamp: Optional[str] = None
+    message_id: Optional[str] = None
     
     def __post_init__(self):
         if not self.timestamp:
             self.timestamp = datetime.now().isoformat()
+    
+    def idempotency_key(self) -> str:
+        """The message id if set, otherwise a hash of sender, time and content"""
+        if self.message_id:
+            return self.message_id
+        digest = hashlib.sha256()
+        for part in (self.sender_id, self.timestamp, self.message_text, self.file_path):
+            digest.update((part or '').encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
 
 
 class WhatsAppSimulator:
@@ -27,42 +47,239 @@ class WhatsAppSimulator:
     In production, this would integrate with WhatsApp Business API
     """
     
-    def __init__(self):
-        """Initialize the WhatsApp simulator"""
-        self.message_queue = []
-        self.processed_messages = []
+    def __init__(self, max_queue_size: Optional[int] = None, overflow_policy: str = 'reject',
+                 history_size: int = 1000, queue_path: Optional[str] = None,
+                 visibility_timeout: float = 60.0, prefetch: int = 100, ack_batch_size: int = 100):
+        """
+        Initialize the WhatsApp simulator
+        
+        Args:
+            max_queue_size: Maximum number of pending messages (None for unbounded)
+            overflow_policy: 'reject' refuses new messages when the queue is full
+                             (backpressure), 'drop_oldest' evicts the oldest pending one
+            history_size: Number of recently processed messages kept in processed_messages
+            queue_path: SQLite file of a DurableQueue to use instead of the in-memory
+                        queue; unacknowledged messages are replayed after a crash
+            visibility_timeout: Seconds before a message taken from the durable
+                                queue but not acknowledged is handed out again
+            prefetch: Messages leased from the durable queue at a time by
+                      get_next_message; leases of messages not yet acknowledged
+                      are renewed once half the visibility timeout has passed
+            ack_batch_size: Acknowledgements buffered before they are written
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        if max_queue_size is not None and max_queue_size < 1:
+            raise ValueError(f"max_queue_size must be at least 1, got {max_queue_size}")
+        if queue_path and max_queue_size is not None:
+            raise ValueError("max_queue_size is not supported with a durable queue")
+        
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.message_queue = deque()
+        self.processed_messages = deque(maxlen=history_size)
+        
+        self.processed_count = 0
+        self.dropped_count = 0
+        
+        self.durable_queue = DurableQueue(queue_path, visibility_timeout) if queue_path else None
+        self.visibility_timeout = visibility_timeout
+        self.prefetch = prefetch
+        self.ack_batch_size = ack_batch_size
+        self._receipts: Dict[str, int] = {}
+        self._pending_acks: List[Tuple[int, str]] = []
+        self._renewed_at = time.monotonic()
     
     def simulate_message_receipt(self, message: WhatsAppMessage) -> bool:
-        """Add a simulated WhatsApp message to the queue"""
-        self.message_queue.append(message)
-        print(f"[WhatsApp Simulator] Received message from {message.sender_name}")
+        """
+        Add a simulated WhatsApp message to the queue
+        Returns False if the message was rejected because the queue is full
+        """
+        if self.max_queue_size is not None and len(self.message_queue) >= self.max_queue_size:
+            self.dropped_count += 1
+            if self.overflow_policy == 'reject':
+                get_tracer().event('whatsapp.rejected',
+                                   f"[WhatsApp Simulator] Queue full, rejected message from {message.sender_name}",
+                                   level='warning', sender_id=message.sender_id)
+                return False
+            dropped = self.message_queue.popleft()
+            get_tracer().event('whatsapp.dropped',
+                               f"[WhatsApp Simulator] Queue full, dropped message from {dropped.sender_name}",
+                               level='warning', sender_id=dropped.sender_id)
+        
+        tracer = get_tracer()
+        if self.durable_queue is not None:
+            message.message_id = message.idempotency_key()
+            if not self.durable_queue.put(asdict(message), message.message_id):
+                tracer.event('whatsapp.duplicate',
+                             f"[WhatsApp Simulator] Ignored repeated delivery from {message.sender_name}",
+                             sender_id=message.sender_id, message_id=message.message_id)
+                return False
+        else:
+            self.message_queue.append(message)
+        tracer.event('whatsapp.received', f"[WhatsApp Simulator] Received message from {message.sender_name}",
+                     sender_id=message.sender_id)
         if message.file_path:
-            print(f"[WhatsApp Simulator] File attachment: {message.file_path}")
+            tracer.event('whatsapp.attachment', f"[WhatsApp Simulator] File attachment: {message.file_path}",
+                         sender_id=message.sender_id, file_path=message.file_path)
         return True
     
+    def simulate_message_receipts(self, messages: List[WhatsAppMessage]) -> int:
+        """
+        Add several messages and return how many were queued
+        With a durable queue they are written in a single transaction.
+        """
+        if self.durable_queue is None:
+            return sum(self.simulate_message_receipt(message) for message in messages)
+        
+        for message in messages:
+            message.message_id = message.idempotency_key()
+        added = self.durable_queue.put_many([(asdict(message), message.message_id) for message in messages])
+        get_tracer().event('whatsapp.received', f"[WhatsApp Simulator] Received {added} messages", count=added)
+        return added
+    
     def get_next_message(self) -> Optional[WhatsAppMessage]:
-        """Get the next message from the queue"""
-        if self.message_queue:
-            message = self.message_queue.pop(0)
+        """
+        Get the next message from the queue
+        With a durable queue the message is leased, and must be passed to ack()
+        once handled or it is delivered again after the visibility timeout.
+        """
+        messages = self.get_next_messages(1, prefetch=self.prefetch)
+        return messages[0] if messages else None
+    
+    def get_next_messages(self, limit: int, prefetch: Optional[int] = None) -> List[WhatsAppMessage]:
+        """
+        Get up to limit messages from the queue
+        With a durable queue no more than max(limit, prefetch) messages are
+        leased ahead, so a caller that takes messages in windows it can work
+        on at once does not hold leases that expire while they wait.
+        """
+        if self.durable_queue is not None:
+            self.renew_leases()
+            if len(self.message_queue) < limit:
+                wanted = max(limit, prefetch or 0) - len(self.message_queue)
+                for receipt, payload in self.durable_queue.lease(wanted):
+                    message = WhatsAppMessage(**payload)
+                    self._receipts[message.message_id] = receipt
+                    self.message_queue.append(message)
+        
+        messages = []
+        while self.message_queue and len(messages) < limit:
+            message = self.message_queue.popleft()
             self.processed_messages.append(message)
-            return message
-        return None
+            self.processed_count += 1
+            messages.append(message)
+        return messages
+    
+    def renew_leases(self, force: bool = False) -> None:
+        """
+        Extend the leases of messages taken but not yet acknowledged
+        Without force this only happens once half the visibility timeout has
+        passed since the last renewal.
+        """
+        now = time.monotonic()
+        if self.durable_queue is None or (not force and now - self._renewed_at < self.visibility_timeout / 2):
+            return
+        self._renewed_at = now
+        receipts = list(self._receipts.values()) + [receipt for receipt, _ in self._pending_acks]
+        if receipts:
+            self.durable_queue.extend(receipts)
+    
+    async def stream_messages(self, poll_interval: Optional[float] = None) -> AsyncIterator[WhatsAppMessage]:
+        """
+        Yield queued messages as an async message source
+        
+        Args:
+            poll_interval: If set, keep waiting for new messages, checking every
+                           poll_interval seconds; otherwise stop once the queue is empty
+        """
+        import asyncio
+        while True:
+            message = self.get_next_message()
+            if message:
+                yield message
+                # Let other tasks run between messages
+                await asyncio.sleep(0)
+            elif poll_interval is None:
+                return
+            else:
+                await asyncio.sleep(poll_interval)
+    
+    def ack(self, message: WhatsAppMessage) -> None:
+        """
+        Acknowledge a handled message so it is not replayed
+        Acknowledgements are written in batches of ack_batch_size (see flush_acks).
+        """
+        if self.durable_queue is None:
+            return
+        receipt = self._receipts.pop(message.message_id, None)
+        if receipt is not None:
+            self._pending_acks.append((receipt, message.message_id))
+            if len(self._pending_acks) >= self.ack_batch_size:
+                self.flush_acks()
+    
+    def release(self, messages: List[WhatsAppMessage]) -> None:
+        """Return taken but unhandled messages to the front of the queue so they are delivered again"""
+        # They are counted again when they are taken again
+        self.processed_count -= len(messages)
+        for message in messages:
+            try:
+                self.processed_messages.remove(message)
+            except ValueError:
+                pass
+        if self.durable_queue is None:
+            self.message_queue.extendleft(reversed(messages))
+            return
+        receipts = [self._receipts.pop(message.message_id) for message in messages
+                    if message.message_id in self._receipts]
+        if receipts:
+            self.durable_queue.release(receipts)
+    
+    def flush_acks(self) -> None:
+        """Write buffered acknowledgements"""
+        if self.durable_queue is not None and self._pending_acks:
+            receipts, keys = zip(*self._pending_acks)
+            self.durable_queue.ack(receipts, keys)
+            self._pending_acks = []
+    
+    def is_processed(self, message: WhatsAppMessage) -> bool:
+        """True if the message's side effects were already applied (durable queue only)"""
+        return self.durable_queue is not None and self.durable_queue.is_processed(message.idempotency_key())
+    
+    def mark_processed(self, message: WhatsAppMessage) -> None:
+        """Record that the message's side effects were applied, so a replay skips them"""
+        if self.durable_queue is not None:
+            self.durable_queue.mark_processed(message.idempotency_key())
     
     def get_pending_messages(self) -> List[WhatsAppMessage]:
         """Get all pending messages"""
-        return self.message_queue.copy()
+        pending = list(self.message_queue)
+        if self.durable_queue is not None:
+            pending += [WhatsAppMessage(**payload) for payload in self.durable_queue.peek()]
+        return pending
     
     def clear_queue(self) -> None:
         """Clear the message queue"""
         self.message_queue.clear()
+        if self.durable_queue is not None:
+            self.durable_queue.purge()
+            self._receipts.clear()
     
     def get_statistics(self) -> Dict:
         """Get statistics about processed messages"""
-        return {
-            'pending_messages': len(self.message_queue),
-            'processed_messages': len(self.processed_messages),
-            'total_messages': len(self.message_queue) + len(self.processed_messages)
+        pending = len(self.message_queue)
+        stats = {
+            'pending_messages': pending,
+            'processed_messages': self.processed_count,
+            'dropped_messages': self.dropped_count,
         }
+        if self.durable_queue is not None:
+            queue_stats = self.durable_queue.get_statistics()
+            # Prefetched messages are still in flight in the durable queue
+            stats['pending_messages'] = pending = pending + queue_stats['pending']
+            stats['in_flight_messages'] = queue_stats['in_flight'] - len(self.message_queue)
+        stats['total_messages'] = pending + self.processed_count
+        return stats
 
 
 class WhatsAppMessageBuilder:
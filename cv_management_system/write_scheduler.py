@@ -0,0 +1,349 @@
+"""
+Module for rate-limit-aware scheduling of Google Sheets writes
+Rows are queued and appended in batches by one background thread that spends
+request tokens from a token bucket sized to the Sheets quota, backs off
+exponentially with jitter on 429 and 5xx responses, retries failed rows ahead
+of new ones and adapts the batch size to the observed request latency.
+"""
+from typing import Callable, Deque, Dict, List, Optional, Tuple, Type
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+import atexit
+import random
+import threading
+import time
+
+from google_sheets_handler import GoogleSheetsHandler
+from tracing import get_tracer
+
+
+def _transport_errors() -> Tuple[Type[Exception], ...]:
+    """Connection, socket and timeout errors, including httplib2's if it is installed"""
+    try:
+        from httplib2 import HttpLib2Error
+        return OSError, HttpLib2Error
+    except ImportError:
+        return OSError,
+
+
+# Errors without an HTTP status that are worth retrying (socket.timeout and
+# ConnectionError are OSErrors); anything else is a bug and fails the rows
+TRANSPORT_ERRORS = _transport_errors()
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at rate tokens per second up to capacity"""
+    
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self._updated = clock()
+    
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens and return 0, or return the seconds until they will be available"""
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+    
+    def drain(self) -> None:
+        """Drop all tokens, e.g. after the server reported the quota exhausted"""
+        self._refill()
+        self.tokens = 0.0
+
+
+@dataclass
+class _PendingRow:
+    """A queued row, the future its writer waits on and its failed attempts"""
+    row: List[str]
+    future: Future
+    attempts: int = 0
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    """HTTP status of an API error (googleapiclient HttpError or compatible), if any"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'resp', None), 'status', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(error: Exception, status: Optional[int]) -> bool:
+    """429 and 5xx responses and transport errors are retried"""
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(error, TRANSPORT_ERRORS)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from the Retry-After header of an API error, if present"""
+    resp = getattr(error, 'resp', None)
+    value = resp.get('retry-after') if hasattr(resp, 'get') else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class SheetWriteScheduler:
+    """
+    Append rows to a sheet within its request quota, retrying throttled and failed writes
+    
+    submit() queues a row and returns a Future that resolves to True once the
+    row is written or False once it is given up; append_row() waits for it, so
+    concurrent callers are batched into shared requests. Rows that exhaust
+    max_retries are kept in failed_rows.
+    
+    Appends are not idempotent: a request that times out after the server
+    committed it is retried and writes its rows twice. Readers of the sheet
+    should tolerate repeated rows (the timestamp and email identify them).
+    """
+    
+    def __init__(self, handler: GoogleSheetsHandler, requests_per_minute: float = 60.0,
+                 burst: Optional[int] = None, initial_batch: int = 10, min_batch: int = 1,
+                 max_batch: int = 500, target_latency: float = 2.0, max_retries: int = 8,
+                 base_delay: float = 1.0, max_delay: float = 64.0, seed: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the scheduler and start its writer thread
+        
+        Args:
+            handler: GoogleSheetsHandler whose request_append does the writes
+            requests_per_minute: Write request quota (Sheets allows 60 per minute per user by default)
+            burst: Requests that may be sent back to back (defaults to a tenth of the quota, at least 1)
+            initial_batch: Rows per request to start with
+            min_batch: Smallest batch size the adaptation shrinks to
+            max_batch: Largest batch size the adaptation grows to
+            target_latency: Batches shrink when a request takes longer than this many seconds
+                            and grow while requests are faster and batches are full
+            max_retries: Retries of a row before it is given up
+            base_delay: First backoff delay in seconds; it doubles per consecutive failure
+            max_delay: Cap of the backoff delay
+            seed: Seed of the backoff jitter
+            clock: Time source (injectable for tests)
+            sleep: Used to wait for tokens and backoff (injectable for tests)
+        """
+        self.handler = handler
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.batch_size = max(min_batch, min(initial_batch, max_batch))
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sleep = sleep
+        self.bucket = TokenBucket(requests_per_minute / 60.0,
+                                  burst or max(1, int(requests_per_minute // 10)), clock)
+        self.failed_rows: Deque[List[str]] = deque(maxlen=1000)
+        self.stats = {'requests': 0, 'rows_written': 0, 'throttled': 0, 'server_errors': 0,
+                      'other_errors': 0, 'retries': 0, 'rows_failed': 0}
+        
+        self._rng = random.Random(seed)
+        self._queue: Deque[_PendingRow] = deque()
+        self._retries: Deque[_PendingRow] = deque()
+        self._failures = 0
+        self._resume_at = 0.0
+        self._closing = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def submit(self, row_data: List[str]) -> Future:
+        """Queue a row; the returned Future resolves to whether it was written"""
+        pending = _PendingRow(row_data, Future())
+        with self._condition:
+            if self._closing:
+                raise RuntimeError("SheetWriteScheduler is closed")
+            self._queue.append(pending)
+            self._condition.notify()
+        return pending.future
+    
+    def append_row(self, row_data: List[str], timeout: Optional[float] = None) -> bool:
+        """Queue a row and wait until it is written or given up (see wait for the timeout)"""
+        return self.wait(self.submit(row_data), timeout)
+    
+    @staticmethod
+    def wait(future: Future, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a submitted row; False if it was given up or not written within timeout
+        A row that times out before it is sent is cancelled; one that is
+        already being sent or retried may still be written afterwards.
+        """
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            return False
+    
+    def pending(self) -> int:
+        """Rows queued or waiting to be retried"""
+        with self._condition:
+            return len(self._queue) + len(self._retries)
+    
+    def get_statistics(self) -> Dict:
+        """Request, retry and row counters and the current batch size"""
+        with self._condition:
+            return {**self.stats, 'batch_size': self.batch_size, 'pending': len(self._queue) + len(self._retries)}
+    
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """
+        Write or give up every queued row, then stop the writer thread
+        Rows still queued after timeout seconds are given up.
+        """
+        with self._condition:
+            if self._closing:
+                return
+            self._closing = True
+            self._condition.notify()
+        atexit.unregister(self.close)
+        if self._thread is threading.current_thread():
+            return
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            return
+        
+        with self._condition:
+            given_up = list(self._retries) + list(self._queue)
+            self._retries.clear()
+            self._queue.clear()
+            self.stats['rows_failed'] += len(given_up)
+            self.failed_rows.extend(pending.row for pending in given_up)
+        if given_up:
+            get_tracer().event('sheets.error', f"Giving up on {len(given_up)} rows still queued at close",
+                               level='error', rows=len(given_up))
+        for pending in given_up:
+            if not pending.future.done():
+                pending.future.set_result(False)
+    
+    def _run(self) -> None:
+        """Writer loop: wait for rows, a token and the end of any backoff, then send a batch"""
+        while True:
+            with self._condition:
+                while not self._queue and not self._retries and not self._closing:
+                    self._condition.wait()
+                if not self._queue and not self._retries:
+                    return
+            
+            wait = self._resume_at - self.clock()
+            if wait <= 0:
+                wait = self.bucket.try_acquire()
+            if wait > 0:
+                self.sleep(wait)
+                continue
+            
+            with self._condition:
+                batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._send(batch)
+            except Exception as e:
+                # Keep the writer alive whatever went wrong (e.g. a failing event sink)
+                self._fail(batch, e)
+    
+    def _next_batch(self) -> List[_PendingRow]:
+        """
+        Take up to batch_size rows, retries first so rows keep their order
+        New rows are marked running, and skipped if their writer cancelled them.
+        """
+        batch = []
+        while self._retries and len(batch) < self.batch_size:
+            batch.append(self._retries.popleft())
+        while self._queue and len(batch) < self.batch_size:
+            pending = self._queue.popleft()
+            if pending.future.set_running_or_notify_cancel():
+                batch.append(pending)
+        return batch
+    
+    def _fail(self, batch: List[_PendingRow], error: Exception) -> None:
+        """Fail the rows of a batch whose handling raised, unless already resolved or requeued"""
+        with self._condition:
+            requeued = {id(pending) for pending in self._retries}
+            failed = [pending for pending in batch
+                      if not pending.future.done() and id(pending) not in requeued]
+            self.stats['rows_failed'] += len(failed)
+            self.failed_rows.extend(pending.row for pending in failed)
+        for pending in failed:
+            pending.future.set_exception(error)
+    
+    def _send(self, batch: List[_PendingRow]) -> None:
+        """Append one batch and resolve, retry or give up its rows"""
+        start = self.clock()
+        try:
+            self.handler.request_append([pending.row for pending in batch])
+        except Exception as e:
+            self._handle_error(batch, e)
+            return
+        latency = self.clock() - start
+        
+        with self._condition:
+            self.stats['requests'] += 1
+            self.stats['rows_written'] += len(batch)
+            self._failures = 0
+            if latency > self.target_latency:
+                self.batch_size = max(self.min_batch, self.batch_size // 2)
+            elif len(batch) >= self.batch_size:
+                self.batch_size = min(self.max_batch, self.batch_size * 2)
+        for pending in batch:
+            pending.future.set_result(True)
+    
+    def _handle_error(self, batch: List[_PendingRow], error: Exception) -> None:
+        """Back off and requeue the batch for retryable errors, give up on the rest"""
+        status = _error_status(error)
+        retryable = _is_retryable(error, status)
+        tracer = get_tracer()
+        
+        with self._condition:
+            self.stats['requests'] += 1
+            if status == 429:
+                self.stats['throttled'] += 1
+                # The server says the quota is used up, whatever the bucket thinks
+                self.bucket.drain()
+            elif status is not None and status >= 500:
+                self.stats['server_errors'] += 1
+                # Large requests are more likely to time out on the server
+                self.batch_size = max(self.min_batch, self.batch_size // 2)
+            else:
+                self.stats['other_errors'] += 1
+            
+            given_up = []
+            if retryable:
+                self._failures += 1
+                delay = min(self.max_delay, self.base_delay * 2 ** (self._failures - 1))
+                delay = delay / 2 + self._rng.uniform(0, delay / 2)
+                delay = max(delay, _retry_after(error) or 0.0)
+                self._resume_at = self.clock() + delay
+                
+                retry = []
+                for pending in batch:
+                    pending.attempts += 1
+                    (retry if pending.attempts <= self.max_retries else given_up).append(pending)
+                self._retries.extendleft(reversed(retry))
+                self.stats['retries'] += len(retry)
+            else:
+                given_up = batch
+            self.stats['rows_failed'] += len(given_up)
+            self.failed_rows.extend(pending.row for pending in given_up)
+        
+        for pending in given_up:
+            pending.future.set_result(False)
+        if retryable:
+            tracer.event('sheets.backoff', f"Sheets write failed ({error}), retrying in {delay:.1f}s",
+                         level='warning', status=status, rows=len(batch), delay=round(delay, 3))
+        if given_up:
+            tracer.event('sheets.error', f"Giving up on {len(given_up)} rows: {error}", level='error',
+                         status=status, rows=len(given_up))
@@ -0,0 +1,20 @@
+"""
+Shared pytest setup: the package modules use flat imports, so the package
+directory is put on sys.path, and console events are silenced per test
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cv_management_system'))
+
+from tracing import NullSink, Tracer, set_tracer
+
+
+@pytest.fixture(autouse=True)
+def quiet_tracer():
+    """Discard component events so test output stays readable"""
+    previous = set_tracer(Tracer([NullSink()]))
+    yield
+    set_tracer(previous)
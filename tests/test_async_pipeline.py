@@ -0,0 +1,125 @@
+import asyncio
+import threading
+
+from async_cv_manager import AsyncCVManagementSystem
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3
+from whatsapp_simulator import WhatsAppMessage
+
+
+def _system(tmp_path, **options):
+    return AsyncCVManagementSystem(executor='thread', workers=2, queue_path=str(tmp_path / 'queue.db'), **options)
+
+
+def _queued(system):
+    stats = system.whatsapp_sim.durable_queue.get_statistics()
+    return stats['pending'] + stats['in_flight']
+
+
+def test_results_keep_message_order_and_are_acked(tmp_path):
+    system = _system(tmp_path)
+    texts = [SAMPLE_RESUME_1, SAMPLE_RESUME_2, '', SAMPLE_RESUME_3]
+    for i, text in enumerate(texts):
+        system.receive_message(WhatsAppMessage(str(i), f"Sender {i}", text))
+    
+    results = asyncio.run(system.process_all_pending())
+    system.close()
+    assert [result['sender'] for result in results] == [f"Sender {i}" for i in range(4)]
+    assert [result['status'] for result in results] == ['success', 'success', 'failed', 'success']
+    assert system.stats.total == 4
+    assert _queued(system) == 0
+
+
+def test_repeats_in_flight_wait_for_the_first_submission(tmp_path):
+    system = _system(tmp_path)
+    for i, text in enumerate([SAMPLE_RESUME_1, SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_1]):
+        system.receive_message(WhatsAppMessage(str(i), 'S', text))
+    
+    results = asyncio.run(system.process_all_pending())
+    system.close()
+    assert [result['status'] for result in results] == ['success', 'duplicate', 'success', 'duplicate']
+    assert results[1]['extracted_data'] == results[0]['extracted_data']
+    assert len(system.sheets_handler.demo_data) == 2
+    assert system.stats.total == 4
+
+
+def test_each_message_is_acked_when_it_finishes(tmp_path):
+    system = _system(tmp_path)
+    system.whatsapp_sim.ack_batch_size = 1
+    release = threading.Event()
+    upload = system._upload_once
+    
+    def slow_upload(message, row_data, trace_id=None):
+        if message.sender_id == 'slow':
+            release.wait(10)
+        return upload(message, row_data, trace_id)
+    
+    system._upload_once = slow_upload
+    system.receive_message(WhatsAppMessage('slow', 'Slow', SAMPLE_RESUME_1))
+    system.receive_message(WhatsAppMessage('fast', 'Fast', SAMPLE_RESUME_2))
+    
+    async def run():
+        pipeline = asyncio.create_task(system.process_all_pending())
+        for _ in range(500):
+            if system.stats.total:
+                break
+            await asyncio.sleep(0.01)
+        finished_early = system.stats.total, _queued(system)
+        release.set()
+        return finished_early, await pipeline
+    
+    (total, queued), results = asyncio.run(run())
+    system.close()
+    assert (total, queued) == (1, 1)
+    assert [result['status'] for result in results] == ['success', 'success']
+    assert _queued(system) == 0
+
+
+def test_polling_records_without_collecting_and_flushes_acks_on_cancel(tmp_path):
+    system = _system(tmp_path)
+    for i, text in enumerate([SAMPLE_RESUME_1, SAMPLE_RESUME_2]):
+        system.receive_message(WhatsAppMessage(str(i), 'S', text))
+    
+    async def run():
+        pipeline = asyncio.create_task(system.process_all_pending(poll_interval=0.01))
+        for _ in range(500):
+            if system.stats.total == 2:
+                break
+            await asyncio.sleep(0.01)
+        pipeline.cancel()
+        await asyncio.gather(pipeline, return_exceptions=True)
+    
+    asyncio.run(run())
+    system.close()
+    assert system.stats.total == 2
+    assert _queued(system) == 0
+
+
+def _write_pdf(path, pages):
+    from reportlab.pdfgen import canvas
+    pdf = canvas.Canvas(str(path))
+    for lines in pages:
+        text = pdf.beginText(40, 800)
+        for line in lines:
+            text.textLine(line)
+        pdf.drawText(text)
+        pdf.showPage()
+    pdf.save()
+    return str(path)
+
+
+def test_attachments_follow_the_synchronous_page_cap(tmp_path, monkeypatch):
+    import cv_manager
+    from cv_manager import CVManagementSystem
+    monkeypatch.setattr(cv_manager, 'MAX_PDF_PAGES', 1)
+    path = _write_pdf(tmp_path / 'resume.pdf', [SAMPLE_RESUME_1.strip().split('\n')[:20],
+                                                ['SKILLS', 'Rust, Terraform'], ['Page three']])
+    message = WhatsAppMessage('1', 'S', '', file_path=path)
+    
+    expected = CVManagementSystem(queue_path=None).process_incoming_message(message)
+    system = _system(tmp_path)
+    result = asyncio.run(system.process_incoming_message(message))
+    system.close()
+    assert result['status'] == expected['status'] == 'success'
+    assert result['extracted_data'] == expected['extracted_data']
+    assert result['message_content'] == expected['message_content']
+    assert 'Page three' not in result['message_content']
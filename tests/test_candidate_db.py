@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import pytest
+
+from candidate_db import CandidateDatabase
+
+
+def _candidate(name, email, phone, skills):
+    return {'full_name': name, 'email': email, 'phone': phone, 'education': 'B.Tech',
+            'skills': skills, 'experience': 'Engineer'}
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = CandidateDatabase(str(tmp_path / 'candidates.db'))
+    database.add_many([
+        _candidate('Ann', 'Ann@Example.com', '+91-98765 43210', 'Python, Kubernetes, PostgreSQL'),
+        _candidate('Bob', 'bob@example.com', '(555) 123-4567', 'Java, PostgreSQL'),
+        _candidate('Cy', 'Not specified', 'Not specified', 'Not specified'),
+    ], created_at=datetime(2024, 1, 10, 9, 0))
+    database.add(_candidate('Dee', 'dee@example.com', '555 000 1111', 'Kubernetes'),
+                 created_at=datetime(2024, 3, 1, 12, 0))
+    yield database
+    database.close()
+
+
+def _names(rows):
+    return [row['full_name'] for row in rows]
+
+
+def test_skill_queries(db):
+    assert _names(db.find_by_skills(['kubernetes', 'PostgreSQL'])) == ['Ann']
+    assert _names(db.find_by_skills(['Kubernetes', 'Java'], match='any')) == ['Ann', 'Bob', 'Dee']
+    assert _names(db.find_by_skills(['postgresql'], limit=1)) == ['Ann']
+    assert db.find_by_skills(['Rust']) == [] and db.find_by_skills([' ']) == []
+    with pytest.raises(ValueError):
+        db.find_by_skills(['Python'], match='some')
+
+
+def test_email_and_phone_lookups_ignore_formatting(db):
+    assert _names(db.find_by_email(' ann@example.COM ')) == ['Ann']
+    assert _names(db.find_by_phone('919876543210')) == ['Ann']
+    assert _names(db.find_by_phone('555-123-4567')) == ['Bob']
+    assert db.find_by_email('Not specified') == []
+
+
+def test_date_range(db):
+    assert _names(db.find_by_date_range(datetime(2024, 1, 1), datetime(2024, 1, 31))) == ['Ann', 'Bob', 'Cy']
+    assert _names(db.find_by_date_range(datetime(2024, 1, 10, 9, 0), datetime(2024, 12, 31), limit=2)) == \
+        ['Ann', 'Bob']
+    assert _names(db.find_by_date_range(datetime(2024, 2, 1), datetime(2024, 12, 31))) == ['Dee']
+
+
+def test_re_adding_a_candidate_updates_it(db, tmp_path):
+    first = db.find_by_email('bob@example.com')[0]
+    candidate_id = db.add(_candidate('Bob B', 'BOB@example.com', '(555) 123-4567', 'Java, Rust'),
+                          created_at=datetime(2024, 6, 1))
+    assert candidate_id == first['id'] and db.count() == 4
+    row, = db.find_by_email('bob@example.com')
+    assert row['full_name'] == 'Bob B' and row['created_at'] == first['created_at']
+    assert _names(db.find_by_skills(['Rust'])) == ['Bob B']
+    assert _names(db.find_by_skills(['PostgreSQL'])) == ['Ann']
+    
+    # Without an email the phone number identifies the candidate
+    db.add(_candidate('Eve', 'Not specified', '777 888 9999', 'Go'))
+    db.add(_candidate('Eve', 'Not specified', '(777) 888-9999', 'Go, Rust'))
+    assert db.count() == 5
+    
+    reopened = CandidateDatabase(db.db_path)
+    assert _names(reopened.find_by_skills(['rust', 'go'])) == ['Eve']
+    reopened.close()
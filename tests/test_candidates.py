@@ -0,0 +1,27 @@
+import json
+
+from candidate_store import CandidateRecord, CandidateStore
+from cv_manager import CVManagementSystem
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2
+from whatsapp_simulator import WhatsAppMessage
+
+
+def test_get_all_candidates_returns_json_ready_dicts():
+    system = CVManagementSystem()
+    for i, text in enumerate([SAMPLE_RESUME_1, SAMPLE_RESUME_2]):
+        system.process_incoming_message(WhatsAppMessage(str(i), 'S', text))
+    
+    candidates = system.get_all_candidates()
+    assert isinstance(candidates, list) and len(candidates) == 2
+    assert all(type(candidate) is dict for candidate in candidates)
+    assert json.loads(json.dumps(candidates)) == candidates
+    assert [record.to_dict() for record in system.iter_candidates()] == candidates
+    assert all(isinstance(record, CandidateRecord) for record in system.iter_candidates())
+
+
+def test_store_keeps_only_the_newest_records():
+    store = CandidateStore(max_records=2)
+    for name in ('A', 'B', 'C'):
+        store.add({'full_name': name})
+    assert [record['full_name'] for record in store] == ['B', 'C']
+    assert store.total_added == 3
@@ -0,0 +1,54 @@
+import pytest
+
+from data_extractor import LINE_CATEGORIES, ResumeDataExtractor
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3
+
+
+def _tagged(text):
+    index = ResumeDataExtractor().classify_lines(text)
+    return {category: [index.lines[i] for i in index.tags[category]] for category in LINE_CATEGORIES}
+
+
+def test_sample_resume_1_categories():
+    tagged = _tagged(SAMPLE_RESUME_1)
+    assert tagged['header'][0] == 'JOHN SMITH'
+    assert tagged['contact'] == ['john.smith@email.com | +91-9876543210']
+    assert tagged['education'] == ['B.Tech in Computer Science - Indian Institute of Technology (IIT) Delhi, 2018']
+    assert tagged['experience'][1:] == [
+        'EXPERIENCE',
+        'Senior Software Engineer - TechCorp Solutions (2021 - Present)',
+        '- Mentored 5+ junior developers',
+        'Software Engineer - WebDev Inc. (2019 - 2021)',
+        'Junior Developer - StartupXYZ (2018 - 2019)',
+    ]
+
+
+def test_sample_resume_2_categories():
+    tagged = _tagged(SAMPLE_RESUME_2)
+    assert tagged['header'] == ['Sarah Johnson']
+    assert tagged['contact'] == ['sarah.johnson@example.com']
+    assert tagged['education'] == [
+        'Master of Science in Data Science - University of California, Berkeley (2021)',
+        'Bachelor of Science in Statistics - Stanford University (2019)',
+    ]
+    assert 'PROFESSIONAL EXPERIENCE' in tagged['experience']
+    assert 'Data Analyst - Facebook (2020 - 2021)' in tagged['experience']
+
+
+def test_sample_resume_3_categories():
+    tagged = _tagged(SAMPLE_RESUME_3)
+    assert tagged['header'][0] == 'Priya Sharma'
+    assert tagged['contact'] == ['Email: priya.sharma@email.com']
+    assert tagged['education'] == ['Bachelor of Engineering (B.E) - Information Technology']
+    # A line can carry several tags
+    summary = [line for line in tagged['header'] if 'years of experience' in line]
+    assert summary and summary[0] in tagged['experience']
+
+
+@pytest.mark.parametrize('text', [SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3])
+def test_lines_are_split_once_and_headers_come_from_the_top(text):
+    index = ResumeDataExtractor().classify_lines(text)
+    assert index.lines == text.split('\n')
+    assert all(i < 10 for i in index.tags['header'])
+    for numbers in index.tags.values():
+        assert numbers == sorted(set(numbers))
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+import corpus_generator
+from corpus_generator import iter_resumes, write_corpus
+from file_processor import FileProcessor
+
+
+def test_resumes_are_deterministic_for_a_seed():
+    first = list(iter_resumes(25, seed=7, noise=0.2))
+    assert len(first) == 25
+    assert first == list(iter_resumes(25, seed=7, noise=0.2))
+    assert first != list(iter_resumes(25, seed=8, noise=0.2))
+    assert len(set(first)) > 1
+
+
+def test_a_shorter_run_is_a_prefix_of_a_longer_one():
+    assert list(iter_resumes(5, seed=3)) == list(iter_resumes(20, seed=3))[:5]
+
+
+@pytest.mark.parametrize('file_format', ['txt', 'docx', 'pdf'])
+def test_write_corpus_writes_the_requested_count(tmp_path, monkeypatch, file_format):
+    monkeypatch.setattr(corpus_generator, 'FILES_PER_DIRECTORY', 5)
+    count = 12
+    paths = list(write_corpus(str(tmp_path), count, file_format, seed=1))
+    assert len(paths) == len(set(paths)) == count
+    assert all(os.path.isfile(path) and path.endswith('.' + file_format) for path in paths)
+    assert all(FileProcessor.detect_file_type(path) == file_format for path in paths)
+    written = sorted(os.path.join(root, name) for root, _, names in os.walk(tmp_path) for name in names)
+    assert written == sorted(paths)
+    assert sorted(os.listdir(tmp_path)) == ['00000', '00001', '00002']
+
+
+def test_write_corpus_is_deterministic(tmp_path):
+    first = list(write_corpus(str(tmp_path / 'a'), 5, 'txt', seed=9))
+    second = list(write_corpus(str(tmp_path / 'b'), 5, 'txt', seed=9))
+    for a, b in zip(first, second):
+        with open(a, 'rb') as fa, open(b, 'rb') as fb:
+            assert fa.read() == fb.read()
+
+
+def test_write_corpus_rejects_unknown_formats(tmp_path):
+    with pytest.raises(ValueError):
+        list(write_corpus(str(tmp_path), 1, 'rtf'))
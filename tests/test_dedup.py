@@ -0,0 +1,57 @@
+import sqlite3
+
+import cv_manager
+from cv_manager import CVManagementSystem
+from dedup_cache import DedupCache
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2
+from whatsapp_simulator import WhatsAppMessage
+
+
+def test_key_is_content_hash():
+    assert DedupCache.key_for(message_text='a') == DedupCache.key_for(message_text='a')
+    assert DedupCache.key_for(message_text='a') != DedupCache.key_for(message_text='b')
+
+
+def test_repeat_submission_is_served_from_cache():
+    system = CVManagementSystem()
+    first = system.process_incoming_message(WhatsAppMessage('1', 'A', SAMPLE_RESUME_1))
+    repeat = system.process_incoming_message(WhatsAppMessage('2', 'B', SAMPLE_RESUME_1))
+    assert first['status'] == 'success'
+    assert repeat['status'] == 'duplicate'
+    assert repeat['extracted_data'] == first['extracted_data']
+    assert len(system.sheets_handler.demo_data) == 1
+    assert system.get_processing_summary()['dedup_cache']['hits'] == 1
+
+
+def test_repeats_within_a_parallel_batch_are_processed_once():
+    system = CVManagementSystem()
+    for i, text in enumerate([SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_1]):
+        system.receive_message(WhatsAppMessage(str(i), 'S', text))
+    results = system.process_all_pending(workers=2, executor='thread')
+    assert [r['status'] for r in results] == ['success', 'success', 'duplicate']
+    assert len(system.sheets_handler.demo_data) == 2
+
+
+def test_cache_errors_degrade_to_a_miss():
+    system = CVManagementSystem()
+    
+    def broken(*args):
+        raise sqlite3.OperationalError('disk I/O error')
+    
+    system.dedup_cache.get = broken
+    system.dedup_cache.put = broken
+    result = system.process_incoming_message(WhatsAppMessage('1', 'A', SAMPLE_RESUME_1))
+    assert result['status'] == 'success'
+
+
+def test_oversized_attachment_is_not_hashed(tmp_path, monkeypatch):
+    path = tmp_path / 'big.txt'
+    path.write_text(SAMPLE_RESUME_1)
+    monkeypatch.setattr(cv_manager, 'MAX_FILE_SIZE', 10)
+    system = CVManagementSystem()
+    
+    def fail(**kwargs):
+        raise AssertionError('oversized file was read for hashing')
+    
+    monkeypatch.setattr(system.dedup_cache, 'key_for', fail)
+    assert system._cache_key(WhatsAppMessage('1', 'A', '', file_path=str(path))) is None
@@ -0,0 +1,110 @@
+import time
+
+from cv_manager import CVManagementSystem
+from durable_queue import DurableQueue
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2
+from whatsapp_simulator import WhatsAppMessage, WhatsAppSimulator
+
+
+def _queue(tmp_path, **options):
+    return DurableQueue(str(tmp_path / 'queue.db'), **options)
+
+
+def test_leased_messages_are_hidden_until_the_lease_expires(tmp_path):
+    queue = _queue(tmp_path, visibility_timeout=0.2)
+    queue.put_many([({'n': i}, f"k{i}") for i in range(3)])
+    assert [payload for _, payload in queue.lease(2)] == [{'n': 0}, {'n': 1}]
+    assert [payload for _, payload in queue.lease(5)] == [{'n': 2}]
+    assert queue.lease(5) == []
+    time.sleep(0.25)
+    assert [payload for _, payload in queue.lease(5)] == [{'n': 0}, {'n': 1}, {'n': 2}]
+
+
+def test_extend_and_release(tmp_path):
+    queue = _queue(tmp_path, visibility_timeout=0.2)
+    queue.put({'n': 0}, 'k0')
+    queue.put({'n': 1}, 'k1')
+    (first, _), (second, _) = queue.lease(2)
+    time.sleep(0.1)
+    queue.extend([first])
+    queue.release([second])
+    time.sleep(0.15)
+    # The first lease was extended past its original expiry, the second released at once
+    assert [payload for _, payload in queue.lease(5)] == [{'n': 1}]
+    assert queue.get_statistics() == {'pending': 0, 'in_flight': 2, 'processed': 0}
+
+
+def test_acked_keys_are_not_enqueued_again(tmp_path):
+    queue = _queue(tmp_path)
+    assert queue.put({'n': 0}, 'k0')
+    assert not queue.put({'n': 0}, 'k0')
+    (receipt, _), = queue.lease(1)
+    queue.ack([receipt], ['k0'])
+    assert queue.is_processed('k0')
+    assert not queue.put({'n': 0}, 'k0')
+    assert queue.get_statistics() == {'pending': 0, 'in_flight': 0, 'processed': 1}
+    assert queue.prune_processed(older_than=-1) == 1
+    assert queue.put({'n': 0}, 'k0')
+
+
+def test_simulator_leases_only_the_requested_window(tmp_path):
+    simulator = WhatsAppSimulator(queue_path=str(tmp_path / 'queue.db'), prefetch=100)
+    for i in range(10):
+        simulator.simulate_message_receipt(WhatsAppMessage(str(i), 'S', f"text {i}"))
+    assert len(simulator.get_next_messages(3)) == 3
+    assert simulator.durable_queue.get_statistics()['in_flight'] == 3
+    assert simulator.get_next_message() is not None
+    assert simulator.durable_queue.get_statistics()['in_flight'] == 10
+
+
+def test_held_leases_are_renewed(tmp_path):
+    simulator = WhatsAppSimulator(queue_path=str(tmp_path / 'queue.db'), visibility_timeout=0.2)
+    simulator.simulate_message_receipt(WhatsAppMessage('1', 'S', 'text'))
+    simulator.simulate_message_receipt(WhatsAppMessage('2', 'S', 'text 2'))
+    first = simulator.get_next_message()
+    time.sleep(0.15)
+    # Half the timeout has passed, so taking the next message renews the first lease
+    assert simulator.get_next_message() is not None
+    time.sleep(0.1)
+    assert simulator.durable_queue.lease(5) == []
+    simulator.ack(first)
+    simulator.flush_acks()
+    assert simulator.durable_queue.get_statistics()['in_flight'] == 1
+
+
+def _crash_after_upload(tmp_path, text):
+    """Process a message but stop before its ack, with a lease that has already expired"""
+    system = CVManagementSystem(queue_path=str(tmp_path / 'queue.db'))
+    system.whatsapp_sim.durable_queue.visibility_timeout = 0
+    system.receive_message(WhatsAppMessage('1', 'S', text))
+    message = system.whatsapp_sim.get_next_message()
+    assert system.process_incoming_message(message)['status'] == 'success'
+    return CVManagementSystem(queue_path=str(tmp_path / 'queue.db'))
+
+
+def test_replayed_message_is_not_recorded_twice(tmp_path):
+    system = _crash_after_upload(tmp_path, SAMPLE_RESUME_1)
+    results = system.process_all_pending()
+    assert [result['status'] for result in results] == ['duplicate']
+    assert system.sheets_handler.demo_data == []
+    assert system.get_all_candidates() == []
+    assert system.whatsapp_sim.get_statistics()['pending_messages'] == 0
+
+
+def test_parallel_path_leases_windows_and_skips_replays(tmp_path):
+    system = _crash_after_upload(tmp_path, SAMPLE_RESUME_1)
+    for i in range(40):
+        system.receive_message(WhatsAppMessage(str(i + 2), 'S', SAMPLE_RESUME_2 + f"\nReference {i}"))
+    limits = []
+    lease = system.whatsapp_sim.durable_queue.lease
+    
+    def recording_lease(limit=1, visibility_timeout=None):
+        limits.append(limit)
+        return lease(limit, visibility_timeout)
+    
+    system.whatsapp_sim.durable_queue.lease = recording_lease
+    results = system.process_all_pending(workers=2, executor='thread')
+    assert max(limits) == 16
+    assert [result['status'] for result in results] == ['duplicate'] + ['success'] * 40
+    assert len(system.sheets_handler.demo_data) == 40
+    assert system.whatsapp_sim.get_statistics()['pending_messages'] == 0
@@ -0,0 +1,78 @@
+import gzip
+import json
+
+import pytest
+
+from cv_manager import CVManagementSystem
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3
+from whatsapp_simulator import WhatsAppMessage
+
+
+def test_export_rejects_unknown_formats(tmp_path):
+    system = CVManagementSystem()
+    with pytest.raises(ValueError):
+        system.export_results(str(tmp_path / 'results.csv'), format='csv')
+    assert not (tmp_path / 'results.csv').exists()
+    assert system.export_results(str(tmp_path / 'results.json'))
+    assert system.export_results(str(tmp_path / 'results.ndjson'), format='ndjson')
+
+
+def _system(texts):
+    system = CVManagementSystem(dedup_cache_path=None, queue_path=None)
+    _add(system, texts)
+    return system
+
+
+def _add(system, texts):
+    for i, text in enumerate(texts):
+        system.process_incoming_message(WhatsAppMessage(text[:10], f"Sender {i}", text))
+
+
+def _records(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_ndjson_records(tmp_path):
+    system = _system([SAMPLE_RESUME_1, SAMPLE_RESUME_2])
+    path = str(tmp_path / 'results.ndjson')
+    assert system.export_results(path, format='ndjson')
+    records = _records(path)
+    assert [record['type'] for record in records] == ['summary'] + ['candidate'] * 2 + ['processing_log'] * 2
+    assert records[0]['data']['total_processed'] == 2
+    assert [record['data'] for record in records[1:3]] == system.get_all_candidates()
+    assert [record['seq'] for record in records[1:]] == [1, 2, 1, 2]
+    assert [record['data']['sender'] for record in records[3:]] == ['Sender 0', 'Sender 1']
+
+
+def test_gzip_round_trip(tmp_path):
+    system = _system([SAMPLE_RESUME_1, SAMPLE_RESUME_3])
+    plain, packed = str(tmp_path / 'results.ndjson'), str(tmp_path / 'results.ndjson.gz')
+    assert system.export_results(plain, format='ndjson')
+    assert system.export_results(packed, format='ndjson')
+    with open(packed, 'rb') as f:
+        assert f.read(2) == b'\x1f\x8b'
+    assert _records(packed) == _records(plain)
+    # compress=True gzips whatever the file name
+    forced = str(tmp_path / 'forced.ndjson')
+    assert system.export_results(forced, format='ndjson', compress=True)
+    with gzip.open(forced, 'rt', encoding='utf-8') as f:
+        assert [json.loads(line) for line in f] == _records(plain)
+
+
+def test_checkpoint_exports_only_new_records(tmp_path):
+    system = _system([SAMPLE_RESUME_1])
+    checkpoint = str(tmp_path / 'checkpoint.json')
+    first, second = str(tmp_path / 'first.ndjson'), str(tmp_path / 'second.ndjson')
+    assert system.export_results(first, format='ndjson', checkpoint_file=checkpoint)
+    _add(system, [SAMPLE_RESUME_2, SAMPLE_RESUME_3])
+    assert system.export_results(second, format='ndjson', checkpoint_file=checkpoint)
+    
+    assert [record['type'] for record in _records(first)] == ['summary', 'candidate', 'processing_log']
+    records = _records(second)
+    candidates = [record for record in records if record['type'] == 'candidate']
+    assert [record['seq'] for record in candidates] == [2, 3]
+    assert [record['data']['full_name'] for record in candidates] == \
+        [candidate['full_name'] for candidate in system.get_all_candidates()[1:]]
+    assert [record['seq'] for record in records if record['type'] == 'processing_log'] == [2, 3]
@@ -0,0 +1,81 @@
+import zipfile
+
+import docx
+
+import file_processor
+from file_processor import FileProcessor
+from sample_data import SAMPLE_RESUME_1
+
+
+def _write_pdf(path, text):
+    from reportlab.pdfgen import canvas
+    pdf = canvas.Canvas(str(path))
+    lines = pdf.beginText(40, 800)
+    for line in text.strip().split('\n')[:30]:
+        lines.textLine(line)
+    pdf.drawText(lines)
+    pdf.save()
+    return str(path)
+
+
+def test_files_over_the_size_limit_are_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_processor, 'MAX_FILE_SIZE', 100)
+    path = tmp_path / 'resume.txt'
+    path.write_text('x' * 101)
+    success, error = FileProcessor.process_file(str(path))
+    assert not success and error == "File too large: 101 bytes (limit 100)"
+    assert FileProcessor.process_file_stream(str(path)) == (False, error)
+
+
+def test_oversized_text_can_be_truncated(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_processor, 'MAX_FILE_SIZE', 100)
+    path = tmp_path / 'resume.txt'
+    # A two-byte character straddles the limit and is dropped
+    path.write_bytes(b'a' * 99 + 'é'.encode('utf-8') + b'tail')
+    assert FileProcessor.process_file(str(path), truncate_oversized=True) == (True, 'a' * 99)
+
+
+def test_only_text_is_truncated(tmp_path, monkeypatch):
+    path = _write_pdf(tmp_path / 'resume.pdf', SAMPLE_RESUME_1)
+    monkeypatch.setattr(file_processor, 'MAX_FILE_SIZE', 100)
+    success, error = FileProcessor.process_file(path, truncate_oversized=True)
+    assert not success and error.startswith('File too large')
+
+
+def test_type_comes_from_the_content_not_the_extension(tmp_path):
+    pdf = tmp_path / 'resume.txt'
+    pdf.write_bytes(open(_write_pdf(tmp_path / 'source.pdf', SAMPLE_RESUME_1), 'rb').read())
+    assert FileProcessor.detect_file_type(str(pdf)) == 'pdf'
+    success, text = FileProcessor.process_file(str(pdf))
+    assert success and 'JOHN SMITH' in text
+    
+    document = docx.Document()
+    document.add_paragraph('Jane Doe')
+    document.save(str(tmp_path / 'resume'))
+    assert FileProcessor.detect_file_type(str(tmp_path / 'resume')) == 'docx'
+    
+    text_file = tmp_path / 'notes.pdf'
+    text_file.write_text(SAMPLE_RESUME_1)
+    assert FileProcessor.detect_file_type(str(text_file)) == 'txt'
+
+
+def test_binary_files_are_not_taken_for_text(tmp_path):
+    blob = tmp_path / 'blob'
+    blob.write_bytes(bytes(range(128, 256)) * 10)
+    assert FileProcessor.detect_file_type(str(blob)) is None
+    assert FileProcessor.process_file(str(blob)) == (False, "Unsupported file type: ")
+    
+    archive = tmp_path / 'archive.docx'
+    with zipfile.ZipFile(archive, 'w') as zipped:
+        zipped.writestr('readme.txt', 'not a document')
+    assert FileProcessor.detect_file_type(str(archive)) is None
+    
+    legacy = tmp_path / 'resume.doc'
+    legacy.write_bytes(file_processor.OLE_MAGIC + b'rest')
+    assert FileProcessor.detect_file_type(str(legacy)) is None
+
+
+def test_text_cut_inside_a_character_is_still_text(tmp_path):
+    path = tmp_path / 'resume.txt'
+    path.write_bytes(b'a' * 4095 + 'é'.encode('utf-8') + b' more')
+    assert FileProcessor.detect_file_type(str(path)) == 'txt'
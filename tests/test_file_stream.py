@@ -0,0 +1,115 @@
+import docx
+import pytest
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+from cv_manager import _run_cpu_stages
+from data_extractor import ResumeDataExtractor
+from file_processor import FileProcessor
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3
+
+SAMPLES = [SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3]
+
+
+def _write_docx(path, text, filler=0):
+    document = docx.Document()
+    for line in text.strip().split('\n'):
+        document.add_paragraph(line)
+    for i in range(filler):
+        document.add_paragraph(f"Additional detail {i}")
+    document.save(path)
+    return str(path)
+
+
+def test_stream_chunks_join_to_process_file_text(tmp_path):
+    txt = tmp_path / 'resume.txt'
+    txt.write_text(SAMPLE_RESUME_1)
+    for path in (str(txt), _write_docx(tmp_path / 'resume.docx', SAMPLE_RESUME_2)):
+        success, chunks = FileProcessor.process_file_stream(path)
+        assert success
+        assert '\n'.join(chunks) == FileProcessor.process_file(path)[1]
+
+
+def test_stream_reports_the_same_errors_as_process_file(tmp_path):
+    binary = tmp_path / 'resume.doc'
+    binary.write_bytes(b'\x00\x01\x02')
+    for path in (str(binary), str(tmp_path / 'missing.txt')):
+        assert FileProcessor.process_file_stream(path) == FileProcessor.process_file(path)
+
+
+@pytest.mark.parametrize('section_aware', [False, True])
+@pytest.mark.parametrize('text', SAMPLES)
+def test_parse_resume_stream_matches_parse_resume(text, section_aware):
+    extractor = ResumeDataExtractor(section_aware=section_aware)
+    lines = text.split('\n')
+    chunks = ['\n'.join(lines[i:i + 7]) for i in range(0, len(lines), 7)]
+    assert extractor.parse_resume_stream(chunks) == extractor.parse_resume(text)
+
+
+def test_section_aware_stream_stops_reading_chunks():
+    extractor = ResumeDataExtractor(section_aware=True)
+    consumed = []
+    
+    def pages():
+        for page in [SAMPLE_RESUME_1] + ['Additional detail'] * 50:
+            consumed.append(page)
+            yield page
+    
+    assert extractor.parse_resume_stream(pages()) == extractor.parse_resume(SAMPLE_RESUME_1)
+    assert len(consumed) < 5
+
+
+def test_attachments_are_parsed_while_streaming(tmp_path):
+    extractor = ResumeDataExtractor(section_aware=True)
+    path = _write_docx(tmp_path / 'resume.docx', SAMPLE_RESUME_1, filler=200)
+    content, extracted, errors, timings = _run_cpu_stages(FileProcessor(), extractor, path, '')
+    assert errors == []
+    assert extracted == extractor.parse_resume(FileProcessor.process_file(path)[1])
+    assert 'Additional detail 199' not in content
+    assert set(timings) == {'file_extraction', 'parsing'}
+
+
+def test_failed_attachment_reports_errors(tmp_path):
+    path = tmp_path / 'empty.txt'
+    path.write_text('')
+    content, extracted, errors, _ = _run_cpu_stages(FileProcessor(), ResumeDataExtractor(), str(path), '')
+    assert content is None and extracted is None
+    assert errors == ["File processing failed: Could not extract text from file", "No content found to process"]
+
+
+def _python_docx_blocks(document):
+    """Paragraph and table-cell text in document order, as python-docx reads it"""
+    blocks = []
+    for child in document.element.body.iterchildren():
+        if child.tag.endswith('}p'):
+            blocks.append(Paragraph(child, document).text)
+        elif child.tag.endswith('}tbl'):
+            table = Table(child, document)
+            blocks.extend(cell.text for row in table.rows for cell in row.cells)
+    return blocks
+
+
+def test_docx_blocks_match_python_docx(tmp_path):
+    document = docx.Document()
+    document.add_heading('Priya Sharma', level=1)
+    document.add_paragraph('Email: priya.sharma@email.com')
+    tabbed = document.add_paragraph('Skills:')
+    tabbed.add_run().add_tab()
+    tabbed.add_run('Python, SQL')
+    broken = document.add_paragraph('First line')
+    broken.add_run().add_break()
+    broken.add_run('second line')
+    table = document.add_table(rows=2, cols=3)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"Cell {r}.{c}"
+    table.cell(1, 2).add_paragraph('second paragraph')
+    document.add_paragraph('')
+    document.add_paragraph('EXPERIENCE')
+    path = tmp_path / 'resume.docx'
+    document.save(path)
+    
+    blocks = list(FileProcessor.iter_docx_blocks(str(path)))
+    assert blocks == _python_docx_blocks(docx.Document(path))
+    assert 'Skills:\tPython, SQL' in blocks and 'First line\nsecond line' in blocks
+    assert 'Cell 1.2\nsecond paragraph' in blocks
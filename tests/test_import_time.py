@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmark import IMPORT_TIME_BUDGET_MS, LAZY_MODULES
+
+PACKAGE_DIR = os.path.join(ROOT, 'cv_management_system')
+
+
+def _cold_import():
+    """Import cv_manager in a fresh interpreter; returns (cumulative ms, lazy modules loaded)"""
+    check = f"import sys, cv_manager; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', check], cwd=PACKAGE_DIR,
+                               capture_output=True, text=True, check=True)
+    milliseconds = None
+    for line in completed.stderr.splitlines():
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == 'cv_manager':
+            milliseconds = int(fields[1]) / 1000
+    return milliseconds, [name for name in completed.stdout.strip().split(',') if name]
+
+
+def test_import_loads_no_optional_dependencies():
+    assert _cold_import()[1] == []
+
+
+def test_import_stays_within_budget():
+    # The best of a few runs, so a busy machine does not fail the check
+    assert min(_cold_import()[0] for _ in range(3)) <= IMPORT_TIME_BUDGET_MS
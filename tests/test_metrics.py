@@ -0,0 +1,47 @@
+import random
+import statistics
+
+import pytest
+
+from metrics import LatencyHistogram
+
+
+def _durations(seed, count=20000):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(-5, 1.5) for _ in range(count)]
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_percentiles_are_within_one_bucket_of_exact_quantiles(seed):
+    durations = _durations(seed)
+    histogram = LatencyHistogram()
+    for seconds in durations:
+        histogram.record(seconds)
+    exact = statistics.quantiles(durations, n=100, method='inclusive')
+    growth = 1.2
+    for percent in (1, 10, 50, 90, 95, 99):
+        expected = exact[percent - 1]
+        # The bucket's upper bound is at most one growth step above the value
+        assert expected / growth * 0.999 <= histogram.percentile(percent) <= expected * growth * 1.001
+    assert histogram.percentile(100) == max(durations)
+
+
+def test_merged_histograms_match_one_histogram():
+    durations = _durations(3, 5000)
+    whole, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i, seconds in enumerate(durations):
+        whole.record(seconds)
+        (first if i % 2 else second).record(seconds)
+    first.merge(second)
+    assert first.counts == whole.counts and first.summary() == whole.summary()
+    with pytest.raises(ValueError):
+        first.merge(LatencyHistogram(growth=1.5))
+
+
+def test_values_outside_the_buckets():
+    histogram = LatencyHistogram(min_seconds=0.001, max_seconds=1.0)
+    assert histogram.percentile(50) is None and histogram.summary()['p50_ms'] is None
+    histogram.record(0.0)
+    histogram.record(500.0)
+    assert histogram.percentile(50) == 0.001
+    assert histogram.percentile(99) == 500.0
@@ -0,0 +1,54 @@
+import pytest
+
+from cv_manager import CVManagementSystem
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3
+from whatsapp_simulator import WhatsAppMessage
+
+
+def _messages():
+    texts = [SAMPLE_RESUME_1, SAMPLE_RESUME_2, '', SAMPLE_RESUME_3]
+    return [WhatsAppMessage(str(i), f"Sender {i}", texts[i % 4] + (f"\nReference {i}" if i % 4 != 2 else ''))
+            for i in range(20)]
+
+
+def _run(**options):
+    system = CVManagementSystem(dedup_cache_path=':memory:', queue_path=None)
+    for message in _messages():
+        system.receive_message(message)
+    return system, system.process_all_pending(**options)
+
+
+def _comparable(results):
+    return [(result['sender'], result['status'], result['extracted_data'], result['sheet_upload'])
+            for result in results]
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_parallel_results_match_serial_in_message_order(executor):
+    serial, expected = _run()
+    system, results = _run(workers=2, executor=executor)
+    assert _comparable(results) == _comparable(expected)
+    assert [result['sender'] for result in results] == [f"Sender {i}" for i in range(20)]
+    # Rows start with a timestamp, which may differ between the runs
+    assert [row[1:] for row in system.sheets_handler.demo_data] == [row[1:] for row in serial.sheets_handler.demo_data]
+    assert [entry['sender'] for entry in system.processing_log] == [entry['sender'] for entry in serial.processing_log]
+    assert system.get_all_candidates() == serial.get_all_candidates()
+    assert len(system.extracted_candidates) == 15
+    assert system.stats.status_counts == serial.stats.status_counts
+    assert system.whatsapp_sim.get_statistics()['pending_messages'] == 0
+
+
+def test_repeats_within_a_window_are_extracted_once():
+    system = CVManagementSystem(dedup_cache_path=':memory:', queue_path=None)
+    for i, text in enumerate([SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_1]):
+        system.receive_message(WhatsAppMessage(str(i), 'S', text))
+    results = system.process_all_pending(workers=2, executor='thread')
+    assert [result['status'] for result in results] == ['success', 'success', 'duplicate']
+    assert results[2]['extracted_data'] == results[0]['extracted_data']
+    assert len(system.sheets_handler.demo_data) == 2
+
+
+def test_unknown_executor_is_rejected():
+    system = CVManagementSystem(queue_path=None)
+    with pytest.raises(ValueError):
+        system.process_all_pending(workers=2, executor='fiber')
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from data_extractor import RESULT_FIELDS, ResumeDataExtractor
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3
+
+with open(os.path.join(os.path.dirname(__file__), '..', 'sample_resumes', 'resume_rajesh.txt'),
+          encoding='utf-8') as f:
+    RAJESH = f.read()
+
+TEXTS = [
+    SAMPLE_RESUME_1,
+    '',
+    SAMPLE_RESUME_2,
+    None,
+    '   \n\n  ',
+    'only.an.email@example.com',
+    'Call me on +44 20 7946 0958 or mail a@b.co, second@b.co',
+    '\n\n   Padded Name\n  lead with spaces  \nMaster of Science in Biology\n',
+    '\n'.join(f"line {i}" for i in range(12)) + '\nLate Header Name\nExperience: 7 years',
+    SAMPLE_RESUME_3,
+    RAJESH,
+    SAMPLE_RESUME_1,
+]
+
+
+def _rows(columns):
+    return [dict(zip(RESULT_FIELDS, values)) for values in zip(*(columns[field] for field in RESULT_FIELDS))]
+
+
+def test_parse_many_matches_parse_resume():
+    extractor = ResumeDataExtractor()
+    expected = [extractor.parse_resume(text) for text in TEXTS]
+    assert _rows(extractor.parse_many(TEXTS)) == expected
+
+
+def test_parse_many_of_nothing_is_empty_columns():
+    assert ResumeDataExtractor().parse_many([]) == {field: [] for field in RESULT_FIELDS}
+
+
+def test_parse_many_as_dataframe():
+    pytest.importorskip('pandas')
+    frame = ResumeDataExtractor().parse_many(TEXTS[:3], as_dataframe=True)
+    assert list(frame.columns) == list(RESULT_FIELDS)
+    assert frame.to_dict('records') == _rows(ResumeDataExtractor().parse_many(TEXTS[:3]))
@@ -0,0 +1,62 @@
+import timeit
+
+import pytest
+
+from data_extractor import EMAIL_PATTERN, PHONE_PATTERN, ResumeDataExtractor
+
+ADVERSARIAL = {
+    'long local part': lambda n: 'a' * n,
+    'repeated at signs': lambda n: 'a@' * n,
+    'endless subdomains': lambda n: 'a@' + 'a.' * n,
+    'hyphen labels without a TLD': lambda n: 'a@' + 'a-' * n + '.',
+    'digit pairs': lambda n: '1 ' * n + 'x',
+    'plus prefixes': lambda n: '+1-' * n,
+    'dotted digits': lambda n: '1.' * n,
+}
+
+
+def _search_time(pattern, text):
+    return min(timeit.repeat(lambda: pattern.search(text), number=3, repeat=5))
+
+
+@pytest.mark.parametrize('pattern', [EMAIL_PATTERN, PHONE_PATTERN], ids=['email', 'phone'])
+@pytest.mark.parametrize('make', ADVERSARIAL.values(), ids=ADVERSARIAL.keys())
+def test_adversarial_inputs_run_in_linear_time(pattern, make):
+    small = _search_time(pattern, make(5000))
+    large = _search_time(pattern, make(20000))
+    # Four times the input should take about four times as long, not sixteen
+    assert large < max(small, 1e-4) * 10
+
+
+@pytest.mark.parametrize('text, phone', [
+    ('+91-9876543210', '+91-9876543210'),
+    ('+1 555 123 4567', '+1 555 123 4567'),
+    ('9876543210', '9876543210'),
+    ('call 98765 43210\n', '98765 43210'),
+    ('123456789012345', '123456789012345'),
+    ('a+9876543210', '+9876543210'),
+    ('9876543210\n12345', '9876543210'),
+])
+def test_phone_numbers_are_accepted(text, phone):
+    assert ResumeDataExtractor().extract_phone(text) == phone
+
+
+@pytest.mark.parametrize('text', [
+    '987654321',  # nine digits
+    '1234567890123456',  # sixteen digits
+    '12345\n67890',  # the number may not run over a line break
+    '98--76543210',
+    '2019 - 2021',
+])
+def test_phone_numbers_are_rejected(text):
+    assert ResumeDataExtractor().extract_phone(text) is None
+
+
+@pytest.mark.parametrize('text, email', [
+    ('john.smith@email.com | +91', 'john.smith@email.com'),
+    ('Email: a.b+c@mail.example.co.uk.', 'a.b+c@mail.example.co.uk'),
+    ('x' * 65 + '@example.com', None),
+    ('user@example.c', None),
+])
+def test_email_bounds(text, email):
+    assert ResumeDataExtractor().extract_email(text) == email
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from data_extractor import BULLET_CHARS, ResumeDataExtractor
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3
+
+RESUME_DIR = os.path.join(os.path.dirname(__file__), '..', 'sample_resumes')
+
+
+def _read(name):
+    with open(os.path.join(RESUME_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+SAMPLES = [SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3, _read('resume_rajesh.txt')]
+
+
+@pytest.mark.parametrize('text', SAMPLES)
+def test_sections_agree_with_parse_resume(text):
+    extractor = ResumeDataExtractor()
+    full = extractor.parse_resume(text)
+    sections = extractor.parse_resume_sections(text)
+    for field in ('full_name', 'email', 'phone'):
+        assert sections[field] == full[field]
+    # Skills come from the skills section only, so they are a subset
+    assert set(sections['skills'].split(', ')) <= set(full['skills'].split(', '))
+    assert sections['education'] != 'Not specified' and sections['experience'] != 'Not specified'
+    assert not any(entry.startswith(BULLET_CHARS) for entry in sections['experience'].split('; '))
+
+
+def test_experience_is_taken_from_the_experience_section():
+    sections = ResumeDataExtractor().parse_resume_sections(SAMPLE_RESUME_1)
+    assert sections['experience'].split('; ')[0].startswith('Senior Software Engineer - TechCorp Solutions')
+    assert 'Experienced Software Engineer' not in sections['experience']
+
+
+def test_text_without_headings_falls_back_to_keyword_matching():
+    text = ('Jane Doe\njane.doe@example.com\n+1-555-123-4567\n'
+            'Completed a Bachelor of Science in Physics at MIT in 2015.\n'
+            'Worked as an analyst for 4 years of experience with Python and SQL.\n'
+            'Later worked at Acme as an engineer.')
+    extractor = ResumeDataExtractor()
+    assert extractor.parse_resume_sections(text) == extractor.parse_resume(text)
+
+
+@pytest.mark.parametrize('text', SAMPLES[:3])
+def test_scanning_stops_once_every_field_is_found(text):
+    extractor = ResumeDataExtractor()
+    filler = ''.join(f"\nADDITIONAL INFORMATION\nDetail {i}" for i in range(5000))
+    assert extractor.parse_resume_sections(text + filler) == extractor.parse_resume_sections(text)
+    
+    read = []
+    
+    def lines():
+        for line in (text + filler).strip().split('\n'):
+            read.append(line)
+            yield line
+    
+    extractor._parse_section_lines(lines(), text)
+    assert len(read) <= len(text.strip().split('\n')) + 1
@@ -0,0 +1,106 @@
+import multiprocessing
+import socket
+import time
+
+import pytest
+
+from cv_manager import CVManagementSystem
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3
+from sharded_cv_manager import ShardedCVManagementSystem, run_worker, shard_for
+from whatsapp_simulator import WhatsAppMessage
+
+AUTHKEY = b'test-secret'
+
+
+def _messages(count=12):
+    texts = [SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3]
+    return [WhatsAppMessage(f"sender-{i}", f"Sender {i}", texts[i % 3] + f"\nReference {i}")
+            for i in range(count)]
+
+
+def _sharded(workers=2, **options):
+    return ShardedCVManagementSystem(workers=workers, quiet_workers=True, queue_path=None, **options)
+
+
+def test_shard_for_is_stable():
+    assert shard_for('sender', 4) == shard_for('sender', 4)
+    assert {shard_for(f"s{i}", 3) for i in range(50)} == {0, 1, 2}
+
+
+def test_results_match_the_serial_system():
+    serial = CVManagementSystem()
+    for message in _messages():
+        serial.receive_message(message)
+    expected = serial.process_all_pending()
+    
+    with _sharded() as system:
+        for message in _messages():
+            system.receive_message(message)
+        results = system.process_all_pending()
+        summary = system.get_processing_summary()
+    assert [result['extracted_data'] for result in results] == [result['extracted_data'] for result in expected]
+    assert summary['total_processed'] == summary['successful'] == 12
+    assert summary['candidates_extracted'] == 12
+    assert sum(worker['total_processed'] for worker in summary['workers']) == 12
+
+
+def test_repeat_submissions_reach_the_same_worker_cache():
+    with _sharded(workers=3) as system:
+        for message in _messages(6) + _messages(6):
+            system.receive_message(message)
+        results = system.process_all_pending()
+    assert [result['status'] for result in results] == ['success'] * 6 + ['duplicate'] * 6
+
+
+def test_only_a_lost_workers_senders_move():
+    with _sharded(workers=3) as system:
+        senders = [f"sender-{i}" for i in range(60)]
+        before = {sender: system._worker_for(sender, system.live_workers) for sender in senders}
+        system._lose_worker(1, ConnectionResetError('test'))
+        after = {sender: system._worker_for(sender, system.live_workers) for sender in senders}
+    moved = {sender for sender in senders if before[sender] != after[sender]}
+    assert moved == {sender for sender in senders if before[sender] == 1}
+    assert 1 not in after.values()
+
+
+def test_messages_of_a_lost_worker_are_released_and_replayed(tmp_path):
+    with ShardedCVManagementSystem(workers=2, quiet_workers=True, queue_path=str(tmp_path / 'queue.db')) as system:
+        for message in _messages():
+            system.receive_message(message)
+        system._processes[0].terminate()
+        system._processes[0].join()
+        results = system.process_all_pending()
+        queue_stats = system.whatsapp_sim.durable_queue.get_statistics()
+    assert system.live_workers == []
+    assert sorted(result['sender'] for result in results) == sorted(f"Sender {i}" for i in range(12))
+    assert all(result['status'] == 'success' for result in results)
+    assert queue_stats == {'pending': 0, 'in_flight': 0, 'processed': 12}
+
+
+def test_accept_times_out_without_workers():
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        ShardedCVManagementSystem(workers=1, address=('127.0.0.1', 0), authkey=AUTHKEY, queue_path=None,
+                                  accept_timeout=0.2)
+    assert time.monotonic() - start < 5
+
+
+def _delayed_worker(address):
+    time.sleep(0.3)
+    run_worker(address, authkey=AUTHKEY, quiet=True)
+
+
+def test_remote_worker_over_tcp():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        address = probe.getsockname()
+    worker = multiprocessing.Process(target=_delayed_worker, args=(address,), daemon=True)
+    worker.start()
+    try:
+        with ShardedCVManagementSystem(workers=1, address=address, authkey=AUTHKEY, queue_path=None,
+                                       accept_timeout=10) as system:
+            result = system.process_incoming_message(_messages(1)[0])
+    finally:
+        worker.join(timeout=10)
+    assert result['status'] == 'success'
+    assert worker.exitcode == 0
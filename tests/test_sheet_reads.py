@@ -0,0 +1,31 @@
+from google_sheets_handler import GoogleSheetsHandler
+from sheets_stub import ThrottlingSheetsService
+
+
+def _handler(rows):
+    service = ThrottlingSheetsService(quota=None)
+    service.rows = rows
+    handler = GoogleSheetsHandler(service=service, read_cache_ttl=0)
+    handler.spreadsheet_id = 'test'
+    return handler, service
+
+
+def test_blank_rows_at_a_page_end_do_not_stop_paging():
+    rows = [[str(i)] for i in range(1, 4)] + [[], []] + [[str(i)] for i in range(6, 10)]
+    handler, _ = _handler(rows)
+    assert [row for row in handler.iter_rows(page_size=5) if row] == [[str(i)] for i in (1, 2, 3, 6, 7, 8, 9)]
+    assert handler.last_row_read == 9
+
+
+def test_paging_stops_at_the_first_empty_page():
+    handler, service = _handler([[str(i)] for i in range(1, 11)])
+    assert len(list(handler.iter_rows(page_size=4))) == 10
+    # Pages of rows 1-4, 5-8, 9-12 and the empty page 13-16
+    assert service.stats['requests'] == 4
+
+
+def test_incremental_reads_continue_below_the_last_row():
+    handler, service = _handler([[str(i)] for i in range(1, 4)])
+    assert len(list(handler.iter_new_rows(page_size=10))) == 3
+    service.rows.append(['4'])
+    assert list(handler.iter_new_rows(page_size=10)) == [['4']]
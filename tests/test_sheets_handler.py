@@ -0,0 +1,69 @@
+import threading
+
+from google_sheets_handler import GoogleSheetsHandler
+from sheets_stub import ThrottlingSheetsService
+from write_scheduler import SheetWriteScheduler
+
+
+def _handler(service):
+    handler = GoogleSheetsHandler(service=service)
+    handler.spreadsheet_id = 'test'
+    return handler
+
+
+def test_append_rows_uses_one_request():
+    service = ThrottlingSheetsService(quota=None)
+    handler = _handler(service)
+    assert handler.append_rows([['a'], ['b'], ['c']])
+    assert service.stats['requests'] == 1
+    assert handler.request_append([['d'], ['e']]) == 'A4:H5'
+    assert service.rows == [['a'], ['b'], ['c'], ['d'], ['e']]
+
+
+def test_append_rows_reports_failures():
+    service = ThrottlingSheetsService(quota=0)
+    assert not _handler(service).append_rows([['a']])
+    assert service.rows == []
+
+
+def test_scheduler_writes_queued_rows_on_close():
+    service = ThrottlingSheetsService(quota=None)
+    scheduler = SheetWriteScheduler(_handler(service), requests_per_minute=6000, initial_batch=50)
+    futures = [scheduler.submit([str(i)]) for i in range(120)]
+    scheduler.close()
+    assert all(future.result(0) for future in futures)
+    assert service.rows == [[str(i)] for i in range(120)]
+    assert service.stats['requests'] < 120
+
+
+def test_injected_builder_builds_one_service_and_one_connection_per_thread():
+    service = ThrottlingSheetsService(quota=None)
+    built = []
+    connections = []
+    
+    def builder(http):
+        built.append(http)
+        return service
+    
+    def http_factory():
+        connections.append(threading.current_thread().name)
+        return object()
+    
+    handler = GoogleSheetsHandler(service_builder=builder, http_factory=http_factory)
+    handler.spreadsheet_id = 'test'
+    assert not handler.demo_mode
+    
+    def append(index):
+        for i in range(3):
+            assert handler.append_rows([[f"{index}-{i}"]])
+    
+    threads = [threading.Thread(target=append, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    
+    assert len(built) == 1
+    assert len(connections) == len(set(connections)) == 4
+    assert handler.get_client_stats() == {'service_builds': 1, 'http_connections': 4, 'requests': 12}
+    assert service.stats['requests'] == 12 and len(service.rows) == 12
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from skill_matcher import SkillMatcher
+
+
+@pytest.mark.parametrize('text, skills', [
+    ('MySQL and PostgreSQL', ['PostgreSQL', 'MySQL']),
+    ('Projects on GitHub', []),
+    ('git, SQL', ['SQL', 'Git']),
+    ('JavaScript only', ['JavaScript']),
+    ('Java/JavaScript', ['Java', 'JavaScript']),
+    ('HTML5 and python3', ['Python', 'HTML']),
+    ('C++ and C#', ['C++', 'C#']),
+    ('node.js, (AWS)', ['Node.js', 'AWS']),
+    ('', []),
+])
+def test_default_taxonomy_boundaries(text, skills):
+    assert SkillMatcher().find(text) == skills
+
+
+def test_names_keep_taxonomy_casing_and_order():
+    assert SkillMatcher().find('KUBERNETES, docker and MONGODB; python') == \
+        ['Python', 'Docker', 'Kubernetes', 'MongoDB']
+
+
+def test_multi_word_skills_need_every_word():
+    matcher = SkillMatcher()
+    assert matcher.find('machine learning and rest api') == ['Machine Learning', 'REST API']
+    assert matcher.find('machine tools, learning fast, a rest') == []
+
+
+def test_synonyms_map_to_their_skill():
+    matcher = SkillMatcher({'Kubernetes': ['k8s'], 'Go': ['golang']})
+    assert matcher.find('K8S with Golang, going nowhere') == ['Kubernetes', 'Go']
+    assert SkillMatcher([]).find('anything') == []
+
+
+def test_from_json_file(tmp_path):
+    mapping = tmp_path / 'skills.json'
+    mapping.write_text(json.dumps({'Python': ['py'], 'Terraform': []}))
+    assert SkillMatcher.from_file(str(mapping)).find('py and terraform') == ['Python', 'Terraform']
+    listing = tmp_path / 'list.json'
+    listing.write_text(json.dumps(['Rust', 'Go']))
+    matcher = SkillMatcher.from_file(str(listing))
+    assert matcher.skills == ['Rust', 'Go']
+    assert matcher.find('go and rust') == ['Rust', 'Go']
+
+
+def test_from_text_file(tmp_path):
+    path = tmp_path / 'skills.txt'
+    path.write_text('# comment\n\nPython: py, python3\nKubernetes : k8s\nTerraform\n')
+    matcher = SkillMatcher.from_file(str(path))
+    assert matcher.skills == ['Python', 'Kubernetes', 'Terraform']
+    assert matcher.find('K8s, TERRAFORM and py') == ['Python', 'Kubernetes', 'Terraform']
@@ -0,0 +1,101 @@
+import asyncio
+import os
+
+import pytest
+
+from async_cv_manager import AsyncCVManagementSystem
+from cv_manager import CVManagementSystem
+from google_sheets_handler import GoogleSheetsHandler
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3
+from sharded_cv_manager import ShardedCVManagementSystem
+from tracing import NullSink, Tracer, run_profiled, set_tracer
+from whatsapp_simulator import WhatsAppMessage
+
+
+class CollectingSink(NullSink):
+    receives_spans = True
+    receives_events = True
+    
+    def __init__(self):
+        self.spans = []
+        self.events = []
+    
+    def emit_span(self, span):
+        self.spans.append(span)
+    
+    def emit_event(self, event):
+        self.events.append(event)
+
+
+def _messages():
+    return [WhatsAppMessage(str(i), 'S', text) for i, text in enumerate([SAMPLE_RESUME_1, SAMPLE_RESUME_2,
+                                                                         SAMPLE_RESUME_3])]
+
+
+def test_receive_spans_have_trace_ids():
+    sink = CollectingSink()
+    system = CVManagementSystem(tracer=Tracer([sink]))
+    for message in _messages():
+        system.receive_message(message)
+    trace_ids = [span.trace_id for span in sink.spans if span.name == 'receive']
+    assert len(trace_ids) == 3 and None not in trace_ids and len(set(trace_ids)) == 3
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_parallel_path_takes_sampled_profiles(executor):
+    tracer = Tracer([NullSink()], profile_sample_rate=1.0)
+    system = CVManagementSystem(tracer=tracer)
+    for message in _messages():
+        system.receive_message(message)
+    results = system.process_all_pending(workers=2, executor=executor)
+    assert [result['status'] for result in results] == ['success'] * 3
+    assert len(tracer.profiles) == 3
+    assert all(stats.total_calls > 0 for _, stats in tracer.profiles)
+
+
+def test_async_path_takes_sampled_profiles(tmp_path):
+    tracer = Tracer([NullSink()], profile_sample_rate=1.0, profile_dir=str(tmp_path))
+    system = AsyncCVManagementSystem(executor='thread', workers=1, tracer=tracer)
+    for message in _messages():
+        system.receive_message(message)
+    asyncio.run(system.process_all_pending())
+    system.close()
+    assert {trace_id for trace_id, _ in tracer.profiles} == {'msg-4', 'msg-5', 'msg-6'}
+    assert 'msg-4-parse.prof' in os.listdir(tmp_path)
+
+
+def test_sharded_workers_profile_at_the_coordinator_rate(tmp_path):
+    tracer = Tracer([NullSink()], profile_sample_rate=1.0, profile_dir=str(tmp_path))
+    with ShardedCVManagementSystem(workers=1, quiet_workers=True, queue_path=None, tracer=tracer) as system:
+        for message in _messages():
+            system.receive_message(message)
+        system.process_all_pending()
+    assert len(os.listdir(tmp_path / 'worker-0')) == 3
+
+
+def test_run_profiled_returns_loadable_statistics():
+    tracer = Tracer([NullSink()])
+    value, profile = run_profiled(sorted, [3, 1, 2])
+    assert value == [1, 2, 3]
+    tracer.add_profile('t', profile)
+    tracer.add_profile('skipped', None)
+    assert [trace_id for trace_id, _ in tracer.profiles] == ['t']
+
+
+def test_demo_rows_are_only_formatted_for_event_sinks():
+    formatted = []
+    
+    class Cell:
+        def __repr__(self):
+            formatted.append(self)
+            return 'cell'
+    
+    handler = GoogleSheetsHandler()
+    handler.append_row([Cell()])
+    assert formatted == []
+    
+    sink = CollectingSink()
+    set_tracer(Tracer([sink]))
+    handler.append_row([Cell()])
+    assert len(formatted) == 1
+    assert sink.events[-1].name == 'sheets.append'
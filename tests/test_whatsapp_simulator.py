@@ -0,0 +1,41 @@
+import pytest
+
+from whatsapp_simulator import WhatsAppMessage, WhatsAppSimulator
+
+
+def message(i):
+    return WhatsAppMessage(str(i), f'Sender {i}', f'text {i}')
+
+
+@pytest.mark.parametrize('size', [0, -1])
+def test_max_queue_size_must_be_positive(size):
+    with pytest.raises(ValueError):
+        WhatsAppSimulator(max_queue_size=size, overflow_policy='drop_oldest')
+
+
+def test_reject_policy_applies_backpressure():
+    sim = WhatsAppSimulator(max_queue_size=2)
+    assert [sim.simulate_message_receipt(message(i)) for i in range(3)] == [True, True, False]
+    assert sim.get_statistics()['dropped_messages'] == 1
+
+
+def test_drop_oldest_policy_keeps_newest():
+    sim = WhatsAppSimulator(max_queue_size=1, overflow_policy='drop_oldest')
+    sim.simulate_message_receipt(message(1))
+    assert sim.simulate_message_receipt(message(2))
+    assert sim.get_next_message().sender_id == '2'
+    assert sim.get_next_message() is None
+
+
+@pytest.mark.parametrize('durable', [False, True])
+def test_released_messages_are_counted_once(durable, tmp_path):
+    sim = WhatsAppSimulator(queue_path=str(tmp_path / 'queue.db') if durable else None)
+    for i in range(3):
+        sim.simulate_message_receipt(message(i))
+    taken = sim.get_next_messages(2)
+    sim.release(taken)
+    assert sim.get_statistics()['processed_messages'] == 0
+    assert len(sim.processed_messages) == 0
+    assert [m.sender_id for m in sim.get_next_messages(5)] == ['0', '1', '2']
+    stats = sim.get_statistics()
+    assert stats['processed_messages'] == 3 and stats['total_messages'] == 3
@@ -0,0 +1,200 @@
+import threading
+
+from cv_manager import CVManagementSystem
+from google_sheets_handler import GoogleSheetsHandler
+from sample_data import SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3
+from sheets_stub import ThrottlingSheetsService
+from tracing import NullSink, Tracer, set_tracer
+from whatsapp_simulator import WhatsAppMessage
+from write_scheduler import SheetWriteScheduler
+
+
+class FakeClock:
+    """Clock whose sleep advances it at once"""
+    
+    def __init__(self):
+        self.now = 0.0
+        self._lock = threading.Lock()
+    
+    def __call__(self):
+        with self._lock:
+            return self.now
+    
+    def sleep(self, seconds):
+        with self._lock:
+            self.now += seconds
+
+
+class BlockingHandler:
+    """Handler whose requests wait for release and then call append"""
+    
+    def __init__(self, append=None):
+        self.release = threading.Event()
+        self.requests = []
+        self.append = append
+    
+    def request_append(self, rows):
+        self.release.wait(10)
+        self.requests.append(rows)
+        if self.append is not None:
+            self.append(rows)
+        return ''
+
+
+def _stub_handler(service):
+    handler = GoogleSheetsHandler(service=service)
+    handler.spreadsheet_id = 'test'
+    return handler
+
+
+def _scheduler(handler, clock=None, **options):
+    clock = clock or FakeClock()
+    return SheetWriteScheduler(handler, seed=0, clock=clock, sleep=clock.sleep, **options)
+
+
+def _rows(count):
+    return [[str(i)] for i in range(count)]
+
+
+def test_throttled_writes_back_off_and_keep_their_order():
+    clock = FakeClock()
+    service = ThrottlingSheetsService(quota=2, window=60.0, clock=clock, sleep=clock.sleep)
+    scheduler = _scheduler(_stub_handler(service), clock, requests_per_minute=600, initial_batch=1)
+    futures = [scheduler.submit(row) for row in _rows(12)]
+    assert [future.result(10) for future in futures] == [True] * 12
+    scheduler.close()
+    assert service.rows == _rows(12)
+    assert scheduler.stats['throttled'] > 0 and scheduler.stats['rows_failed'] == 0
+    # The quota window had to pass before the throttled rows could be written
+    assert clock() >= 60.0
+
+
+def test_server_errors_are_retried():
+    clock = FakeClock()
+    service = ThrottlingSheetsService(quota=None, error_rate=0.5, seed=1, clock=clock, sleep=clock.sleep)
+    scheduler = _scheduler(_stub_handler(service), clock, initial_batch=2, max_retries=20)
+    futures = [scheduler.submit(row) for row in _rows(20)]
+    assert all(future.result(10) for future in futures)
+    scheduler.close()
+    assert service.rows == _rows(20)
+    assert scheduler.stats['server_errors'] > 0
+
+
+def test_programming_errors_are_not_retried():
+    class BrokenHandler:
+        def request_append(self, rows):
+            raise TypeError('bad row')
+    
+    scheduler = _scheduler(BrokenHandler())
+    assert scheduler.append_row(['x'], timeout=10) is False
+    scheduler.close()
+    assert scheduler.stats['other_errors'] == 1 and scheduler.stats['retries'] == 0
+    assert list(scheduler.failed_rows) == [['x']]
+
+
+def test_transport_errors_are_retried():
+    attempts = []
+    
+    class FlakyHandler:
+        def request_append(self, rows):
+            attempts.append(rows)
+            if len(attempts) < 3:
+                raise ConnectionResetError('reset')
+            return ''
+    
+    scheduler = _scheduler(FlakyHandler())
+    assert scheduler.append_row(['x'], timeout=10) is True
+    scheduler.close()
+    assert len(attempts) == 3 and scheduler.stats['retries'] == 2
+
+
+def test_cancelled_rows_are_not_written():
+    handler = BlockingHandler()
+    scheduler = _scheduler(handler, initial_batch=1)
+    first = scheduler.submit(['1'])
+    cancelled = scheduler.submit(['2'])
+    third = scheduler.submit(['3'])
+    assert cancelled.cancel()
+    handler.release.set()
+    assert first.result(10) and third.result(10)
+    scheduler.close()
+    assert handler.requests == [[['1']], [['3']]]
+
+
+def test_a_failing_batch_does_not_stop_the_writer():
+    class FailingSink(NullSink):
+        receives_events = True
+        
+        def emit_event(self, event):
+            raise RuntimeError('sink down')
+    
+    set_tracer(Tracer([FailingSink()]))
+    calls = []
+    
+    class FirstFails:
+        def request_append(self, rows):
+            calls.append(rows)
+            if len(calls) == 1:
+                raise TypeError('bad row')
+            return ''
+    
+    scheduler = _scheduler(FirstFails(), initial_batch=1)
+    failed = scheduler.submit(['1'])
+    written = scheduler.submit(['2'])
+    # Giving up on the first row resolves it before the failing event is reported
+    assert failed.result(10) is False
+    assert written.result(10) is True
+    scheduler.close()
+    assert scheduler.stats['rows_failed'] == 1
+
+
+def test_close_gives_up_rows_left_after_the_timeout():
+    handler = BlockingHandler()
+    scheduler = _scheduler(handler, initial_batch=1)
+    futures = [scheduler.submit(row) for row in _rows(3)]
+    scheduler.close(timeout=0.1)
+    assert [future.result(1) for future in futures[1:]] == [False, False]
+    assert list(scheduler.failed_rows) == _rows(3)[1:]
+    handler.release.set()
+    assert futures[0].result(10) is True
+
+
+def test_serial_path_submits_rows_without_waiting():
+    system = CVManagementSystem(queue_path=None)
+    handler = BlockingHandler(system.sheets_handler.request_append)
+    system.sheet_writer = _scheduler(handler)
+    submitted = []
+    finish = system._finish_uploads
+    
+    def finish_uploads(uploads):
+        submitted.append(len(uploads))
+        handler.release.set()
+        finish(uploads)
+    
+    system._finish_uploads = finish_uploads
+    for i, text in enumerate([SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_3]):
+        system.receive_message(WhatsAppMessage(str(i), 'S', text))
+    with system:
+        results = system.process_all_pending()
+    assert submitted == [3]
+    assert [result['status'] for result in results] == ['success'] * 3
+    assert len(system.sheets_handler.demo_data) == 3 and len(handler.requests) <= 2
+    assert system.stats.total == 3
+    assert system.whatsapp_sim.get_statistics()['pending_messages'] == 0
+    assert not system.sheet_writer._thread.is_alive()
+
+
+def test_serial_repeats_within_a_window_are_written_once():
+    system = CVManagementSystem(dedup_cache_path=':memory:', queue_path=None)
+    handler = BlockingHandler(system.sheets_handler.request_append)
+    handler.release.set()
+    system.sheet_writer = _scheduler(handler)
+    for i, text in enumerate([SAMPLE_RESUME_1, SAMPLE_RESUME_2, SAMPLE_RESUME_1]):
+        system.receive_message(WhatsAppMessage(str(i), 'S', text))
+    with system:
+        results = system.process_all_pending()
+    assert [result['status'] for result in results] == ['success', 'success', 'duplicate']
+    assert results[2]['extracted_data'] == results[0]['extracted_data']
+    assert len(system.sheets_handler.demo_data) == 2
+    assert sum(len(rows) for rows in handler.requests) == 2
+    assert system.stats.total == 3